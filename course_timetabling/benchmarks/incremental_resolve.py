@@ -0,0 +1,139 @@
+"""
+Compares the turnaround of the delta operations of CourseTimetabling (change the live model
+and re-optimize from the previous solution) with a full rebuild and solve of the changed
+sets, on synthetic instances.
+
+Usage (from the repository root):
+    python course_timetabling/benchmarks/incremental_resolve.py --sizes 100x25
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import gurobipy as gp
+
+from instances import generate_instance, parse_size
+
+from main import CourseTimetabling
+from utils.model_cache import get_timetabling_sets
+
+
+def solve(sets: dict) -> CourseTimetabling:
+    timetabling = CourseTimetabling(**sets, sparse=True)
+    timetabling.model.Params.OutputFlag = 0
+    timetabling.initialize_variables_and_coefficients()
+    timetabling.add_credit_slack_variables()
+    timetabling.add_constraints()
+    timetabling.set_objective()
+    timetabling.optimize()
+
+    return timetabling
+
+
+def without_professor(sets: dict, professor: str) -> dict:
+    return {
+        name: (
+            {p: details for p, details in value.items() if p != professor}
+            if "professors" in name
+            else value
+        )
+        for name, value in sets.items()
+    }
+
+
+def get_operations(instance: dict) -> list:
+    """
+    Returns (name, operation, sets) tuples: the delta operation and a function giving the
+    equivalent sets to rebuild from, given the changed timetabling.
+    """
+    professor = next(iter(instance["permanent_professors"]))
+    course, details = next(iter(instance["courses"].items()))
+    course_id = details["course_id"].split(",")[0]
+    new_course = f"{course}-NEW"
+
+    return [
+        (
+            "fix_allocation",
+            lambda t: t.fix_allocation(professor, course),
+            get_timetabling_sets,
+        ),
+        (
+            "add_qualification",
+            lambda t: t.add_qualification(professor, course_id),
+            get_timetabling_sets,
+        ),
+        (
+            "add_class",
+            lambda t: t.add_class(new_course, details),
+            get_timetabling_sets,
+        ),
+        (
+            "remove_class",
+            lambda t: t.remove_class(course),
+            get_timetabling_sets,
+        ),
+        (
+            "deactivate_professor",
+            lambda t: t.set_professor_active(professor, False),
+            lambda t: without_professor(get_timetabling_sets(t), professor),
+        ),
+    ]
+
+
+def measure(name: str, instance: dict, operation_name: str, operation, sets) -> dict:
+    result = {
+        "instance": name,
+        "operation": operation_name,
+        "delta_s": float("nan"),
+        "rebuild_s": float("nan"),
+        "delta_objective": float("nan"),
+        "rebuild_objective": float("nan"),
+    }
+
+    try:
+        timetabling = solve(instance)
+
+        start = time.perf_counter()
+        operation(timetabling)
+        timetabling.reoptimize()
+        result["delta_s"] = round(time.perf_counter() - start, 3)
+        result["delta_objective"] = timetabling.model.ObjVal
+
+        start = time.perf_counter()
+        rebuilt = solve(sets(timetabling))
+        result["rebuild_s"] = round(time.perf_counter() - start, 3)
+        result["rebuild_objective"] = rebuilt.model.ObjVal
+
+        timetabling.clean_model()
+        rebuilt.clean_model()
+    except gp.GurobiError as error:
+        print(f"{name}/{operation_name}: not solved ({error})")
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="*", default=["100x25"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        n_courses, n_professors = parse_size(size)
+        instance = generate_instance(n_courses, n_professors, seed=args.seed)
+
+        for operation_name, operation, sets in get_operations(instance):
+            results.append(measure(size, instance, operation_name, operation, sets))
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Instances used by the benchmark scripts.
+
+Run the benchmarks from the repository root, so that the cached spreadsheet data in
+cache/ is found (and set CACHE_TTL high enough for it to be reused instead of refreshed).
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import settings
+
+SCHEDULES = [
+    ("SEG,QUA", "08:00-10:00"),
+    ("SEG,QUA", "10:00-12:00"),
+    ("SEG,QUA", "13:00-15:00"),
+    ("TER,QUI", "08:00-10:00"),
+    ("TER,QUI", "10:00-12:00"),
+    ("TER,QUI", "13:00-15:00"),
+    ("TER,QUI", "15:00-17:00"),
+    ("QUA,SEX", "08:00-10:00"),
+    ("QUA,SEX", "10:00-12:00"),
+    ("QUA,SEX", "13:00-15:00"),
+    ("SEG", "10:00-12:00,13:00-15:00"),
+    ("QUI", "18:30-20:10,20:10-21:50"),
+    ("SEG,QUA", "10:00-12:00,13:00-15:00"),
+    ("TER", "09:00-11:00"),
+    ("SEX", "14:00-16:00"),
+]
+
+
+def load_cached_instance() -> dict:
+    """
+    Loads the instance from the spreadsheet cache (see main.get_sets).
+    """
+    from main import get_sets
+
+    return get_sets()
+
+
+def generate_instance(
+    n_courses: int,
+    n_professors: int,
+    seed: int = 0,
+    substitute_share: float = 0.2,
+    courses_per_course_id: int = 2,
+    qualified_per_professor: tuple = (2, 6),
+) -> dict:
+    """
+    Generates a synthetic instance shaped like the spreadsheet data: classes of a pool of
+    course ids on the usual schedules, half OBG and half SVC (some of them SVC basic
+    courses), and professors qualified for a few course ids each, plus DUMMY.
+
+    Args:
+        n_courses (int): Number of course classes.
+        n_professors (int): Number of professors, DUMMY not included.
+        seed (int): Random seed.
+        substitute_share (float): Share of substitute (PS) professors.
+        courses_per_course_id (int): Average number of classes of the same course id.
+        qualified_per_professor (tuple): Min and max number of qualified course ids per professor.
+
+    Returns:
+        dict: The sets keyed by the CourseTimetabling argument names.
+    """
+    rng = random.Random(seed)
+    course_ids = [
+        f"SYN{i:04d}" for i in range(max(1, n_courses // courses_per_course_id))
+    ]
+
+    courses = {}
+    for i in range(n_courses):
+        course_type = "OBG" if rng.random() < 0.5 else "SVC"
+        if course_type == "SVC" and rng.random() < 0.2:
+            course_id = rng.choice(settings.SVC_BASIC_COURSES)
+        else:
+            course_id = rng.choice(course_ids)
+        day, time = rng.choice(SCHEDULES)
+
+        courses[f"{course_type}-SYN-{i}"] = {
+            "course_id": course_id,
+            "course_name": f"Disciplina {course_id}",
+            "graduation_course": "BCC1",
+            "credits": rng.choice([4, 4, 4, 4, 2]),
+            "day": day,
+            "time": time,
+            "course_type": course_type,
+            "capacity": 60,
+            "class_type": "Regular",
+            "responsable_institute": "IC",
+            "classroom_type": "T",
+            "term": rng.randint(1, 8),
+        }
+
+    permanent_professors = {}
+    substitute_professors = {}
+    for i in range(n_professors):
+        category = "PS" if rng.random() < substitute_share else "PP"
+        professor = {
+            "qualified_courses": rng.sample(
+                course_ids,
+                min(len(course_ids), rng.randint(*qualified_per_professor)),
+            ),
+            "expertise": [],
+            "category": category,
+        }
+        if category == "PS":
+            substitute_professors[f"PROFESSOR {i}"] = professor
+        else:
+            permanent_professors[f"PROFESSOR {i}"] = professor
+
+    professor_dummy = {
+        settings.DUMMY_PROFESSOR_NAME: {
+            "qualified_courses": ["*"],
+            "expertise": ["*"],
+            "category": "DUMMY",
+        }
+    }
+
+    return {
+        "professors": permanent_professors | substitute_professors | professor_dummy,
+        "permanent_professors": permanent_professors,
+        "substitute_professors": substitute_professors,
+        "courses": courses,
+        "manual_allocation": {},
+    }
+
+
+def parse_size(size: str) -> tuple:
+    """
+    Parses a "<courses>x<professors>" size, e.g. "1000x150".
+    """
+    n_courses, n_professors = size.lower().split("x")
+    return int(n_courses), int(n_professors)
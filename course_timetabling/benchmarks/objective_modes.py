@@ -0,0 +1,106 @@
+"""
+Compares the weighted and the hierarchical objective (settings.OBJECTIVE_MODE) on the same
+data: solve time, range of the objective coefficients and value of each level (classes
+left to DUMMY, PSB, PCB and EAP), on the cached instance and on scaled synthetic ones.
+Runs above the size-limited pip license of Gurobi are reported as NaN.
+
+Usage (from the repository root):
+    CACHE_TTL=315360000 python course_timetabling/benchmarks/objective_modes.py --sizes 200x40 --time-limits 10,10,10,60
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import gurobipy as gp
+
+from instances import generate_instance, load_cached_instance, parse_size
+
+import settings
+from main import CourseTimetabling
+
+
+def get_coefficient_range(timetabling) -> float:
+    """
+    Ratio between the largest and the smallest non-zero objective coefficient, over all
+    the levels of the objective.
+    """
+    coefficients = [
+        abs(coefficient)
+        for _, _, _, level in timetabling.get_objective_levels()
+        for coefficient in level
+        if coefficient
+    ]
+    if settings.OBJECTIVE_MODE == settings.ObjectiveMode.WEIGHTED.value:
+        coefficients += [settings.WEIGHT_FACTOR_PP, settings.WEIGHT_FACTOR_PS]
+        coefficients += [settings.DUMMY_COEFFICIENT]
+
+    return max(coefficients) / min(coefficients)
+
+
+def measure(name: str, instance: dict, objective_mode: str) -> dict:
+    result = {"instance": name, "mode": objective_mode, "status": None}
+
+    with patch("settings.OBJECTIVE_MODE", objective_mode):
+        timetabling = CourseTimetabling(**instance, sparse=True)
+        timetabling.initialize_variables_and_coefficients()
+        timetabling.add_credit_slack_variables()
+        timetabling.add_constraints()
+        timetabling.set_objective()
+        result["coefficient_range"] = get_coefficient_range(timetabling)
+
+        try:
+            start = time.perf_counter()
+            timetabling.optimize()
+            result["solve_s"] = round(time.perf_counter() - start, 3)
+            result["status"] = timetabling.result.status
+            result.update(timetabling.get_objective_values())
+        except gp.GurobiError as error:
+            print(f"{name}/{objective_mode}: not solved ({error})")
+
+    timetabling.clean_model()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="*", default=["60x15", "120x25", "200x40"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-cached", action="store_true")
+    parser.add_argument(
+        "--time-limits", default="", help="Time limit of each hierarchical level"
+    )
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    settings.SOLVER_PARAMETERS = {"OutputFlag": 0, **settings.SOLVER_PARAMETERS}
+    settings.OBJECTIVE_TIME_LIMITS = [
+        float(limit) for limit in args.time_limits.split(",") if limit.strip()
+    ]
+
+    instances = []
+    if not args.skip_cached:
+        instances.append(("cached", load_cached_instance()))
+    for size in args.sizes:
+        n_courses, n_professors = parse_size(size)
+        instances.append(
+            (size, generate_instance(n_courses, n_professors, seed=args.seed))
+        )
+
+    results = [
+        measure(name, instance, objective_mode.value)
+        for name, instance in instances
+        for objective_mode in settings.ObjectiveMode
+    ]
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
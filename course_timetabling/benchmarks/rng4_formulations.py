@@ -0,0 +1,114 @@
+"""
+Compares the pairwise and clique RNG4 formulations: number of constraints, build time and
+root LP bound, on the cached instance and on scaled synthetic ones.
+
+Usage (from the repository root):
+    CACHE_TTL=315360000 python course_timetabling/benchmarks/rng4_formulations.py --sizes 200x40 1000x150
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import gurobipy as gp
+
+from instances import generate_instance, load_cached_instance, parse_size
+
+import settings
+from main import CourseTimetabling
+
+
+def build(instance: dict, conflict_mode: str, rng4_only: bool = False):
+    timetabling = CourseTimetabling(
+        **instance, sparse=True, conflict_mode=conflict_mode
+    )
+    timetabling.model.Params.OutputFlag = 0
+    timetabling.initialize_variables_and_coefficients()
+    timetabling.add_credit_slack_variables()
+
+    if rng4_only:
+        for professor in timetabling.professors:
+            if professor != settings.DUMMY_PROFESSOR_NAME:
+                timetabling.add_conflict_constraints(professor)
+    else:
+        timetabling.add_constraints()
+        timetabling.set_objective()
+
+    timetabling.model.update()
+
+    return timetabling
+
+
+def measure(name: str, instance: dict, conflict_mode: str) -> dict:
+    start = time.perf_counter()
+    rng4 = build(instance, conflict_mode, rng4_only=True)
+    rng4_time = time.perf_counter() - start
+    rng4_constraints = rng4.model.NumConstrs
+    rng4.clean_model()
+
+    start = time.perf_counter()
+    timetabling = build(instance, conflict_mode)
+    build_time = time.perf_counter() - start
+
+    result = {
+        "instance": name,
+        "mode": conflict_mode,
+        "variables": timetabling.model.NumVars,
+        "constraints": timetabling.model.NumConstrs,
+        "rng4_constraints": rng4_constraints,
+        "nonzeros": timetabling.model.NumNZs,
+        "rng4_build_s": round(rng4_time, 3),
+        "build_s": round(build_time, 3),
+        "root_lp_bound": float("nan"),
+        "lp_s": float("nan"),
+    }
+
+    try:
+        relaxation = timetabling.model.relax()
+        start = time.perf_counter()
+        relaxation.optimize()
+        result["lp_s"] = round(time.perf_counter() - start, 3)
+        result["root_lp_bound"] = relaxation.ObjVal
+        relaxation.dispose()
+    except gp.GurobiError as error:
+        print(f"{name}/{conflict_mode}: LP relaxation not solved ({error})")
+
+    timetabling.clean_model()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="*", default=["100x25", "400x80"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-cached", action="store_true")
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    instances = []
+    if not args.skip_cached:
+        instances.append(("cached", load_cached_instance()))
+    for size in args.sizes:
+        n_courses, n_professors = parse_size(size)
+        instances.append(
+            (size, generate_instance(n_courses, n_professors, seed=args.seed))
+        )
+
+    results = []
+    for name, instance in instances:
+        for conflict_mode in (
+            settings.ConflictMode.PAIRWISE.value,
+            settings.ConflictMode.CLIQUE.value,
+        ):
+            results.append(measure(name, instance, conflict_mode))
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
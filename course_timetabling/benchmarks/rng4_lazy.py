@@ -0,0 +1,115 @@
+"""
+Compares the eager (pairwise) and lazy RNG4 formulations: build time, memory and total
+solve time, on the cached instance and on scaled synthetic ones. Runs above the
+size-limited pip license of Gurobi are reported as NaN.
+
+Python memory is the peak traced while building the model, Gurobi memory is the
+MaxMemUsed attribute (GB) after solving.
+
+Usage (from the repository root):
+    CACHE_TTL=315360000 python course_timetabling/benchmarks/rng4_lazy.py --sizes 200x40 1000x150
+"""
+
+import argparse
+import math
+import time
+import tracemalloc
+
+import pandas as pd
+import gurobipy as gp
+
+from instances import generate_instance, load_cached_instance, parse_size
+
+import settings
+from main import CourseTimetabling
+
+
+def measure(name: str, instance: dict, conflict_mode: str) -> dict:
+    result = {
+        "instance": name,
+        "mode": conflict_mode,
+        "status": None,
+        "objective": float("nan"),
+        "lazy_cuts": 0,
+        "solve_s": float("nan"),
+        "gurobi_mem_gb": float("nan"),
+    }
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    timetabling = CourseTimetabling(
+        **instance, sparse=True, conflict_mode=conflict_mode
+    )
+    timetabling.initialize_variables_and_coefficients()
+    timetabling.add_credit_slack_variables()
+    timetabling.add_constraints()
+    timetabling.set_objective()
+    timetabling.model.update()
+    result["build_s"] = round(time.perf_counter() - start, 3)
+    result["build_mem_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    tracemalloc.stop()
+
+    result["variables"] = timetabling.model.NumVars
+    result["constraints"] = timetabling.model.NumConstrs
+
+    try:
+        start = time.perf_counter()
+        timetabling.optimize()
+        result["solve_s"] = round(time.perf_counter() - start, 3)
+        result["status"] = timetabling.result.status
+        result["objective"] = timetabling.result.objective
+        result["lazy_cuts"] = timetabling.lazy_cuts
+        result["gurobi_mem_gb"] = timetabling.model.MaxMemUsed
+    except gp.GurobiError as error:
+        print(f"{name}/{conflict_mode}: not solved ({error})")
+
+    timetabling.clean_model()
+
+    result["total_s"] = round(result["build_s"] + result["solve_s"], 3)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="*", default=["60x15", "120x25", "200x40"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-cached", action="store_true")
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    settings.SOLVER_PARAMETERS = {"OutputFlag": 0, **settings.SOLVER_PARAMETERS}
+
+    instances = []
+    if not args.skip_cached:
+        instances.append(("cached", load_cached_instance()))
+    for size in args.sizes:
+        n_courses, n_professors = parse_size(size)
+        instances.append(
+            (size, generate_instance(n_courses, n_professors, seed=args.seed))
+        )
+
+    results = []
+    for name, instance in instances:
+        eager, lazy = (
+            measure(name, instance, conflict_mode)
+            for conflict_mode in (
+                settings.ConflictMode.PAIRWISE.value,
+                settings.ConflictMode.LAZY.value,
+            )
+        )
+        match = None
+        if not (math.isnan(eager["objective"]) or math.isnan(lazy["objective"])):
+            match = math.isclose(eager["objective"], lazy["objective"])
+        eager["objectives_match"] = lazy["objectives_match"] = match
+        results += [eager, lazy]
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Solves the same RNG/RNP formulation with each solver backend and cross-checks the
+objective values, on the cached instance and on scaled synthetic ones. Gurobi runs are
+reported as NaN when the instance exceeds the size-limited pip license.
+
+Usage (from the repository root):
+    CACHE_TTL=315360000 python course_timetabling/benchmarks/solver_backends.py --sizes 200x40 1000x150
+"""
+
+import argparse
+import math
+import time
+
+import pandas as pd
+import gurobipy as gp
+
+from instances import generate_instance, load_cached_instance, parse_size
+
+import settings
+from main import CourseTimetabling
+
+
+def measure(name: str, instance: dict, backend: str) -> dict:
+    result = {
+        "instance": name,
+        "backend": backend,
+        "status": None,
+        "objective": float("nan"),
+        "solve_s": float("nan"),
+    }
+
+    timetabling = CourseTimetabling(**instance, sparse=True, backend=backend)
+    timetabling.initialize_variables_and_coefficients()
+    timetabling.add_credit_slack_variables()
+    timetabling.add_constraints()
+    timetabling.set_objective()
+    timetabling.model.update()
+    result["variables"] = timetabling.model.NumVars
+    result["constraints"] = timetabling.model.NumConstrs
+
+    try:
+        start = time.perf_counter()
+        timetabling.optimize()
+        result["solve_s"] = round(time.perf_counter() - start, 3)
+        result["status"] = timetabling.result.status
+        result["objective"] = timetabling.result.objective
+    except gp.GurobiError as error:
+        print(f"{name}/{backend}: not solved ({error})")
+
+    timetabling.clean_model()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="*", default=["100x25", "400x80"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-cached", action="store_true")
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    settings.SOLVER_PARAMETERS = {"OutputFlag": 0, **settings.SOLVER_PARAMETERS}
+
+    instances = []
+    if not args.skip_cached:
+        instances.append(("cached", load_cached_instance()))
+    for size in args.sizes:
+        n_courses, n_professors = parse_size(size)
+        instances.append(
+            (size, generate_instance(n_courses, n_professors, seed=args.seed))
+        )
+
+    results = []
+    for name, instance in instances:
+        measured = [
+            measure(name, instance, backend.value) for backend in settings.SolverBackend
+        ]
+        objectives = [
+            r["objective"] for r in measured if not math.isnan(r["objective"])
+        ]
+        for result in measured:
+            result["objectives_match"] = (
+                all(math.isclose(o, objectives[0]) for o in objectives)
+                if len(objectives) > 1
+                else None
+            )
+        results += measured
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
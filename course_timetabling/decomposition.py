@@ -0,0 +1,242 @@
+"""
+Solves the instance split into the connected components of the professor-class
+eligibility graph, in parallel, and merges the results into one timeschedule.
+
+Components only share the DUMMY professor, which has no credit or conflict constraint, so
+each one is an independent model and the sum of their optimal values is the optimal
+value of the whole instance.
+
+Usage (from the repository root):
+    python course_timetabling/decomposition.py --workers 4
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from gurobipy import GRB
+
+import settings
+from main import get_sets, get_timetabling_class, print_objective
+from sweep import get_thread_budget
+from utils import utils
+from utils.presolve import get_eligibility
+from utils.solution import Solution
+
+
+def get_components(sets: dict) -> list:
+    """
+    Splits the sets into the connected components of the eligibility graph (DUMMY left
+    out). Professors without eligible classes and classes only DUMMY can teach are
+    components of their own.
+
+    Returns:
+        list: (professors, courses) pairs of sets.
+    """
+    eligible, _ = get_eligibility(sets)
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for professor, courses in eligible.items():
+        find(("professor", professor))
+        for course in courses.intersection(sets["courses"]):
+            parent[find(("course", course))] = find(("professor", professor))
+    for course in sets["courses"]:
+        find(("course", course))
+
+    components = {}
+    for node in parent:
+        professors, courses = components.setdefault(find(node), (set(), set()))
+        (professors if node[0] == "professor" else courses).add(node[1])
+
+    return list(components.values())
+
+
+def get_component_sets(sets: dict, professors: set, courses: set) -> dict:
+    """
+    Returns the sets of a component, DUMMY included.
+    """
+    professors = professors | {settings.DUMMY_PROFESSOR_NAME}
+
+    return {
+        "professors": {
+            p: details for p, details in sets["professors"].items() if p in professors
+        },
+        "permanent_professors": {
+            p: details
+            for p, details in sets["permanent_professors"].items()
+            if p in professors
+        },
+        "substitute_professors": {
+            p: details
+            for p, details in sets["substitute_professors"].items()
+            if p in professors
+        },
+        "courses": {
+            c: details for c, details in sets["courses"].items() if c in courses
+        },
+        "manual_allocation": {
+            c: allocation
+            for c, allocation in sets["manual_allocation"].items()
+            if c in courses
+        },
+    }
+
+
+def solve_component(sets: dict, threads: int) -> tuple:
+    """
+    Builds and solves the model of a component. Runs in a worker process, so its
+    incumbents are not streamed to results/* (only the merged solution is written).
+
+    As in CourseTimetabling.generate_results, a component stopped before optimality
+    (e.g. TIME_LIMIT) gives its best solution.
+
+    Returns:
+        tuple: The Solution, the objective value (see get_objective_value) and the status
+            of the component.
+    """
+    stream_incumbents = settings.STREAM_INCUMBENTS
+    settings.STREAM_INCUMBENTS = False
+
+    timetabling = None
+    try:
+        timetabling = get_timetabling_class()(
+            **sets,
+            sparse=settings.SPARSE_MODEL,
+            conflict_mode=settings.CONFLICT_MODE,
+        )
+        timetabling.model.Params.OutputFlag = 0
+        timetabling.model.Params.Threads = threads
+        timetabling.initialize_variables_and_coefficients()
+        timetabling.add_credit_slack_variables()
+        timetabling.add_constraints()
+        timetabling.set_objective()
+        timetabling.optimize()
+
+        status = timetabling.result.status
+        if not timetabling.result.values or status == GRB.INFEASIBLE:
+            raise Exception(f"Component model return status={status}")
+
+        return timetabling.extract_solution(), timetabling.get_objective_value(), status
+    finally:
+        if timetabling is not None:
+            timetabling.clean_model()
+        settings.STREAM_INCUMBENTS = stream_incumbents
+
+
+def add_objectives(objectives: list):
+    """
+    Sums the objective values of the components, level by level for the hierarchical
+    objective.
+    """
+    if objectives and isinstance(objectives[0], dict):
+        return {
+            level: sum(objective[level] for objective in objectives)
+            for level in objectives[0]
+        }
+
+    return sum(objectives)
+
+
+def merge_solutions(sets: dict, solutions: list) -> Solution:
+    """
+    Merges the component solutions, ordered as the monolithic model would list them
+    (professors, then courses, in the order of the sets).
+    """
+    professor_position = {p: i for i, p in enumerate(sets["professors"])}
+    course_position = {c: j for j, c in enumerate(sets["courses"])}
+
+    def merge(field, key):
+        return tuple(
+            sorted(
+                (
+                    record
+                    for solution in solutions
+                    for record in getattr(solution, field)
+                ),
+                key=key,
+            )
+        )
+
+    def by_professor(shortfall):
+        return professor_position[shortfall.professor]
+
+    return Solution(
+        merge(
+            "allocations",
+            lambda allocation: (
+                professor_position[allocation.professor],
+                course_position[allocation.course_class_id],
+            ),
+        ),
+        merge("permanent_shortfall", by_professor),
+        merge("substitute_shortfall", by_professor),
+    )
+
+
+def solve_decomposed(sets: dict, workers: int = None) -> tuple:
+    """
+    Solves each component in a process pool and merges the results.
+
+    Args:
+        sets (dict): The sets keyed by the CourseTimetabling argument names.
+        workers (int): Number of worker processes, the number of cores by default.
+
+    Returns:
+        tuple: The merged Solution, the objective value, the number of components and the
+            status: GRB.OPTIMAL if every component was solved to optimality, the status
+            of the first one that was not otherwise.
+    """
+    components = get_components(sets)
+    workers = max(min(workers or os.cpu_count() or 1, len(components)), 1)
+    threads = get_thread_budget(workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                solve_component,
+                get_component_sets(sets, professors, courses),
+                threads,
+            )
+            for professors, courses in components
+        ]
+        results = [future.result() for future in futures]
+
+    solutions, objectives, statuses = zip(*results)
+    # A solução só é ótima se a de todos os componentes for
+    status = next((status for status in statuses if status != GRB.OPTIMAL), GRB.OPTIMAL)
+
+    return (
+        merge_solutions(sets, solutions),
+        add_objectives(list(objectives)),
+        len(components),
+        status,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    args = parser.parse_args()
+
+    sets = get_sets()
+    solution, objective, n_components, status = solve_decomposed(sets, args.workers)
+    utils.treat_and_save_results(solution, sets["courses"])
+
+    print("========= RESULT ==========")
+    print(f"{n_components} independent components solved, status={status}")
+    print("Result was saved in results/*")
+    print("=============================")
+    print_objective(objective)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,27 @@
+import argparse
+import os
+import time
+from collections import defaultdict
+
 import gurobipy as gp
 from gurobipy import GRB
 
 import settings
 
 from utils import utils
+from utils.schedule import build_schedule_index
+from utils.model_cache import ModelCache
+from utils.presolve import presolve
+from utils.profiler import Profiler, get_constraint_family
+from utils.result_cache import ResultCache
+from utils.solution import Allocation, CreditShortfall, Solution
+from utils.solver_backend import get_backend
+from utils.warm_start import UnmappedRow, load_previous_solution
+from utils.conflict_graph import ConflictGraph
+from utils.conditioning import ConditioningReport, analyze, rescale_objective
+from utils.diagnosis import DiagnosisReport, check_sets, diagnose
+from utils.env_pool import create_environment, get_env_pool
+from utils.telemetry import TelemetryRecorder
 from database.construct_sets import (
     get_courses_set,
     get_manual_allocation_set,
@@ -19,100 +37,216 @@ class CourseTimetabling:
         substitute_professors,
         courses,
         manual_allocation,
+        sparse=False,
+        conflict_mode=settings.ConflictMode.PAIRWISE.value,
+        backend=None,
     ):
         self.professors = professors
         self.permanent_professors = permanent_professors
         self.substitute_professors = substitute_professors
         self.courses = courses
+        self.schedule_index = build_schedule_index(courses)
+        self.conflict_graph = ConflictGraph(self.schedule_index)
         self.manual_allocation = manual_allocation
-        self.EAP_coefficient = {}
-        self.X_variables = {}
-        self.PP_slack_variables = {}
-        self.PS_slack_variables = {}
+        self.sparse = sparse
+        self.conflict_mode = conflict_mode
+        self.variable_keys = gp.tuplelist()
+        self.EAP = gp.tupledict()
+        self.credit_coefficient = gp.tupledict()
+        self.X = gp.tupledict()
+        self.PP_slack_variables = gp.tupledict()
+        self.PS_slack_variables = gp.tupledict()
+        self.manual_constraints = {}
+        self.credit_constraints = {}
+        self.assignment_constraints = {}
+        self.conflict_constraints = {}
+        self.unqualified_constraints = {}
+        self.inactive_professors = set()
+        self.previous_solution = {}
+        self.backend = get_backend(backend)
+        self.result = None
+        self.telemetry = None
+        self.lazy_cuts = 0
+        # PresolveResult dos conjuntos originais, para os incumbentes escritos em results/*
+        self.presolved = None
 
         self.env = self.init_environment()
         self.model = gp.Model(name="CourseTimetabling", env=self.env)
 
     def init_environment(self):
-        if settings.APP_LICENSE_TYPE == settings.LicenseType.NAMED_USER_ACADEMIC.value:
-            env = gp.Env(empty=False)
-
-        elif settings.APP_LICENSE_TYPE == settings.LicenseType.WSL_ACADEMIC.value:
-            env = gp.Env(empty=True)
-            env.setParam("LicenseID", settings.APP_LICENSE_ID)
-            env.setParam("WLSAccessID", settings.APP_WLS_ACCESS_ID)
-            env.setParam("WLSSecret", settings.APP_WS_SECRET)
+        if settings.ENV_POOL:
+            return get_env_pool().acquire()
 
-        env.start()
-
-        return env
+        return create_environment()
 
     def set_courses(self, courses):
         self.courses = courses
+        self.schedule_index = build_schedule_index(courses)
+        self.conflict_graph = ConflictGraph(self.schedule_index)
+
+    def get_variable(self, professor, course):
+        """
+        Returns the X variable of a professor and course.
+        """
+        return self.X[professor, course]
+
+    def get_EAP(self, professor, course):
+        """
+        Returns the EAP coefficient of a professor and course.
+        """
+        return self.EAP[professor, course]
+
+    def get_variable_name(self, professor, course) -> str:
+        schedule = self.schedule_index[course]
+        return f"{professor}_{course}_{schedule.day}_{schedule.time}"
+
+    def get_professor_courses(self, professor) -> list:
+        """
+        Returns the courses a professor has an X variable for.
+        """
+        return [course for _, course in self.variable_keys.select(professor, "*")]
+
+    def nest_by_schedule(self, flat) -> dict:
+        """
+        Turns a (professor, course) keyed dict into the former professor -> course -> day -> time layout.
+        """
+        nested = {professor: {} for professor in self.professors}
+        for (professor, course), value in flat.items():
+            schedule = self.schedule_index[course]
+            nested.setdefault(professor, {})[course] = {
+                schedule.day: {schedule.time: value}
+            }
+
+        return nested
+
+    @property
+    def X_variables(self) -> dict:
+        """
+        Nested (professor, course, day, time) view of X, kept for compatibility.
+        """
+        return self.nest_by_schedule(self.X)
+
+    @property
+    def EAP_coefficient(self) -> dict:
+        """
+        Nested (professor, course, day, time) view of EAP, kept for compatibility.
+        """
+        return self.nest_by_schedule(self.EAP)
 
     def initialize_variables_and_coefficients(self):
         """
         Initializes the binary variables and coefficients for the course timetabling problem.
 
+        The variables and EAP coefficients are stored in flat tupledicts keyed by
+        (professor, course), so constraints can use X.sum/X.prod wildcards. The EAP
+        coefficients are set as the variables' objective coefficients (see set_objective).
+
+        In sparse mode, variables are only created for the courses a professor is eligible
+        to teach (qualified courses, SVC basic courses and their manual allocations; every
+        course for the DUMMY professor). The remaining pairs would be forced to zero by RNG5
+        anyway, so the resulting model is equivalent to the dense one.
+
         Constants:
             settings.DUMMY_PROFESSOR_NAME: A constant representing a dummy professor.
             settings.DUMMY_COEFFICIENT: The coefficient value for dummy professors.
             settings.DEFAULT_COEFFICIENT: The default coefficient value for qualified courses.
             settings.ZERO_COEFFICIENT: The coefficient value for unqualified courses.
         """
-        for professor in self.professors:
-            self.EAP_coefficient[professor] = {}
-            self.X_variables[professor] = {}
+        keys = []
+        EAP = {}
 
-            qualified_courses = utils.get_qualified_courses_for_professor(
-                self.courses, self.professors, professor
-            )
-            qualified_courses_with_manual_allocation = (
-                utils.add_manual_allocation_courses(
-                    professor, qualified_courses, self.manual_allocation
-                )
+        for professor in self.professors:
+            qualified_courses_with_manual_allocation = self.get_eligible_courses(
+                professor
             )
 
             for course in self.courses.keys():
-                self.EAP_coefficient[professor][course] = {}
-                self.X_variables[professor][course] = {}
+                if (
+                    self.sparse
+                    and course not in qualified_courses_with_manual_allocation
+                ):
+                    continue
+
+                keys.append((professor, course))
+                EAP[professor, course] = self.get_EAP_coefficient(
+                    professor, course, qualified_courses_with_manual_allocation
+                )
+
+        self.variable_keys = gp.tuplelist(keys)
+        self.EAP = gp.tupledict(EAP)
+        self.credit_coefficient = gp.tupledict(
+            (key, self.schedule_index[key[1]].credits) for key in keys
+        )
+        self.X = self.add_named_vars(
+            self.variable_keys,
+            [self.get_variable_name(professor, course) for professor, course in keys],
+            GRB.BINARY,
+            obj=self.EAP,
+        )
+
+    def get_eligible_courses(self, professor) -> set:
+        """
+        Returns the courses a professor may be allocated to: the courses they are qualified
+        for (SVC basic courses included) plus the ones manually allocated to them.
+        The DUMMY professor is eligible for every course.
+        """
+        qualified_courses = utils.get_qualified_courses_for_professor(
+            self.courses, self.professors, professor
+        )
 
-                workload = utils.get_course_schedule(self.courses, course)
-                day, time = workload
+        return utils.add_manual_allocation_courses(
+            professor, qualified_courses, self.manual_allocation
+        )
 
-                self.EAP_coefficient[professor][course][day] = {}
+    def get_EAP_coefficient(self, professor, course, eligible_courses) -> float:
+        """
+        Computes the aptitude coefficient (EAP) of allocating a professor to a course.
 
-                EAPI = 0
-                EAPP = 0
-                EAPS = 0
+        Args:
+            professor (str): The professor name.
+            course (str): The course class id.
+            eligible_courses (set): The courses the professor is eligible for (see get_eligible_courses).
 
-                if professor == settings.DUMMY_PROFESSOR_NAME:
-                    EAPI = settings.DUMMY_COEFFICIENT
-                else:
-                    if self.courses[course]["course_type"] == "SVC" and any(
-                        cid in settings.SVC_BASIC_COURSES
-                        for cid in self.courses[course]["course_id"].split(",")
-                    ):
-                        if self.professors[professor]["category"] == "PS":
-                            EAPI = settings.SERVICE_COURSE_COEFFICIENT_SP
-                        else:
-                            EAPI = settings.SERVICE_COURSE_COEFFICIENT_PP
-                    elif course in qualified_courses_with_manual_allocation:
-                        EAPI = settings.DEFAULT_COEFFICIENT
-                    else:
-                        EAPI = settings.ZERO_COEFFICIENT
-
-                if EAPI:
-                    self.EAP_coefficient[professor][course][day][time] = (
-                        EAPI + EAPP + EAPS
-                    )
+        Returns:
+            float: The EAP coefficient, zero if the professor is not qualified for the course.
+        """
+        EAPI = 0
+        EAPP = 0
+        EAPS = 0
+
+        if professor == settings.DUMMY_PROFESSOR_NAME:
+            EAPI = settings.DUMMY_COEFFICIENT
+        else:
+            if self.courses[course]["course_type"] == "SVC" and any(
+                cid in settings.SVC_BASIC_COURSES
+                for cid in self.courses[course]["course_id"].split(",")
+            ):
+                if self.professors[professor]["category"] == "PS":
+                    EAPI = settings.SERVICE_COURSE_COEFFICIENT_SP
                 else:
-                    self.EAP_coefficient[professor][course][day][time] = 0
+                    EAPI = settings.SERVICE_COURSE_COEFFICIENT_PP
+            elif course in eligible_courses:
+                EAPI = settings.DEFAULT_COEFFICIENT
+            else:
+                EAPI = settings.ZERO_COEFFICIENT
 
-                self.X_variables[professor][course][day] = {}
-                self.X_variables[professor][course][day][time] = self.model.addVar(
-                    vtype=GRB.BINARY, name=f"{professor}_{course}_{day}_{time}"
-                )
+        if EAPI:
+            return EAPI + EAPP + EAPS
+
+        return 0
+
+    def add_named_vars(self, keys, names, vtype, obj=0.0) -> gp.tupledict:
+        """
+        Adds one variable per key with model.addVars, with the given objective
+        coefficient(s), and names them.
+
+        The names are set with setAttr because addVars does not encode non-ASCII names
+        (e.g. accented professor names) correctly.
+        """
+        variables = self.model.addVars(keys, vtype=vtype, obj=obj)
+        self.model.setAttr("VarName", list(variables.values()), names)
+
+        return variables
 
     def add_credit_slack_variables(self):
         """
@@ -126,133 +260,91 @@ class CourseTimetabling:
             slack_variables (dict): A dictionary to store the slack variables for each professor.
             model (gurobipy.Model): The optimization model to which the slack variables are added.
         """
-        for professor in self.permanent_professors:
-            self.PP_slack_variables[professor] = self.model.addVar(
-                vtype=GRB.INTEGER, name=f"PCB_{professor}"
-            )
+        permanent = list(self.permanent_professors)
+        substitute = list(self.substitute_professors)
 
-        for professor in self.substitute_professors:
-            self.PS_slack_variables[professor] = self.model.addVar(
-                vtype=GRB.INTEGER, name=f"PSB_{professor}"
-            )
+        self.PP_slack_variables = self.add_named_vars(
+            permanent,
+            [f"PCB_{p}" for p in permanent],
+            GRB.INTEGER,
+            obj=-settings.WEIGHT_FACTOR_PP,
+        )
+        self.PS_slack_variables = self.add_named_vars(
+            substitute,
+            [f"PSB_{p}" for p in substitute],
+            GRB.INTEGER,
+            obj=-settings.WEIGHT_FACTOR_PS,
+        )
 
     def add_constraints(self):
-        course_days, course_times = utils.get_possible_schedules(self.courses)
-
         # Manual
         # RNP1: Alocar manualmente os professores
         for course_class_id in self.manual_allocation.keys():
             professor = self.manual_allocation[course_class_id]["professor"]
-            day = self.manual_allocation[course_class_id]["day"]
-            time = self.manual_allocation[course_class_id]["time"]
 
-            self.model.addConstr(
-                self.X_variables[professor][course_class_id][day][time] == 1
+            self.manual_constraints[course_class_id] = self.model.addConstr(
+                self.get_variable(professor, course_class_id) == 1,
+                name=f"RNP1_{course_class_id}",
             )
 
         # Soft constraints
         # RNG1: Garante que o professor permanente seja alocado com a quantidade de créditos sujerida pela coordenação se possível. Não inviabiliza o modelo caso não seja atingido.
         for professor in self.permanent_professors:
-            self.model.addConstr(
-                gp.quicksum(
-                    self.X_variables[professor][course][
-                        utils.get_course_schedule(self.courses, course)[0]
-                    ][utils.get_course_schedule(self.courses, course)[1]]
-                    * self.courses[course]["credits"]
-                    for course in self.courses.keys()
+            self.credit_constraints[professor] = [
+                self.model.addConstr(
+                    self.X.prod(self.credit_coefficient, professor, "*")
+                    == settings.MIN_CREDITS_PERMANENT
+                    - self.PP_slack_variables[professor],
+                    name=f"RNG1_{professor}",
                 )
-                == settings.MIN_CREDITS_PERMANENT - self.PP_slack_variables[professor]
-            )
+            ]
 
         for professor in self.substitute_professors:
             # RNG2: Garante que o professor permanente seja alocado com a quantidade de créditos sujerida pela coordenação se possível. Não inviabiliza o modelo caso não seja atingido.
-            self.model.addConstr(
-                gp.quicksum(
-                    self.X_variables[professor][course][
-                        utils.get_course_schedule(self.courses, course)[0]
-                    ][utils.get_course_schedule(self.courses, course)[1]]
-                    * self.courses[course]["credits"]
-                    for course in self.courses.keys()
-                )
-                == settings.MIN_CREDITS_SUBSTITUTE - self.PS_slack_variables[professor]
+            RNG2 = self.model.addConstr(
+                self.X.prod(self.credit_coefficient, professor, "*")
+                == settings.MIN_CREDITS_SUBSTITUTE - self.PS_slack_variables[professor],
+                name=f"RNG2_{professor}",
             )
 
             # Hard constraints
 
             # RNP2: Regime de trabalho (quantidade de horas) - quantidade de créditos máximo para o professor efetivo
-            self.model.addConstr(
-                gp.quicksum(
-                    self.X_variables[professor][course][
-                        utils.get_course_schedule(self.courses, course)[0]
-                    ][utils.get_course_schedule(self.courses, course)[1]]
-                    * self.courses[course]["credits"]
-                    for course in self.courses.keys()
-                )
-                <= settings.MAX_CREDITS_PERMANENT
+            RNP2 = self.model.addConstr(
+                self.X.prod(self.credit_coefficient, professor, "*")
+                <= settings.MAX_CREDITS_PERMANENT,
+                name=f"RNP2_{professor}",
             )
 
             # RNP3: Regime de trabalho (quantidade de horas) - quantidade de créditos máximo para o professor substituto
-            self.model.addConstr(
-                gp.quicksum(
-                    self.X_variables[professor][course][
-                        utils.get_course_schedule(self.courses, course)[0]
-                    ][utils.get_course_schedule(self.courses, course)[1]]
-                    * self.courses[course]["credits"]
-                    for course in self.courses.keys()
-                )
-                <= settings.MAX_CREDITS_SUBSTITUTE
+            RNP3 = self.model.addConstr(
+                self.X.prod(self.credit_coefficient, professor, "*")
+                <= settings.MAX_CREDITS_SUBSTITUTE,
+                name=f"RNP3_{professor}",
             )
 
+            self.credit_constraints[professor] = [RNG2, RNP2, RNP3]
+
         # RNG3: Uma disciplina de uma turma, deverá ser ministrada por um único professor
         for course in self.courses.keys():
-            workload = utils.get_course_schedule(self.courses, course)
-            day, time = workload
-            self.model.addConstr(
-                gp.quicksum(
-                    self.X_variables[professor][course][day][time]
-                    for professor in self.professors
-                )
-                == 1
+            self.assignment_constraints[course] = self.model.addConstr(
+                self.X.sum("*", course) == 1, name=f"RNG3_{course}"
             )
 
         # RNG4: Um professor poderá dar no máximo 1 disciplina de uma turma em um mesmo dia e horário (binário OU <= 1)
         for professor in self.professors:
             if professor == settings.DUMMY_PROFESSOR_NAME:
                 continue
-            for i in range(len(course_days)):
-                day = course_days[i]
-                time = course_times[i]
-
-                day_courses = utils.get_courses_by_day(self.courses, day)
-                time_courses = utils.get_courses_by_time(self.courses, time)
-                common_courses = day_courses.intersection(time_courses)
-
-                exact_time_courses = utils.get_courses_by_exact_day_and_time(
-                    self.courses, day, time
-                )
-                conflict_courses = common_courses.difference(exact_time_courses)
-
-                self.model.addConstr(
-                    gp.quicksum(
-                        self.X_variables[professor][course][day][time]
-                        for course in exact_time_courses
-                    )
-                    <= 1
-                )
-
-                # Adiciona restrição para garantir que se uma variável for 1, as outras sejam 0
-                for course in exact_time_courses:
-                    for cc in conflict_courses:
-                        self.model.addConstr(
-                            self.X_variables[professor][course][day][time]
-                            + self.X_variables[professor][cc][
-                                utils.get_course_schedule(self.courses, cc)[0]
-                            ][utils.get_course_schedule(self.courses, cc)[1]]
-                            <= 1
-                        )
+            self.conflict_constraints[professor] = self.add_conflict_constraints(
+                professor
+            )
 
         # RNG5: Um professor não pode lecionar uma disciplina em que ele não esteja apto
         # Caso o professor seja alocado manualmente, ele não precisa lecionar uma disciplina que esteja apto (sem verificação)
+        # No modo esparso as variáveis de disciplinas não aptas nem chegam a ser criadas
+        if self.sparse:
+            return
+
         for professor in self.professors:
             all_courses = utils.get_all_course_class_id(self.courses)
             courses_available = utils.remove_courses(
@@ -263,63 +355,910 @@ class CourseTimetabling:
                 self.courses, self.professors, professor
             )
             unqualified_courses = courses_available.difference(qualified_courses)
-            self.model.addConstr(
+            self.unqualified_constraints[professor] = self.model.addConstr(
                 gp.quicksum(
-                    self.X_variables[professor][course][
-                        utils.get_course_schedule(self.courses, course)[0]
-                    ][utils.get_course_schedule(self.courses, course)[1]]
+                    self.get_variable(professor, course)
                     for course in unqualified_courses
                 )
-                == 0
+                == 0,
+                name=f"RNG5_{professor}",
             )
 
-    def set_objective(self):
-        self.model.setObjective(
-            gp.quicksum(
-                self.X_variables[professor][course][
-                    utils.get_course_schedule(self.courses, course)[0]
-                ][utils.get_course_schedule(self.courses, course)[1]]
-                * self.EAP_coefficient[professor][course][
-                    utils.get_course_schedule(self.courses, course)[0]
-                ][utils.get_course_schedule(self.courses, course)[1]]
-                for professor in self.professors
-                for course in self.courses.keys()
+    def add_conflict_constraints(self, professor):
+        """
+        Adds the RNG4 constraints of a professor from the shared conflict graph.
+
+        In pairwise mode: at most one course of each group of identical schedules, and at
+        most one of each pair of overlapping courses from different groups.
+        In clique mode: at most one course of each clique of the graph's clique cover, which
+        gives fewer constraints and a tighter LP relaxation.
+        In lazy mode: none, see separate_conflicts.
+
+        Args:
+            professor (str): The professor name.
+
+        Returns:
+            list: The added constraints.
+        """
+        if self.conflict_mode == settings.ConflictMode.LAZY.value:
+            return []
+
+        professor_courses = set(self.get_professor_courses(professor))
+        graph = self.conflict_graph
+        constraints = []
+
+        if self.conflict_mode == settings.ConflictMode.CLIQUE.value:
+            professor_cliques = dict.fromkeys(
+                tuple(course for course in clique if course in professor_courses)
+                for clique in graph.cliques()
             )
-            - gp.quicksum(
-                settings.WEIGHT_FACTOR_PP * self.PP_slack_variables[professor]
-                for professor in self.permanent_professors
+            for k, clique in enumerate(professor_cliques):
+                if len(clique) < 2:
+                    continue
+                constraints.append(
+                    self.model.addConstr(
+                        gp.quicksum(
+                            self.get_variable(professor, course) for course in clique
+                        )
+                        <= 1,
+                        name=f"RNG4_{professor}_C{k}",
+                    )
+                )
+            return constraints
+
+        for g, group in enumerate(graph.groups):
+            exact_time_courses = [
+                course for course in group if course in professor_courses
+            ]
+            if not exact_time_courses:
+                continue
+
+            constraints.append(
+                self.model.addConstr(
+                    gp.quicksum(
+                        self.get_variable(professor, course)
+                        for course in exact_time_courses
+                    )
+                    <= 1,
+                    name=f"RNG4_{professor}_G{g}",
+                )
             )
-            - gp.quicksum(
-                settings.WEIGHT_FACTOR_PS * self.PS_slack_variables[professor]
-                for professor in self.substitute_professors
+
+        # Adiciona restrição para garantir que se uma variável for 1, as outras sejam 0
+        for course in self.get_professor_courses(professor):
+            if course not in graph.group_of:
+                continue
+            for cc in graph.conflicts(course):
+                if (
+                    cc in professor_courses
+                    and graph.group_of[cc] != graph.group_of[course]
+                    and graph.position[course] < graph.position[cc]
+                ):
+                    constraints.append(
+                        self.model.addConstr(
+                            self.get_variable(professor, course)
+                            + self.get_variable(professor, cc)
+                            <= 1,
+                            name=f"RNG4_{professor}_{course}_{cc}",
+                        )
+                    )
+
+        return constraints
+
+    def set_objective(self):
+        """
+        Maximizes sum(EAP * X) - WEIGHT_FACTOR_PP * sum(PCB) - WEIGHT_FACTOR_PS * sum(PSB).
+
+        The coefficients are given to the variables when they are created, so the objective
+        is never built as an expression: only the sense is left to set here.
+        """
+        self.model.ModelSense = GRB.MAXIMIZE
+
+    def get_objective_levels(self) -> list:
+        """
+        Returns the levels of the hierarchical objective, most important first: classes
+        left to DUMMY, PSB credits, PCB credits (all minimized) and EAP (maximized).
+
+        Returns:
+            list: (name, sense, variables, coefficients) of each level, where sense is -1
+                to minimize and 1 to maximize sum(coefficients * variables).
+        """
+        dummy = settings.DUMMY_PROFESSOR_NAME
+        dummy_keys = [key for key in self.X.keys() if key[0] == dummy]
+        teaching_keys = [key for key in self.X.keys() if key[0] != dummy]
+
+        return [
+            (
+                "dummy",
+                -1,
+                [self.X[key] for key in dummy_keys],
+                [1.0] * len(dummy_keys),
             ),
-            GRB.MAXIMIZE,
-        )
+            (
+                "substitute_shortfall",
+                -1,
+                list(self.PS_slack_variables.values()),
+                [1.0] * len(self.PS_slack_variables),
+            ),
+            (
+                "permanent_shortfall",
+                -1,
+                list(self.PP_slack_variables.values()),
+                [1.0] * len(self.PP_slack_variables),
+            ),
+            (
+                "eap",
+                1,
+                [self.X[key] for key in teaching_keys],
+                [self.EAP[key] for key in teaching_keys],
+            ),
+        ]
+
+    def set_objective_levels(self):
+        """
+        Replaces the weighted objective by the hierarchical one (settings.OBJECTIVE_MODE),
+        one setObjectiveN per level of get_objective_levels: each level is optimized
+        without degrading the more important ones, so no weight factor is needed and the
+        coefficients of a level stay in a narrow range.
+
+        settings.OBJECTIVE_TIME_LIMITS gives the time budget of each level. Called by
+        optimize, so that the levels follow the delta operations.
+        """
+        self.model.ModelSense = GRB.MAXIMIZE
+        self.model.discardMultiobjEnvs()
+
+        levels = self.get_objective_levels()
+        for index, (name, sense, variables, coefficients) in enumerate(levels):
+            self.model.setObjectiveN(
+                gp.LinExpr(coefficients, variables),
+                index,
+                priority=len(levels) - index,
+                weight=sense,
+                name=name,
+            )
+
+        for index, time_limit in enumerate(
+            settings.OBJECTIVE_TIME_LIMITS[: len(levels)]
+        ):
+            if time_limit > 0:
+                self.model.getMultiobjEnv(index).setParam("TimeLimit", time_limit)
+
+    def get_objective_values(self) -> dict:
+        """
+        Returns the value of each level of get_objective_levels in the last solution, in
+        either objective mode.
+        """
+        return {
+            name: sum(
+                coefficient * value
+                for coefficient, value in zip(coefficients, self.get_values(variables))
+            )
+            for name, _, variables, coefficients in self.get_objective_levels()
+        }
+
+    def get_objective_value(self):
+        """
+        Returns the objective of the last solution: result.objective, or the value of each
+        level (see get_objective_values) if the model has the hierarchical objective,
+        whose result.objective is only the most important level.
+        """
+        if self.model.IsMultiObj:
+            return self.get_objective_values()
+
+        return self.result.objective
+
+    def get_variable_families(self) -> dict:
+        """
+        Returns the variables of each family: X of the professors, X of DUMMY, PCB and PSB.
+        """
+        dummy = settings.DUMMY_PROFESSOR_NAME
+
+        return {
+            "X": [variable for (p, _), variable in self.X.items() if p != dummy],
+            "X_DUMMY": [variable for (p, _), variable in self.X.items() if p == dummy],
+            "PCB": list(self.PP_slack_variables.values()),
+            "PSB": list(self.PS_slack_variables.values()),
+        }
+
+    def analyze_conditioning(self) -> ConditioningReport:
+        """
+        Reports the matrix, RHS and objective coefficient ranges of each family and flags
+        the ones outside the ranges recommended by Gurobi (see utils.conditioning.analyze).
+        """
+        return analyze(self.model, self.get_variable_families())
+
+    def update_objective_coefficients(
+        self, EAP=None, weight_factor_PP=None, weight_factor_PS=None
+    ):
+        """
+        Re-weights the objective in place, pushing the new coefficients in bulk.
+
+        Args:
+            EAP (dict): New EAP coefficients keyed by (professor, course); missing keys keep their value.
+            weight_factor_PP (float): New weight of the PCB slack variables.
+            weight_factor_PS (float): New weight of the PSB slack variables.
+        """
+        if EAP:
+            keys = [key for key in EAP if key in self.X]
+            self.EAP.update((key, EAP[key]) for key in keys)
+            self.model.setAttr(
+                "Obj", [self.X[key] for key in keys], [EAP[key] for key in keys]
+            )
+
+        for slack_variables, weight in (
+            (self.PP_slack_variables, weight_factor_PP),
+            (self.PS_slack_variables, weight_factor_PS),
+        ):
+            if weight is not None and slack_variables:
+                self.model.setAttr(
+                    "Obj",
+                    list(slack_variables.values()),
+                    [-weight] * len(slack_variables),
+                )
 
     def optimize(self):
+        """
+        Solves the model with the solver backend (settings.SOLVER_BACKEND by default) and
+        the parameters in settings.SOLVER_PARAMETERS.
+
+        With settings.TELEMETRY (Gurobi backend only), the convergence of the solve is
+        recorded in self.telemetry and saved in settings.TELEMETRY_DIR. In the lazy RNG4
+        mode (Gurobi backend only), the conflicts are enforced by separate_conflicts.
+        With the hierarchical objective (Gurobi backend only), result.objective is the value
+        of the most important level, see get_objective_values for all of them.
+        With settings.RESCALE_OBJECTIVE, the tie-breaking terms of the weighted objective
+        are lifted during the solve (see utils.conditioning.rescale_objective);
+        result.objective and the final telemetry record are given back in the original
+        scale (the bound with the tie-breaking terms of the incumbent), the callbacks see
+        the rescaled one.
+        """
+        lazy = self.conflict_mode == settings.ConflictMode.LAZY.value
+        if lazy and self.backend.name != settings.SolverBackend.GUROBI.value:
+            raise ValueError(
+                "The lazy RNG4 mode needs the callbacks of the Gurobi backend"
+            )
+
+        hierarchical = (
+            settings.OBJECTIVE_MODE == settings.ObjectiveMode.HIERARCHICAL.value
+        )
+        if hierarchical and self.backend.name != settings.SolverBackend.GUROBI.value:
+            raise ValueError(
+                "The hierarchical objective needs the setObjectiveN of the Gurobi backend"
+            )
+        if hierarchical:
+            self.set_objective_levels()
+
+        callbacks = []
+        if settings.STREAM_INCUMBENTS:
+            callbacks.append(self.stream_incumbent)
+
+        self.telemetry = None
+        if (
+            settings.TELEMETRY
+            and self.backend.name == settings.SolverBackend.GUROBI.value
+        ):
+            self.telemetry = TelemetryRecorder(settings.TELEMETRY_INTERVAL)
+            callbacks.append(self.telemetry.callback)
+
+        callback = None
+        if callbacks or lazy:
+
+            def callback(model, where):
+                # Candidata rejeitada pelos cortes de RNG4: não é um incumbente
+                if lazy and self.separate_conflicts(model, where):
+                    return
+                for function in callbacks:
+                    function(model, where)
+
+        self.lazy_cuts = 0
+        if lazy:
+            self.model.Params.LazyConstraints = 1
+
+        rescaling = None
+        if settings.RESCALE_OBJECTIVE and not hierarchical:
+            rescaling = rescale_objective(self.model)
+
+        try:
+            self.result = self.backend.solve(
+                self.model, settings.SOLVER_PARAMETERS, callback
+            )
+            # Antes de restaurar a escala: o model.update() descarta os atributos da solução
+            if self.telemetry:
+                self.telemetry.finish(self.model)
+        finally:
+            if rescaling:
+                rescaling.restore(self.model)
+
+        if rescaling and self.result.values:
+            self.result = self.result._replace(
+                objective=rescaling.get_original_objective(
+                    self.result.objective, self.result.values
+                )
+            )
+            if self.telemetry:
+                self.telemetry.map_final(
+                    lambda objective: rescaling.get_original_objective(
+                        objective, self.result.values
+                    )
+                )
+
+        if self.telemetry:
+            path = get_telemetry_path()
+            self.telemetry.save(path)
+            print(f"Telemetry saved in {path}")
+
+        if self.result.values:
+            self.previous_solution = dict(
+                zip(self.X.keys(), self.get_values(self.X.values()))
+            )
+
+    def separate_conflicts(self, model, where) -> int:
+        """
+        Gurobi callback of the lazy RNG4 mode: on each integer candidate (MIPSOL), adds the
+        pairwise RNG4 constraint of every pair of conflicting courses given to the same
+        professor, which rejects the candidate. Most pairs are never binding, so only a
+        few of them end up in the model.
+
+        Returns:
+            int: The number of constraints added (also summed in self.lazy_cuts).
+        """
+        if where != GRB.Callback.MIPSOL:
+            return 0
+
+        keys = list(self.X.keys())
+        values = model.cbGetSolution(list(self.X.values()))
+
+        selected = {}
+        for (professor, course), value in zip(keys, values):
+            if value > 0.5 and professor != settings.DUMMY_PROFESSOR_NAME:
+                selected.setdefault(professor, []).append(course)
+
+        cuts = 0
+        for professor, courses in selected.items():
+            for i, course in enumerate(courses):
+                for other in courses[i + 1 :]:
+                    if self.conflict_graph.are_conflicting(course, other):
+                        model.cbLazy(
+                            self.get_variable(professor, course)
+                            + self.get_variable(professor, other)
+                            <= 1
+                        )
+                        cuts += 1
+
+        self.lazy_cuts += cuts
+
+        return cuts
+
+    def stream_incumbent(self, model, where):
+        """
+        Gurobi callback writing every new incumbent to the results files, in the same
+        format as generate_results, while the solver keeps going. Each file is replaced
+        atomically, so it always holds a whole solution. After a presolve (see
+        self.presolved) the incumbent is mapped back to the original sets first.
+        """
+        if where != GRB.Callback.MIPSOL:
+            return
+
+        solution = self.extract_solution(
+            lambda variables: model.cbGetSolution(list(variables))
+        )
+        courses = self.courses
+        if self.presolved:
+            solution, _ = self.presolved.postsolve(
+                solution, model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            )
+            courses = self.presolved.original_sets["courses"]
+        utils.treat_and_save_results(solution, courses)
+        print(
+            f"Incumbent {model.cbGet(GRB.Callback.MIPSOL_OBJ)} saved in results/* "
+            f"(bound {model.cbGet(GRB.Callback.MIPSOL_OBJBND)})"
+        )
+
+    def get_values(self, variables) -> list:
+        """
+        Returns the values of variables in the last solution of the backend.
+        """
+        return [self.result.values[variable.index] for variable in variables]
+
+    def set_start(self, solution: Solution) -> list:
+        """
+        Sets the MIP start from a previous solution, e.g. last semester's timeschedule.
+
+        The allocations that still map to an X variable start at one and the other X
+        variables at zero. Manual allocations take precedence over the previous ones, the
+        classes left without a professor start with DUMMY, and the PCB/PSB slacks start
+        at the credit shortfall of that assignment, so the start is complete.
+
+        Args:
+            solution (Solution): The previous solution.
+
+        Returns:
+            list: The UnmappedRow of the allocations that could not be used.
+        """
+        start = dict.fromkeys(self.X.keys(), 0)
+        allocated = {
+            course: allocation["professor"]
+            for course, allocation in self.manual_allocation.items()
+        }
+        unmapped = []
+
+        for allocation in solution.allocations:
+            professor, course = allocation.professor, allocation.course_class_id
+
+            if course not in self.courses:
+                reason = "class not found"
+            elif professor not in self.professors:
+                reason = "professor not found"
+            elif professor in self.inactive_professors:
+                reason = "professor inactive"
+            elif (professor, course) not in self.X:
+                reason = "professor not eligible"
+            elif allocated.get(course, professor) != professor:
+                reason = (
+                    "manually allocated to another professor"
+                    if course in self.manual_allocation
+                    else "class already allocated"
+                )
+            else:
+                allocated[course] = professor
+                continue
+
+            unmapped.append(UnmappedRow(allocation, reason))
+
+        for course in self.courses:
+            professor = allocated.get(course, settings.DUMMY_PROFESSOR_NAME)
+            if (professor, course) in self.X:
+                start[professor, course] = 1
+
+        self.model.setAttr(
+            "Start", list(self.X.values()), [start[key] for key in self.X.keys()]
+        )
+
+        for slack_variables, min_credits in (
+            (self.PP_slack_variables, settings.MIN_CREDITS_PERMANENT),
+            (self.PS_slack_variables, settings.MIN_CREDITS_SUBSTITUTE),
+        ):
+            for professor, slack in slack_variables.items():
+                credits = sum(
+                    self.credit_coefficient[key] * start[key]
+                    for key in self.variable_keys.select(professor, "*")
+                )
+                slack.Start = max(min_credits - credits, 0)
+
+        return unmapped
+
+    def reoptimize(self):
+        """
+        Re-optimizes the model after delta operations, starting from the previous solution.
+
+        The X variables that still exist get their previous value as MIP start; the new
+        ones and the slacks are left undefined for Gurobi to complete.
+        """
+        self.model.update()
+
+        keys = [key for key in self.X.keys() if key in self.previous_solution]
+        if keys:
+            self.model.setAttr(
+                "Start",
+                [self.X[key] for key in keys],
+                [self.previous_solution[key] for key in keys],
+            )
+
+        self.optimize()
+
+    # Delta operations: change one input and update the live model accordingly (see
+    # check_incremental)
+
+    def check_incremental(self):
+        """
+        Makes sure the constraint maps of the delta operations are filled. They are filled
+        by add_constraints; a model built in matrix form or loaded from the model cache is
+        indexed from its rows on the first delta operation.
+        """
+        if not self.assignment_constraints and self.courses:
+            self.index_constraints()
+
+    def index_constraints(self):
+        """
+        Rebuilds the constraint maps (manual, credit, assignment, conflict and unqualified
+        constraints) from the rows of the model.
+
+        Both builders add the rows of a family in the order of its set (RNP1 in the order
+        of the manual allocations, RNG1 of the permanent professors, RNG2/RNP2/RNP3 of the
+        substitute professors, RNG3 of the courses, RNG5 of all professors), so they are
+        matched by position; an RNG4 row belongs to the professor of its variables.
+        """
         self.model.update()
-        self.model.optimize()
+        families = defaultdict(list)
+        for constraint in self.model.getConstrs():
+            families[get_constraint_family(constraint.ConstrName)].append(constraint)
+
+        expected = {
+            "RNP1": len(self.manual_allocation),
+            "RNG1": len(self.permanent_professors),
+            "RNG2": len(self.substitute_professors),
+            "RNG3": len(self.courses),
+        }
+        if any(len(families[family]) != n for family, n in expected.items()):
+            raise ValueError(
+                "Delta operations need a model whose constraints match its sets"
+            )
+
+        self.manual_constraints = dict(zip(self.manual_allocation, families["RNP1"]))
+        self.credit_constraints = {
+            professor: [constraint]
+            for professor, constraint in zip(
+                self.permanent_professors, families["RNG1"]
+            )
+        }
+        for professor, *constraints in zip(
+            self.substitute_professors,
+            families["RNG2"],
+            families["RNP2"],
+            families["RNP3"],
+        ):
+            self.credit_constraints[professor] = constraints
+        self.assignment_constraints = dict(zip(self.courses, families["RNG3"]))
+        self.unqualified_constraints = dict(zip(self.professors, families["RNG5"]))
+
+        professor_of = {
+            variable.index: professor for (professor, _), variable in self.X.items()
+        }
+        self.conflict_constraints = {
+            professor: []
+            for professor in self.professors
+            if professor != settings.DUMMY_PROFESSOR_NAME
+        }
+        for constraint in families["RNG4"]:
+            row = self.model.getRow(constraint)
+            if row.size():
+                professor = professor_of[row.getVar(0).index]
+                self.conflict_constraints[professor].append(constraint)
+
+    def is_qualified(self, professor, course) -> bool:
+        return bool(
+            utils.get_qualified_courses_for_professor(
+                {course: self.courses[course]}, self.professors, professor
+            )
+        )
+
+    def add_allocation_variable(self, professor, course, eligible_courses):
+        """
+        Adds the X variable of a professor and course with its column in the credit
+        (RNG1/RNG2/RNP2/RNP3), assignment (RNG3) and, in dense mode, RNG5 constraints.
+        """
+        credits = self.schedule_index[course].credits
+        constraints = list(self.credit_constraints.get(professor, []))
+        coefficients = [credits] * len(constraints)
+
+        if course in self.assignment_constraints:
+            constraints.append(self.assignment_constraints[course])
+            coefficients.append(1)
+
+        if professor in self.unqualified_constraints and self.is_unqualified(
+            professor, course
+        ):
+            constraints.append(self.unqualified_constraints[professor])
+            coefficients.append(1)
+
+        EAP = self.get_EAP_coefficient(professor, course, eligible_courses)
+        variable = self.model.addVar(
+            vtype=GRB.BINARY,
+            obj=EAP,
+            ub=0 if professor in self.inactive_professors else 1,
+            column=gp.Column(coefficients, constraints),
+            name=self.get_variable_name(professor, course),
+        )
+
+        self.X[professor, course] = variable
+        self.EAP[professor, course] = EAP
+        self.credit_coefficient[professor, course] = credits
+        self.variable_keys.append((professor, course))
+
+    def remove_allocation_variable(self, professor, course):
+        self.model.remove(self.X[professor, course])
+
+        del self.X[professor, course]
+        del self.EAP[professor, course]
+        del self.credit_coefficient[professor, course]
+        self.variable_keys.remove((professor, course))
+
+    def is_unqualified(self, professor, course) -> bool:
+        """
+        Whether RNG5 forbids the professor from teaching the course (dense mode).
+        """
+        return course not in self.manual_allocation and not self.is_qualified(
+            professor, course
+        )
+
+    def update_unqualified_coefficients(self, course):
+        """
+        Updates the RNG5 coefficient of every professor's variable of a course (dense mode).
+        """
+        for professor, constraint in self.unqualified_constraints.items():
+            if (professor, course) in self.X:
+                self.model.chgCoeff(
+                    constraint,
+                    self.X[professor, course],
+                    1 if self.is_unqualified(professor, course) else 0,
+                )
+
+    def refresh_professor(self, professor, courses=None):
+        """
+        Brings the variables of a professor in line with the current sets: adds or removes
+        X variables (sparse mode), updates their EAP coefficients and RNG5 coefficients
+        (dense mode), and rebuilds their RNG4 constraints if their courses changed.
+
+        Args:
+            professor (str): The professor name.
+            courses (list): The courses to check, every course by default.
+        """
+        eligible_courses = self.get_eligible_courses(professor)
+        changed = False
+
+        for course in self.courses if courses is None else courses:
+            exists = (professor, course) in self.X
+            wanted = not self.sparse or course in eligible_courses
+
+            if wanted and not exists:
+                self.add_allocation_variable(professor, course, eligible_courses)
+                changed = True
+            elif exists and not wanted:
+                self.remove_allocation_variable(professor, course)
+                changed = True
+            elif exists:
+                EAP = self.get_EAP_coefficient(professor, course, eligible_courses)
+                if EAP != self.EAP[professor, course]:
+                    self.update_objective_coefficients(EAP={(professor, course): EAP})
+                if professor in self.unqualified_constraints:
+                    self.model.chgCoeff(
+                        self.unqualified_constraints[professor],
+                        self.X[professor, course],
+                        1 if self.is_unqualified(professor, course) else 0,
+                    )
+
+        if changed and professor in self.conflict_constraints:
+            self.model.remove(self.conflict_constraints[professor])
+            self.model.update()
+            self.conflict_constraints[professor] = self.add_conflict_constraints(
+                professor
+            )
+
+    def fix_allocation(self, professor, course):
+        """
+        Manually allocates a professor to a course, adding its RNP1 constraint. A previous
+        manual allocation of the course is undone.
+        """
+        self.check_incremental()
+
+        if professor in self.inactive_professors:
+            raise ValueError(f"Professor {professor} is inactive")
+
+        if course in self.manual_allocation:
+            self.unfix_allocation(course)
+
+        self.manual_allocation = {
+            **self.manual_allocation,
+            course: {**self.courses[course], "professor": professor},
+        }
+
+        self.refresh_professor(professor, [course])
+        self.manual_constraints[course] = self.model.addConstr(
+            self.get_variable(professor, course) == 1, name=f"RNP1_{course}"
+        )
+        self.update_unqualified_coefficients(course)
+
+    def unfix_allocation(self, course):
+        """
+        Undoes the manual allocation of a course.
+        """
+        self.check_incremental()
+
+        professor = self.manual_allocation[course]["professor"]
+        self.manual_allocation = {
+            c: allocation
+            for c, allocation in self.manual_allocation.items()
+            if c != course
+        }
+
+        if course in self.manual_constraints:
+            self.model.remove(self.manual_constraints.pop(course))
+
+        self.refresh_professor(professor, [course])
+        self.update_unqualified_coefficients(course)
+
+    def set_qualified_courses(self, professor, qualified_courses):
+        self.check_incremental()
+
+        previous = set(self.professors[professor]["qualified_courses"])
+        self.professors = {
+            **self.professors,
+            professor: {
+                **self.professors[professor],
+                "qualified_courses": list(qualified_courses),
+            },
+        }
+
+        course_ids = previous.symmetric_difference(qualified_courses)
+        courses = [
+            course
+            for course, details in self.courses.items()
+            if course_ids.intersection(details["course_id"].split(","))
+        ]
+        self.refresh_professor(professor, courses)
+
+    def add_qualification(self, professor, course_id):
+        """
+        Qualifies a professor for a course id (all of its classes).
+        """
+        qualified_courses = self.professors[professor]["qualified_courses"]
+        if course_id not in qualified_courses:
+            self.set_qualified_courses(professor, qualified_courses + [course_id])
+
+    def remove_qualification(self, professor, course_id):
+        """
+        Removes a course id from the qualified courses of a professor.
+        """
+        self.set_qualified_courses(
+            professor,
+            [
+                cid
+                for cid in self.professors[professor]["qualified_courses"]
+                if cid != course_id
+            ],
+        )
+
+    def add_class(self, course, details):
+        """
+        Adds a course class, with its RNG3 constraint and the variables of the professors
+        who may teach it.
+        """
+        self.check_incremental()
+
+        self.set_courses({**self.courses, course: details})
+        self.assignment_constraints[course] = self.model.addConstr(
+            gp.LinExpr() == 1, name=f"RNG3_{course}"
+        )
+
+        for professor in self.professors:
+            self.refresh_professor(professor, [course])
+
+    def remove_class(self, course):
+        """
+        Removes a course class, its variables and its RNG3 (and RNP1) constraints.
+        """
+        self.check_incremental()
+
+        if course in self.manual_allocation:
+            self.unfix_allocation(course)
+
+        for professor, _ in self.variable_keys.select("*", course):
+            self.remove_allocation_variable(professor, course)
+
+        self.model.remove(self.assignment_constraints.pop(course))
+        self.set_courses(
+            {c: details for c, details in self.courses.items() if c != course}
+        )
+
+    def set_professor_active(self, professor, active=True):
+        """
+        Toggles a professor: an inactive professor keeps their variables, with upper bound
+        zero, and is not penalized for the credits below the minimum.
+        """
+        self.check_incremental()
+
+        if not active and any(
+            allocation["professor"] == professor
+            for allocation in self.manual_allocation.values()
+        ):
+            raise ValueError(f"Professor {professor} has manual allocations")
+
+        if active:
+            self.inactive_professors.discard(professor)
+        else:
+            self.inactive_professors.add(professor)
+
+        variables = [self.X[key] for key in self.variable_keys.select(professor, "*")]
+        if variables:
+            self.model.setAttr("UB", variables, [1 if active else 0] * len(variables))
+
+        for slack_variables, weight in (
+            (self.PP_slack_variables, settings.WEIGHT_FACTOR_PP),
+            (self.PS_slack_variables, settings.WEIGHT_FACTOR_PS),
+        ):
+            if professor in slack_variables:
+                slack_variables[professor].Obj = -weight if active else 0
 
     def clean_model(self):
         self.model.dispose()
-        self.env.dispose()
+
+        if settings.ENV_POOL:
+            get_env_pool().release(self.env)
+        else:
+            self.env.dispose()
+
+    def extract_solution(self, get_values=None) -> Solution:
+        """
+        Reads the backend's solution values of each variable map and turns them into
+        structured records, without going through the variable names.
+
+        Args:
+            get_values: Function returning the values of a list of variables, get_values
+                by default (e.g. cbGetSolution in a callback).
+
+        Returns:
+            Solution: The allocations and the nonzero PCB/PSB slack values.
+        """
+        get_values = get_values or self.get_values
+
+        allocations = []
+        values = get_values(self.X.values())
+        for (professor, course), value in zip(self.X.keys(), values):
+            if value > 0.5:
+                schedule = self.schedule_index[course]
+                allocations.append(
+                    Allocation(professor, course, schedule.day, schedule.time)
+                )
+
+        shortfalls = []
+        for slack_variables in (self.PP_slack_variables, self.PS_slack_variables):
+            values = get_values(slack_variables.values()) if slack_variables else []
+            shortfalls.append(
+                tuple(
+                    CreditShortfall(professor, value)
+                    for professor, value in zip(slack_variables.keys(), values)
+                    if value > 0.5
+                )
+            )
+
+        return Solution(tuple(allocations), *shortfalls)
+
+    def diagnose(self, iis: bool = None) -> DiagnosisReport:
+        """
+        Looks for the cause of an infeasible model (see utils.diagnosis.diagnose). The
+        feasibility relaxation and the IIS need the Gurobi backend.
+
+        Args:
+            iis (bool): Whether to compute an IIS, settings.DIAGNOSE_IIS by default.
+        """
+        model = None
+        if self.backend.name == settings.SolverBackend.GUROBI.value:
+            model = self.model
+
+        return diagnose(
+            {
+                "professors": self.professors,
+                "permanent_professors": self.permanent_professors,
+                "substitute_professors": self.substitute_professors,
+                "courses": self.courses,
+                "manual_allocation": self.manual_allocation,
+            },
+            model,
+            self.result.status if self.result else GRB.INFEASIBLE,
+            settings.DIAGNOSE_IIS if iis is None else iis,
+        )
 
     def generate_results(self):
 
-        if self.model.Status == 2:
-            print(f"Optimal solution found. Model return status={self.model.Status}")
+        if self.result.status == GRB.OPTIMAL:
+            print(f"Optimal solution found. Model return status={self.result.status}")
+        elif self.result.values and self.result.status != GRB.INFEASIBLE:
+            # Parada por TimeLimit/MIPGap etc.: a melhor solução encontrada é usada
+            print(f"Best solution found. Model return status={self.result.status}")
+        elif self.result.status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
+            diagnosis = self.diagnose()
+            print(diagnosis.report())
+            diagnosis.save(settings.DIAGNOSIS_REPORT)
+            raise Exception(f"Model return status={self.result.status}")
         else:
-            self.model.computeIIS()
-            self.model.write("model.ilp")
-            raise Exception(f"Model return status={self.model.Status}")
+            # Parada por TimeLimit etc. antes da primeira solução: não é inviabilidade
+            raise Exception(
+                f"No solution found. Model return status={self.result.status}"
+            )
 
-        timeschedule = []
-        for var in self.model.getVars():
-            if var.X > 0:
-                allocation = f"{var.VarName}/{var.X}"
-                timeschedule.append(allocation)
+        timeschedule = self.extract_solution()
 
-        model_value = self.model.ObjVal
+        model_value = self.get_objective_value()
 
         utils.treat_and_save_results(timeschedule, self.courses)
 
@@ -337,12 +1276,26 @@ class CourseTimetabling:
         print("========= RESULT ==========")
         print("Result was saved in results/*")
         print("=============================")
-        print(f"Obj: {model_value}")
+        print_objective(model_value)
 
         return timeschedule, model_value
 
 
-def main():
+def print_objective(model_value):
+    if isinstance(model_value, dict):
+        for level, value in model_value.items():
+            print(f"Obj ({level}): {value}")
+    else:
+        print(f"Obj: {model_value}")
+
+
+def get_sets() -> dict:
+    """
+    Reads the model sets from the spreadsheet (see database.construct_sets).
+
+    Returns:
+        dict: The sets keyed by the CourseTimetabling argument names.
+    """
     MANUAL_ALLOCATION = get_manual_allocation_set()
 
     professors_permanent_set, professors_substitute_set, professor_dummy = (
@@ -357,21 +1310,194 @@ def main():
 
     COURSES = get_courses_set(MANUAL_ALLOCATION)
 
-    timetabling = CourseTimetabling(
-        PROFESSORS,
-        PERMANENT_PROFESSORS,
-        SUBSTITUTE_PROFESSORS,
-        COURSES,
-        MANUAL_ALLOCATION,
+    return {
+        "professors": PROFESSORS,
+        "permanent_professors": PERMANENT_PROFESSORS,
+        "substitute_professors": SUBSTITUTE_PROFESSORS,
+        "courses": COURSES,
+        "manual_allocation": MANUAL_ALLOCATION,
+    }
+
+
+def get_telemetry_path() -> str:
+    """
+    Returns a new timeline file in settings.TELEMETRY_DIR, named after the run time (in
+    milliseconds) and process, so parallel sweep workers write their own files.
+    """
+    now = time.time()
+    return os.path.join(
+        settings.TELEMETRY_DIR,
+        f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+        f"-{int(now * 1000) % 1000:03d}-{os.getpid()}.{settings.TELEMETRY_FORMAT}",
     )
-    timetabling.initialize_variables_and_coefficients()
-    timetabling.add_credit_slack_variables()
-    timetabling.add_constraints()
-    timetabling.set_objective()
-    timetabling.optimize()
-    timetabling.generate_results()
-    timetabling.clean_model()
+
+
+def get_timetabling_class():
+    """
+    Returns the model builder class chosen in settings.MODEL_BUILDER.
+    """
+    if settings.MODEL_BUILDER == settings.ModelBuilder.MATRIX.value:
+        from matrix_model import MatrixCourseTimetabling
+
+        return MatrixCourseTimetabling
+
+    return CourseTimetabling
+
+
+def main(force=False, warm_start=None):
+    """
+    Runs the whole pipeline: reads the sets, builds (or loads) the model, solves it and
+    saves the results.
+
+    Args:
+        force (bool): Solve again even if the result cache has a result for these inputs.
+        warm_start (str): Previous solution to start from, settings.WARM_START by default.
+
+    Returns:
+        tuple: The solution and the objective value.
+    """
+    profiler = Profiler(enabled=settings.PROFILE)
+
+    with profiler.phase("get_sets"):
+        sets = get_sets()
+
+    Timetabling = get_timetabling_class()
+    warm_start = settings.WARM_START if warm_start is None else warm_start
+
+    result_cache = ResultCache() if settings.RESULT_CACHE else None
+    if result_cache:
+        result_key = result_cache.get_key(
+            sets, Timetabling, settings.SPARSE_MODEL, settings.CONFLICT_MODE, warm_start
+        )
+        cached_result = None if force else result_cache.get(result_key)
+
+        if cached_result:
+            with profiler.phase("load_cached_result"):
+                timeschedule, model_value = cached_result
+                utils.treat_and_save_results(timeschedule, sets["courses"])
+
+            print("========= RESULT ==========")
+            print("Same inputs as a previous run, result loaded from the cache")
+            print("Result was saved in results/*")
+            print("=============================")
+            print_objective(model_value)
+
+            profiler.save(settings.PROFILE_REPORT)
+
+            return timeschedule, model_value
+
+    with profiler.phase("check_sets"):
+        diagnosis = check_sets(sets)
+
+    if diagnosis.issues:
+        print(diagnosis.report())
+        diagnosis.save(settings.DIAGNOSIS_REPORT)
+        raise Exception("Invalid sets, see the diagnosis report")
+
+    presolved = None
+    if settings.PRESOLVE:
+        with profiler.phase("presolve"):
+            presolved = presolve(sets)
+
+        print("========= PRESOLVE ==========")
+        print(presolved.report())
+        print("=============================")
+
+    with profiler.phase("init_model"):
+        timetabling = Timetabling(
+            **(presolved.sets if presolved else sets),
+            sparse=settings.SPARSE_MODEL,
+            conflict_mode=settings.CONFLICT_MODE,
+        )
+        timetabling.presolved = presolved
+
+    build_phases = [
+        timetabling.initialize_variables_and_coefficients,
+        timetabling.add_credit_slack_variables,
+        timetabling.add_constraints,
+        timetabling.set_objective,
+    ]
+
+    model_cache = ModelCache() if settings.MODEL_CACHE else None
+    cache_hit = False
+    if model_cache:
+        with profiler.phase("load_cached_model"):
+            cache_key = model_cache.get_key(timetabling)
+            cache_hit = model_cache.load(timetabling, cache_key)
+
+    if not cache_hit:
+        for phase in build_phases:
+            with profiler.phase(phase.__name__):
+                phase()
+
+        if model_cache:
+            with profiler.phase("save_cached_model"):
+                model_cache.save(timetabling, cache_key)
+
+    if settings.CONDITIONING_REPORT:
+        with profiler.phase("conditioning"):
+            conditioning = timetabling.analyze_conditioning()
+
+        print("========= CONDITIONING ==========")
+        print(conditioning.report())
+        print("=============================")
+
+    if warm_start:
+        with profiler.phase("warm_start"):
+            previous_solution, unmapped = load_previous_solution(
+                warm_start, sets["courses"]
+            )
+            start = previous_solution
+            if presolved:
+                start, removed = presolved.map_start(previous_solution)
+                unmapped += removed
+            timetabling.model.update()
+            unmapped += timetabling.set_start(start)
+
+        print("========= WARM START ==========")
+        print(
+            f"{len(previous_solution.allocations)} allocations read from {warm_start}, "
+            f"{len(unmapped)} rows not mapped"
+        )
+        for row, reason in unmapped:
+            print(f"{reason}: {';'.join(map(str, row))}")
+        print("=============================")
+
+    with profiler.phase("optimize"):
+        timetabling.optimize()
+
+    with profiler.phase("generate_results"):
+        timeschedule, model_value = timetabling.generate_results()
+
+        if presolved:
+            timeschedule, model_value = presolved.postsolve(timeschedule, model_value)
+            utils.treat_and_save_results(timeschedule, sets["courses"])
+
+    # Uma solução interrompida (ex.: TIME_LIMIT) não é o resultado dessas entradas
+    if result_cache and timetabling.result.status == GRB.OPTIMAL:
+        result_cache.put(result_key, timeschedule, model_value)
+
+    profiler.record_model_statistics(timetabling)
+
+    with profiler.phase("clean_model"):
+        timetabling.clean_model()
+
+    profiler.save(settings.PROFILE_REPORT)
+
+    return timeschedule, model_value
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Course timetabling")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Solve again even if a result for the same inputs is cached",
+    )
+    parser.add_argument(
+        "--warm-start",
+        help="Previous timeschedule.csv (or JSON solution) used as MIP start",
+    )
+    args = parser.parse_args()
+
+    main(force=args.force, warm_start=args.warm_start)
@@ -0,0 +1,466 @@
+import numpy as np
+import scipy.sparse as sp
+import gurobipy as gp
+from gurobipy import GRB
+
+import settings
+
+from main import CourseTimetabling
+
+
+class MatrixCourseTimetabling(CourseTimetabling):
+    """
+    Builds the same model as CourseTimetabling, but in matrix form.
+
+    The course and professor sets are turned into NumPy/SciPy arrays once (credits vector,
+    qualification mask, EAP coefficient matrix and timeslot-conflict incidence) and the
+    variables and constraints are then added in bulk with addMVar/addMConstr, instead of
+    one quicksum per constraint.
+    """
+
+    def initialize_variables_and_coefficients(self):
+        """
+        Builds the index sets and the sparse matrices of the instance and adds the binary
+        variables of every (professor, course) pair in a single addMVar call.
+
+        Attributes:
+            professor_index (list): Professors in row order of the professor matrices.
+            course_index (list): Courses in column order of the course matrices.
+            credits (np.ndarray): Credits of each course.
+            qualification (sp.csr_matrix): Professor x course mask of eligible pairs.
+            EAP_matrix (sp.csr_matrix): Professor x course EAP coefficients.
+            variable_professor (np.ndarray): Professor position of each X variable.
+            variable_course (np.ndarray): Course position of each X variable.
+            variable_column (np.ndarray): Professor x course map to the X variable position (-1 if missing).
+            X_matrix (gp.MVar): The X variables, also exposed as the X tupledict.
+        """
+        self.professor_index = list(self.professors)
+        self.course_index = list(self.courses)
+        self.professor_position = {p: i for i, p in enumerate(self.professor_index)}
+        self.course_position = {c: j for j, c in enumerate(self.course_index)}
+        n_professors = len(self.professor_index)
+        n_courses = len(self.course_index)
+        shape = (n_professors, n_courses)
+
+        self.credits = np.array(
+            [self.schedule_index[course].credits for course in self.course_index],
+            dtype=float,
+        )
+
+        self.qualification = self.get_qualification_mask()
+        eligible = self.qualification.toarray()
+
+        service_basic_courses = np.array(
+            [
+                self.courses[course]["course_type"] == "SVC"
+                and any(
+                    cid in settings.SVC_BASIC_COURSES
+                    for cid in self.courses[course]["course_id"].split(",")
+                )
+                for course in self.course_index
+            ],
+            dtype=bool,
+        )
+        service_coefficients = np.array(
+            [
+                (
+                    settings.SERVICE_COURSE_COEFFICIENT_SP
+                    if self.professors[professor]["category"] == "PS"
+                    else settings.SERVICE_COURSE_COEFFICIENT_PP
+                )
+                for professor in self.professor_index
+            ],
+            dtype=float,
+        )
+
+        # Mesma regra de CourseTimetabling.get_EAP_coefficient, vetorizada
+        EAP = np.where(
+            eligible, settings.DEFAULT_COEFFICIENT, settings.ZERO_COEFFICIENT
+        ).astype(float)
+        EAP[:, service_basic_courses] = service_coefficients[:, None]
+        if settings.DUMMY_PROFESSOR_NAME in self.professor_position:
+            EAP[self.professor_position[settings.DUMMY_PROFESSOR_NAME], :] = (
+                settings.DUMMY_COEFFICIENT
+            )
+        self.EAP_matrix = sp.csr_matrix(EAP)
+
+        if self.sparse:
+            pairs = self.qualification.tocoo()
+            order = np.lexsort((pairs.col, pairs.row))
+            self.variable_professor = pairs.row[order].astype(np.int64)
+            self.variable_course = pairs.col[order].astype(np.int64)
+        else:
+            self.variable_professor = np.repeat(np.arange(n_professors), n_courses)
+            self.variable_course = np.tile(np.arange(n_courses), n_professors)
+
+        n_variables = len(self.variable_professor)
+        self.variable_column = np.full(shape, -1, dtype=np.int64)
+        self.variable_column[self.variable_professor, self.variable_course] = np.arange(
+            n_variables
+        )
+
+        keys = [
+            (self.professor_index[i], self.course_index[j])
+            for i, j in zip(self.variable_professor, self.variable_course)
+        ]
+        names = [
+            self.get_variable_name(professor, course) for professor, course in keys
+        ]
+
+        coefficients = np.asarray(
+            self.EAP_matrix[self.variable_professor, self.variable_course]
+        ).ravel()
+
+        self.X_matrix = self.model.addMVar(
+            n_variables, vtype=GRB.BINARY, obj=coefficients, name=names
+        )
+
+        self.variable_keys = gp.tuplelist(keys)
+        self.X = gp.tupledict(zip(keys, self.X_matrix.tolist()))
+        self.EAP = gp.tupledict(zip(keys, coefficients.tolist()))
+        self.credit_coefficient = gp.tupledict(
+            zip(keys, self.credits[self.variable_course].tolist())
+        )
+
+    def get_qualification_mask(self) -> sp.csr_matrix:
+        """
+        Builds the professor x course mask of eligible pairs (see get_eligible_courses)
+        from a course_id -> courses map, without scanning every course for every professor.
+        """
+        courses_by_course_id = {}
+        for course, details in self.courses.items():
+            for cid in details["course_id"].split(","):
+                courses_by_course_id.setdefault(cid, set()).add(
+                    self.course_position[course]
+                )
+
+        manual_courses = {}
+        for course_class_id, allocation in self.manual_allocation.items():
+            if course_class_id in self.course_position:
+                manual_courses.setdefault(allocation["professor"], set()).add(
+                    self.course_position[course_class_id]
+                )
+
+        rows, cols = [], []
+        for professor in self.professor_index:
+            i = self.professor_position[professor]
+
+            if professor == settings.DUMMY_PROFESSOR_NAME:
+                columns = set(range(len(self.course_index))).difference(
+                    self.course_position[course]
+                    for course in self.professors[professor].get("excluded_classes", [])
+                    if course in self.course_position
+                )
+            else:
+                columns = set()
+                qualified_courses = (
+                    self.professors[professor]["qualified_courses"]
+                    + settings.SVC_BASIC_COURSES
+                )
+                for cid in qualified_courses:
+                    columns.update(courses_by_course_id.get(cid, ()))
+
+            columns.update(manual_courses.get(professor, ()))
+
+            rows.extend([i] * len(columns))
+            cols.extend(columns)
+
+        return sp.csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)),
+            shape=(len(self.professor_index), len(self.course_index)),
+        )
+
+    def add_credit_slack_variables(self):
+        """
+        Adds the PCB/PSB slack variables as two MVars, keeping the per professor tupledicts.
+        """
+        permanent = list(self.permanent_professors)
+        substitute = list(self.substitute_professors)
+
+        self.PP_slack = self.model.addMVar(
+            len(permanent),
+            vtype=GRB.INTEGER,
+            obj=-settings.WEIGHT_FACTOR_PP,
+            name=[f"PCB_{p}" for p in permanent],
+        )
+        self.PS_slack = self.model.addMVar(
+            len(substitute),
+            vtype=GRB.INTEGER,
+            obj=-settings.WEIGHT_FACTOR_PS,
+            name=[f"PSB_{p}" for p in substitute],
+        )
+
+        self.PP_slack_variables = gp.tupledict(zip(permanent, self.PP_slack.tolist()))
+        self.PS_slack_variables = gp.tupledict(zip(substitute, self.PS_slack.tolist()))
+
+    def get_credit_matrix(self, professors) -> sp.csr_matrix:
+        """
+        Returns the matrix whose rows hold the credits of each X variable of the given professors.
+        """
+        row_of = np.full(len(self.professor_index), -1, dtype=np.int64)
+        for r, professor in enumerate(professors):
+            row_of[self.professor_position[professor]] = r
+
+        rows = row_of[self.variable_professor]
+        cols = np.flatnonzero(rows >= 0)
+
+        return sp.csr_matrix(
+            (self.credits[self.variable_course[cols]], (rows[cols], cols)),
+            shape=(len(professors), len(self.variable_professor)),
+        )
+
+    def get_conflict_incidence(self) -> tuple[sp.csr_matrix, sp.csr_matrix]:
+        """
+        Builds the timeslot incidence of the courses from the shared conflict graph.
+
+        Returns:
+            tuple: Two sparse matrices over the courses:
+                - slot incidence: one row per schedule mask with the courses with exactly that mask;
+                - conflict incidence: one row per pair of courses whose different masks overlap.
+        """
+        course_position = self.course_position
+        graph = self.conflict_graph
+
+        slot_rows, slot_cols = [], []
+        for g, group in enumerate(graph.groups):
+            for course in group:
+                slot_rows.append(g)
+                slot_cols.append(course_position[course])
+
+        conflict_pairs = [
+            (course_position[course], course_position[cc])
+            for course, cc in graph.cross_group_edges
+        ]
+
+        n_courses = len(self.course_index)
+        slot_incidence = sp.csr_matrix(
+            (np.ones(len(slot_rows)), (slot_rows, slot_cols)),
+            shape=(len(graph.groups), n_courses),
+        )
+
+        conflict_pairs = np.array(conflict_pairs, dtype=np.int64).reshape(-1, 2)
+        n_pairs = len(conflict_pairs)
+        conflict_incidence = sp.csr_matrix(
+            (
+                np.ones(2 * n_pairs),
+                (np.repeat(np.arange(n_pairs), 2), conflict_pairs.ravel()),
+            ),
+            shape=(n_pairs, n_courses),
+        )
+
+        return slot_incidence, conflict_incidence
+
+    def get_professor_clique_matrix(self, professors) -> sp.csr_matrix:
+        """
+        Builds the clique-mode RNG4 rows: the conflict graph's clique cover restricted to the
+        X variables of each professor, without rows of a single course or repeated rows.
+        """
+        cliques = self.conflict_graph.cliques()
+        rows = np.repeat(np.arange(len(cliques)), [len(c) for c in cliques])
+        cols = [self.course_position[course] for clique in cliques for course in clique]
+        clique_incidence = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(cliques), len(self.course_index)),
+        )
+
+        matrix = self.restrict_to_professor_variables(clique_incidence, professors)
+        matrix = matrix[matrix.getnnz(axis=1) > 1]
+        matrix.sort_indices()
+
+        unique_rows = dict.fromkeys(
+            tuple(matrix.indices[matrix.indptr[r] : matrix.indptr[r + 1]])
+            for r in range(matrix.shape[0])
+        )
+        rows = np.repeat(np.arange(len(unique_rows)), [len(r) for r in unique_rows])
+        cols = [column for row in unique_rows for column in row]
+
+        return sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(unique_rows), matrix.shape[1]),
+        )
+
+    def restrict_to_professor_variables(
+        self, incidence: sp.csr_matrix, professors, full_rows=False
+    ) -> sp.csr_matrix:
+        """
+        Maps a course incidence matrix to the X variables of each professor, stacking one
+        block of rows per professor. Rows that would reference a missing variable are
+        dropped (full_rows=True) or shrunk to the existing variables (full_rows=False).
+        """
+        incidence = incidence.tocoo()
+        n_variables = len(self.variable_professor)
+        rows, cols = [], []
+        offset = 0
+
+        for professor in professors:
+            columns = self.variable_column[self.professor_position[professor]]
+            variables = columns[incidence.col]
+            keep = variables >= 0
+
+            if full_rows:
+                missing = np.unique(incidence.row[~keep])
+                keep &= ~np.isin(incidence.row, missing)
+
+            rows.append(incidence.row[keep] + offset)
+            cols.append(variables[keep])
+            offset += incidence.shape[0]
+
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.array([], dtype=np.int64)
+        matrix = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(offset, n_variables)
+        )
+
+        return matrix[matrix.getnnz(axis=1) > 0]
+
+    def add_matrix_constraints(self, x_matrix, slack_matrices, sense, rhs, name):
+        """
+        Adds a block of constraints over [X, PCB, PSB] with a single addMConstr call,
+        named after their family (e.g. "RNG3[0]", "RNG3[1]", ...).
+        """
+        n_rows = x_matrix.shape[0]
+        if n_rows == 0:
+            return None
+
+        blocks = [x_matrix]
+        for slack, matrix in zip((self.PP_slack, self.PS_slack), slack_matrices):
+            if matrix is None:
+                matrix = sp.csr_matrix((n_rows, slack.shape[0]))
+            blocks.append(matrix)
+
+        return self.model.addMConstr(
+            sp.hstack(blocks, format="csr"),
+            self.all_variables,
+            sense,
+            np.full(n_rows, rhs),
+            name=name,
+        )
+
+    def add_constraints(self):
+        permanent = list(self.permanent_professors)
+        substitute = list(self.substitute_professors)
+        n_variables = len(self.variable_professor)
+        self.all_variables = gp.MVar.fromlist(
+            self.X_matrix.tolist() + self.PP_slack.tolist() + self.PS_slack.tolist()
+        )
+
+        # RNP1: Alocar manualmente os professores
+        manual_columns = []
+        for course_class_id in self.manual_allocation.keys():
+            professor = self.manual_allocation[course_class_id]["professor"]
+            column = self.variable_column[
+                self.professor_position[professor],
+                self.course_position[course_class_id],
+            ]
+            if column < 0:
+                raise KeyError(course_class_id)
+            manual_columns.append(column)
+
+        manual_matrix = sp.csr_matrix(
+            (
+                np.ones(len(manual_columns)),
+                (np.arange(len(manual_columns)), manual_columns),
+            ),
+            shape=(len(manual_columns), n_variables),
+        )
+        self.add_matrix_constraints(manual_matrix, (None, None), "=", 1, "RNP1")
+
+        # RNG1: Créditos mínimos do professor permanente (com folga PCB)
+        self.add_matrix_constraints(
+            self.get_credit_matrix(permanent),
+            (sp.identity(len(permanent), format="csr"), None),
+            "=",
+            settings.MIN_CREDITS_PERMANENT,
+            "RNG1",
+        )
+
+        # RNG2: Créditos mínimos do professor substituto (com folga PSB)
+        substitute_credits = self.get_credit_matrix(substitute)
+        self.add_matrix_constraints(
+            substitute_credits,
+            (None, sp.identity(len(substitute), format="csr")),
+            "=",
+            settings.MIN_CREDITS_SUBSTITUTE,
+            "RNG2",
+        )
+
+        # RNP2 e RNP3: Regime de trabalho - quantidade de créditos máximo
+        self.add_matrix_constraints(
+            substitute_credits,
+            (None, None),
+            "<",
+            settings.MAX_CREDITS_PERMANENT,
+            "RNP2",
+        )
+        self.add_matrix_constraints(
+            substitute_credits,
+            (None, None),
+            "<",
+            settings.MAX_CREDITS_SUBSTITUTE,
+            "RNP3",
+        )
+
+        # RNG3: Uma disciplina de uma turma, deverá ser ministrada por um único professor
+        course_matrix = sp.csr_matrix(
+            (np.ones(n_variables), (self.variable_course, np.arange(n_variables))),
+            shape=(len(self.course_index), n_variables),
+        )
+        self.add_matrix_constraints(course_matrix, (None, None), "=", 1, "RNG3")
+
+        # RNG4: Um professor poderá dar no máximo 1 disciplina de uma turma em um mesmo dia e horário
+        teaching_professors = [
+            p for p in self.professor_index if p != settings.DUMMY_PROFESSOR_NAME
+        ]
+        if self.conflict_mode == settings.ConflictMode.LAZY.value:
+            # Adicionadas pelo callback separate_conflicts
+            pass
+        elif self.conflict_mode == settings.ConflictMode.CLIQUE.value:
+            self.add_matrix_constraints(
+                self.get_professor_clique_matrix(teaching_professors),
+                (None, None),
+                "<",
+                1,
+                "RNG4",
+            )
+        else:
+            slot_incidence, conflict_incidence = self.get_conflict_incidence()
+            self.add_matrix_constraints(
+                self.restrict_to_professor_variables(
+                    slot_incidence, teaching_professors
+                ),
+                (None, None),
+                "<",
+                1,
+                "RNG4",
+            )
+            self.add_matrix_constraints(
+                self.restrict_to_professor_variables(
+                    conflict_incidence, teaching_professors, full_rows=True
+                ),
+                (None, None),
+                "<",
+                1,
+                "RNG4",
+            )
+
+        # RNG5: Um professor não pode lecionar uma disciplina em que ele não esteja apto
+        if self.sparse:
+            return
+
+        manual_courses = [
+            self.course_position[c]
+            for c in self.manual_allocation.keys()
+            if c in self.course_position
+        ]
+        unqualified = ~self.qualification.toarray()
+        unqualified[:, manual_courses] = False
+
+        professor_rows, course_cols = unqualified.nonzero()
+        unqualified_matrix = sp.csr_matrix(
+            (
+                np.ones(len(professor_rows)),
+                (professor_rows, self.variable_column[professor_rows, course_cols]),
+            ),
+            shape=(len(self.professor_index), n_variables),
+        )
+        self.add_matrix_constraints(unqualified_matrix, (None, None), "=", 0, "RNG5")
@@ -0,0 +1,55 @@
+import glob
+import os
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import settings
+from utils.telemetry import load_timeline, overlay_timelines
+
+st.set_page_config(
+    layout="wide",
+)
+
+st.title("Course Timetabling - Convergência")
+
+paths = sorted(
+    glob.glob(os.path.join(settings.TELEMETRY_DIR, "*.csv"))
+    + glob.glob(os.path.join(settings.TELEMETRY_DIR, "*.json")),
+    reverse=True,
+)
+
+if not paths:
+    st.info(
+        f"Nenhuma execução em {settings.TELEMETRY_DIR}, rode o modelo com TELEMETRY=True"
+    )
+    st.stop()
+
+selected = st.multiselect(
+    "Execuções",
+    paths,
+    default=paths[:2],
+    format_func=lambda path: os.path.splitext(os.path.basename(path))[0],
+)
+metric = st.selectbox("Métrica", ["gap", "incumbent", "bound", "nodes"])
+axis = st.radio("Eixo", ["time", "work"], horizontal=True)
+
+if selected:
+    overlay = overlay_timelines(selected, metric, axis)
+    if metric == "gap":
+        # O gap é infinito até a primeira solução
+        overlay = overlay.where(overlay != float("inf"))
+
+    st.line_chart(overlay)
+
+    st.header("Final", divider="rainbow")
+    st.dataframe(
+        {
+            os.path.splitext(os.path.basename(path))[0]: load_timeline(path)
+            .iloc[-1]
+            .to_dict()
+            for path in selected
+        }
+    )
@@ -6,16 +6,110 @@ SAMPLE_SPREADSHEET_ID = config("SAMPLE_SPREADSHEET_ID", default="1MZ_LFco9SZ5FrZ
 class LicenseType(Enum):
     NAMED_USER_ACADEMIC = "Named-User Academic"
     WSL_ACADEMIC = "WSL Academic"
+    # License found on the machine, without parameters (e.g. the size-limited one of the pip package), for offline tests
+    LOCAL = "Local"
 
 APP_LICENSE_TYPE = config("LICENSE_TYPE", default=LicenseType.NAMED_USER_ACADEMIC.value, cast=lambda v: v if v in LicenseType._value2member_map_ else LicenseType.NAMED_USER_ACADEMIC.value)
 APP_LICENSE_ID = config("LICENSE_ID", default=123, cast=int)
 APP_WLS_ACCESS_ID = config("WLS_ACCESS_ID", default="access_id")
 APP_WS_SECRET = config("WS_SECRET", default="secret")
 
+# Reuse started Gurobi environments across models (see utils.env_pool)
+ENV_POOL = config("ENV_POOL", default=False, cast=bool)
+ENV_POOL_MAX_IDLE = config("ENV_POOL_MAX_IDLE", default=4, cast=int)
+
 APP_CACHE_TTL = config("CACHE_TTL", default=0, cast=int)
 
 APP_SHEETS_SCOPES = config("SHEETS_SCOPES", default=["https://www.googleapis.com/auth/spreadsheets.readonly"], cast=list)
 
+# Model building
+
+class ModelBuilder(Enum):
+    TERM = "term"
+    MATRIX = "matrix"
+
+MODEL_BUILDER = config("MODEL_BUILDER", default=ModelBuilder.TERM.value, cast=lambda v: v if v in ModelBuilder._value2member_map_ else ModelBuilder.TERM.value)
+SPARSE_MODEL = config("SPARSE_MODEL", default=False, cast=bool)
+# Reduce the sets before building the model (see utils.presolve)
+PRESOLVE = config("PRESOLVE", default=False, cast=bool)
+
+# RNG4 formulation; lazy leaves it out of the model and adds the violated pairs from a callback (Gurobi only)
+class ConflictMode(Enum):
+    PAIRWISE = "pairwise"
+    CLIQUE = "clique"
+    LAZY = "lazy"
+
+CONFLICT_MODE = config("CONFLICT_MODE", default=ConflictMode.PAIRWISE.value, cast=lambda v: v if v in ConflictMode._value2member_map_ else ConflictMode.PAIRWISE.value)
+
+MODEL_CACHE = config("MODEL_CACHE", default=False, cast=bool)
+MODEL_CACHE_DIR = config("MODEL_CACHE_DIR", default="cache/models")
+MODEL_CACHE_MAX_MB = config("MODEL_CACHE_MAX_MB", default=512, cast=int)
+MODEL_CACHE_MAX_AGE = config("MODEL_CACHE_MAX_AGE", default=7 * 24 * 60 * 60, cast=int)
+
+RESULT_CACHE = config("RESULT_CACHE", default=False, cast=bool)
+RESULT_CACHE_DIR = config("RESULT_CACHE_DIR", default="cache/results")
+RESULT_CACHE_MAX_ENTRIES = config("RESULT_CACHE_MAX_ENTRIES", default=32, cast=int)
+
+# Solver
+
+def parse_solver_parameters(value: str) -> dict:
+    """
+    Parses Gurobi parameters given as "Name=value,Name=value", e.g. "TimeLimit=60,MIPGap=0.01".
+    """
+    parameters = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, parameter = (part.strip() for part in item.split("=", 1))
+        for cast in (int, float):
+            try:
+                parameter = cast(parameter)
+                break
+            except ValueError:
+                continue
+        parameters[name] = parameter
+
+    return parameters
+
+SOLVER_PARAMETERS = config("SOLVER_PARAMETERS", default="", cast=parse_solver_parameters)
+
+class SolverBackend(Enum):
+    GUROBI = "gurobi"
+    HIGHS = "highs"
+
+SOLVER_BACKEND = config("SOLVER_BACKEND", default=SolverBackend.GUROBI.value, cast=lambda v: v if v in SolverBackend._value2member_map_ else SolverBackend.GUROBI.value)
+
+# Write every new incumbent to results/* while solving (stop with TimeLimit/MIPGap in SOLVER_PARAMETERS)
+STREAM_INCUMBENTS = config("STREAM_INCUMBENTS", default=False, cast=bool)
+
+# Previous solution used as MIP start: a timeschedule.csv or a JSON solution (empty: cold start)
+WARM_START = config("WARM_START", default="")
+
+# Numerical conditioning: report the coefficient ranges of each family after set_objective, and lift the
+# tie-breaking objective terms (DUMMY_COEFFICIENT) while solving, keeping the order of the solutions
+CONDITIONING_REPORT = config("CONDITIONING_REPORT", default=False, cast=bool)
+RESCALE_OBJECTIVE = config("RESCALE_OBJECTIVE", default=False, cast=bool)
+
+# Infeasibility diagnosis: cheap checks on the sets, then feasRelax; the IIS (slow on large instances) only if DIAGNOSE_IIS
+DIAGNOSE_IIS = config("DIAGNOSE_IIS", default=False, cast=bool)
+DIAGNOSIS_REPORT = config("DIAGNOSIS_REPORT", default="course_timetabling/results/diagnosis.json")
+
+# Telemetry: convergence timeline (incumbent, bound, gap, nodes, work) of each run, as csv or json
+
+class TelemetryFormat(Enum):
+    CSV = "csv"
+    JSON = "json"
+
+TELEMETRY = config("TELEMETRY", default=False, cast=bool)
+TELEMETRY_DIR = config("TELEMETRY_DIR", default="course_timetabling/results/telemetry")
+TELEMETRY_FORMAT = config("TELEMETRY_FORMAT", default=TelemetryFormat.CSV.value, cast=lambda v: v if v in TelemetryFormat._value2member_map_ else TelemetryFormat.CSV.value)
+TELEMETRY_INTERVAL = config("TELEMETRY_INTERVAL", default=0.1, cast=float)
+
+# Profiling
+
+PROFILE = config("PROFILE", default=False, cast=bool)
+PROFILE_REPORT = config("PROFILE_REPORT", default="course_timetabling/results/profile.json")
+
 # Model parameters
 
 DUMMY_PROFESSOR_NAME = config("DUMMY_PROFESSOR", default="DUMMY")
@@ -33,5 +127,14 @@ WEIGHT_FACTOR_PS = config("WEIGHT_FACTOR_PS", default=1000, cast=int)
 MIN_CREDITS_SUBSTITUTE = config("MIN_CREDITS_SUBSTITUTE", default=8, cast=int)
 MAX_CREDITS_SUBSTITUTE = config("MAX_CREDITS_SUBSTITUTE", default=12, cast=int)
 
+# Objective: weighted sum (WEIGHT_FACTOR_*) or hierarchical, by priority: DUMMY use, then PSB, then PCB, then EAP (Gurobi only)
+class ObjectiveMode(Enum):
+    WEIGHTED = "weighted"
+    HIERARCHICAL = "hierarchical"
+
+OBJECTIVE_MODE = config("OBJECTIVE_MODE", default=ObjectiveMode.WEIGHTED.value, cast=lambda v: v if v in ObjectiveMode._value2member_map_ else ObjectiveMode.WEIGHTED.value)
+# Time limit in seconds of each hierarchical level, most important first, e.g. "10,10,10,60" (empty: no limit per level)
+OBJECTIVE_TIME_LIMITS = config("OBJECTIVE_TIME_LIMITS", default="", cast=lambda v: [float(t) for t in v.split(",") if t.strip()])
+
 SVC_MATH_COURSES = config("SVC_MATH_COURSES", default=["ICP231", "MAW123", "ICP478"], cast=list)
 SVC_BASIC_COURSES = config("SVC_BASIC_COURSES", default=["ICP114", "ICP121", "MAW112"], cast=list)
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Solves the model under several settings scenarios in parallel and compares them.
+
+A scenario is a dict of overrides of the model settings (see SWEEP_SETTINGS). Each one is
+solved in a worker process of a pool, with its own Gurobi environment and a share of the
+machine's cores as thread budget.
+
+Usage (from the repository root):
+    python course_timetabling/sweep.py --grid WEIGHT_FACTOR_PP=10,100,1000 MIN_CREDITS_PERMANENT=8,10
+    python course_timetabling/sweep.py --scenarios scenarios.json --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import pandas as pd
+from gurobipy import GRB
+
+import settings
+from main import get_sets, get_timetabling_class
+
+# Valores de settings.py que podem variar entre os cenários
+SWEEP_SETTINGS = (
+    "DEFAULT_COEFFICIENT",
+    "SERVICE_COURSE_COEFFICIENT_SP",
+    "SERVICE_COURSE_COEFFICIENT_PP",
+    "WEIGHT_FACTOR_PP",
+    "WEIGHT_FACTOR_PS",
+    "MIN_CREDITS_PERMANENT",
+    "MAX_CREDITS_PERMANENT",
+    "MIN_CREDITS_SUBSTITUTE",
+    "MAX_CREDITS_SUBSTITUTE",
+)
+
+
+def cast_setting(name: str, value):
+    """
+    Casts an override to the type of the setting it replaces, e.g. "100" to int.
+    """
+    if name not in SWEEP_SETTINGS:
+        raise ValueError(
+            f"{name} is not a sweepable setting: {', '.join(SWEEP_SETTINGS)}"
+        )
+
+    return type(getattr(settings, name))(value)
+
+
+def parse_grid(values: list) -> list:
+    """
+    Expands "NAME=v1,v2" values into the scenarios of their cartesian product.
+
+    Args:
+        values (list): e.g. ["WEIGHT_FACTOR_PP=10,100", "MIN_CREDITS_PERMANENT=8,10"].
+
+    Returns:
+        list: One dict of overrides per scenario.
+    """
+    axes = {}
+    for value in values:
+        name, options = value.split("=", 1)
+        name = name.strip()
+        axes[name] = [cast_setting(name, option) for option in options.split(",")]
+
+    return [dict(zip(axes, combination)) for combination in product(*axes.values())]
+
+
+def get_thread_budget(workers: int, cores: int = None) -> int:
+    """
+    Returns the Gurobi Threads of each worker, so that all of them fit in the cores.
+    """
+    cores = cores or os.cpu_count() or 1
+
+    return max(cores // workers, 1)
+
+
+def get_gap(timetabling) -> float:
+    """
+    Returns the MIP gap of the solved scenario, NaN if the backend does not report it
+    (HiGHS, hierarchical objectives).
+    """
+    if settings.SOLVER_BACKEND != settings.SolverBackend.GUROBI.value:
+        return float("nan")
+    if timetabling.model.IsMultiObj or not timetabling.model.IsMIP:
+        return float("nan")
+
+    return timetabling.model.MIPGap
+
+
+def get_scenario_name(overrides: dict) -> str:
+    """
+    Names a scenario after its overrides, e.g. "WEIGHT_FACTOR_PP=10_MIN_CREDITS_PERMANENT=8".
+    """
+    return "_".join(f"{name}={value}" for name, value in overrides.items()) or "default"
+
+
+def solve_scenario(sets: dict, overrides: dict, threads: int) -> dict:
+    """
+    Builds and solves the model with the overrides applied to settings. Runs in a worker
+    process: the model gets its own Gurobi environment, and settings are restored
+    afterwards since the process is reused by other scenarios. The incumbents are not
+    streamed to results/*, and the telemetry of each scenario goes to its own directory
+    (see get_scenario_name) under settings.TELEMETRY_DIR/sweep.
+
+    Scenarios stopped before optimality (e.g. TIME_LIMIT) report their best solution, with
+    their status and gap.
+
+    Returns:
+        dict: The overrides and the scenario results.
+    """
+    overrides = {name: cast_setting(name, value) for name, value in overrides.items()}
+    worker_settings = {
+        "SOLVER_PARAMETERS": {
+            "OutputFlag": 0,
+            **settings.SOLVER_PARAMETERS,
+            "Threads": threads,
+        },
+        # Os resultados em results/* são de uma única execução, não dos cenários
+        "STREAM_INCUMBENTS": False,
+        "PROFILE": False,
+        "TELEMETRY_DIR": os.path.join(
+            settings.TELEMETRY_DIR, "sweep", get_scenario_name(overrides)
+        ),
+    }
+    previous = {
+        name: getattr(settings, name) for name in [*overrides, *worker_settings]
+    }
+
+    for name, value in {**overrides, **worker_settings}.items():
+        setattr(settings, name, value)
+
+    result = {
+        **overrides,
+        "status": None,
+        "objective": float("nan"),
+        "gap": float("nan"),
+        "dummy_allocations": None,
+        "pcb_total": None,
+        "psb_total": None,
+        "solve_s": None,
+        "error": None,
+    }
+
+    timetabling = None
+    try:
+        timetabling = get_timetabling_class()(
+            **sets,
+            sparse=settings.SPARSE_MODEL,
+            conflict_mode=settings.CONFLICT_MODE,
+        )
+        timetabling.initialize_variables_and_coefficients()
+        timetabling.add_credit_slack_variables()
+        timetabling.add_constraints()
+        timetabling.set_objective()
+
+        start = time.perf_counter()
+        timetabling.optimize()
+        result["solve_s"] = round(time.perf_counter() - start, 3)
+        result["status"] = timetabling.result.status
+
+        # Cenários parados pelo limite de tempo entram com a melhor solução e o seu gap
+        if timetabling.result.values:
+            solution = timetabling.extract_solution()
+            objective = timetabling.get_objective_value()
+            if isinstance(objective, dict):
+                # Objetivo hierárquico: uma coluna por nível
+                result.update(
+                    {f"objective_{level}": value for level, value in objective.items()}
+                )
+            else:
+                result["objective"] = objective
+            result["gap"] = get_gap(timetabling)
+            result["dummy_allocations"] = sum(
+                allocation.professor == settings.DUMMY_PROFESSOR_NAME
+                for allocation in solution.allocations
+            )
+            result["pcb_total"] = sum(s.credits for s in solution.permanent_shortfall)
+            result["psb_total"] = sum(s.credits for s in solution.substitute_shortfall)
+    finally:
+        if timetabling is not None:
+            timetabling.clean_model()
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+    return result
+
+
+def run_sweep(sets: dict, scenarios: list, workers: int = None) -> pd.DataFrame:
+    """
+    Solves the scenarios in a process pool. A scenario that fails gets a row with no
+    status and the exception in the error column.
+
+    Args:
+        sets (dict): The sets keyed by the CourseTimetabling argument names.
+        scenarios (list): Dicts of setting overrides.
+        workers (int): Number of worker processes, the number of cores by default.
+
+    Returns:
+        pd.DataFrame: One row per scenario, in the scenarios order.
+    """
+    workers = max(min(workers or os.cpu_count() or 1, len(scenarios)), 1)
+    threads = get_thread_budget(workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(solve_scenario, sets, scenario, threads)
+            for scenario in scenarios
+        ]
+        results = []
+        for scenario, future in zip(scenarios, futures):
+            try:
+                results.append(future.result())
+            except Exception as error:
+                # Um cenário inviável ou acima do limite da licença não derruba os outros
+                results.append(
+                    {
+                        **scenario,
+                        "status": None,
+                        "error": f"{type(error).__name__}: {error}",
+                    }
+                )
+
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--grid", nargs="*", default=[], help="NAME=v1,v2 values")
+    parser.add_argument("--scenarios", help="JSON file with a list of overrides")
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    parser.add_argument("--output", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    scenarios = parse_grid(args.grid) if args.grid else []
+    if args.scenarios:
+        with open(args.scenarios, encoding="utf-8") as file:
+            scenarios += json.load(file)
+    if not scenarios:
+        parser.error("give a --grid or a --scenarios file")
+
+    results = run_sweep(get_sets(), scenarios, args.workers)
+    print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
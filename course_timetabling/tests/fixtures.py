@@ -0,0 +1,130 @@
+"""
+Sets and helpers shared by the model tests.
+
+PROFESSORS and COURSES hold the small instance the tests start from; get_sets copies the
+parts a test needs (plus DUMMY), so a test can change its sets without affecting others.
+"""
+
+import copy
+
+from main import CourseTimetabling
+
+
+def get_professor(qualified_courses: list, category: str = "PP", expertise=()) -> dict:
+    return {
+        "qualified_courses": list(qualified_courses),
+        "expertise": list(expertise),
+        "category": category,
+    }
+
+
+def get_course(
+    course_id: str,
+    day: str,
+    time: str,
+    credits: int = 4,
+    course_type: str = "OBG",
+    **details,
+) -> dict:
+    return {
+        "course_id": course_id,
+        "credits": credits,
+        "day": day,
+        "time": time,
+        "course_type": course_type,
+        **details,
+    }
+
+
+DUMMY = {
+    "DUMMY": {
+        "qualified_courses": ["*"],
+        "expertise": ["*"],
+        "category": "DUMMY",
+    },
+}
+
+PROFESSORS = {
+    "Prof1": get_professor(["ICP131"], expertise=["ED"]),
+    "Prof2": get_professor(["ICP132", "ICP131"], expertise=["CD"]),
+    "Prof3": get_professor(["ICP133"], category="PS"),
+    # Sem turmas elegíveis
+    "Prof4": get_professor(["ICP777"]),
+}
+
+COURSES = {
+    "OBG-BCC1-1": get_course("ICP131", "SEG,QUA", "13:00-15:00"),
+    "OBG-BCC1-2": get_course("ICP132", "SEG,QUA", "13:00-15:00"),
+    "OBG-BCC1-3": get_course("ICP133", "SEG", "13:00-15:00", credits=2),
+    "OBG-BCC1-4": get_course("ICP555", "TER,QUI", "08:00-10:00"),
+    "SVC-EM1-4": get_course("ICP114", "TER,QUI", "08:00-10:00", course_type="SVC"),
+    "OPT-BCC1-5": get_course("ICP999", "SEX", "10:00-12:00", course_type="OPT"),
+}
+
+
+def get_sets(
+    professors=("Prof1", "Prof2"),
+    courses=("OBG-BCC1-1", "OBG-BCC1-2"),
+    manual_allocation: dict = None,
+    dummy: bool = True,
+) -> dict:
+    """
+    Returns a copy of the sets, keyed by the CourseTimetabling argument names.
+
+    Args:
+        professors: Names from PROFESSORS, or a dict of professors; they are split into
+            permanent and substitute professors by category.
+        courses: Names from COURSES, or a dict of courses.
+        manual_allocation (dict): Professor of each manually allocated course, e.g.
+            {"OPT-BCC1-5": "Prof1"}.
+        dummy (bool): Whether to add the DUMMY professor.
+    """
+    if not isinstance(professors, dict):
+        professors = {professor: PROFESSORS[professor] for professor in professors}
+    if not isinstance(courses, dict):
+        courses = {course: COURSES[course] for course in courses}
+    professors = copy.deepcopy(professors)
+    courses = copy.deepcopy(courses)
+
+    return {
+        "professors": {**professors, **(copy.deepcopy(DUMMY) if dummy else {})},
+        "permanent_professors": {
+            name: professor
+            for name, professor in professors.items()
+            if professor["category"] == "PP"
+        },
+        "substitute_professors": {
+            name: professor
+            for name, professor in professors.items()
+            if professor["category"] == "PS"
+        },
+        "courses": courses,
+        "manual_allocation": {
+            course: {**courses[course], "professor": professor}
+            for course, professor in (manual_allocation or {}).items()
+        },
+    }
+
+
+def build(
+    sets: dict, timetabling_class=CourseTimetabling, optimize: bool = False, **options
+):
+    """
+    Builds the model of the sets, and solves it if optimize is set.
+
+    Args:
+        sets (dict): The sets, see get_sets.
+        timetabling_class: CourseTimetabling or one of its subclasses.
+        optimize (bool): Whether to solve the model.
+        **options: Other arguments of timetabling_class, e.g. sparse or conflict_mode.
+    """
+    timetabling = timetabling_class(**sets, **options)
+    timetabling.initialize_variables_and_coefficients()
+    timetabling.add_credit_slack_variables()
+    timetabling.add_constraints()
+    timetabling.set_objective()
+
+    if optimize:
+        timetabling.optimize()
+
+    return timetabling
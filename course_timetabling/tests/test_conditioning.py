@@ -0,0 +1,162 @@
+import os
+import sys
+import tempfile
+import unittest
+from itertools import combinations, product
+from unittest.mock import patch
+
+import gurobipy as gp
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from fixtures import build, get_sets
+from matrix_model import MatrixCourseTimetabling
+from utils.telemetry import load_timeline
+from utils.conditioning import analyze, rescale_objective
+
+
+class TestConditioning(unittest.TestCase):
+
+    def build(self, timetabling_class=CourseTimetabling):
+        return build(
+            get_sets(
+                professors=("Prof1", "Prof3"),
+                courses=("OBG-BCC1-1", "OBG-BCC1-2", "OBG-BCC1-3"),
+            ),
+            timetabling_class,
+            sparse=True,
+        )
+
+    def test_ranges_by_family(self):
+        timetabling = self.build()
+
+        report = timetabling.analyze_conditioning()
+        ranges = {(r.kind, r.family): r for r in report.ranges}
+
+        self.assertEqual(ranges["matrix", "RNG3"].min, 1)
+        self.assertEqual(ranges["matrix", "RNG1"].max, 4)
+        self.assertEqual(ranges["rhs", "RNP2"].max, 12)
+        self.assertEqual(ranges["objective", "X_DUMMY"].max, 0.00001)
+        self.assertEqual(ranges["objective", "PSB"].max, 1000)
+        self.assertIn(
+            "objective range 1e+08: X_DUMMY (1e-05) vs PSB (1000)", report.warnings
+        )
+        self.assertIn("small objective coefficient 1e-05 in X_DUMMY", report.warnings)
+        self.assertIn("X_DUMMY", report.report())
+
+        timetabling.clean_model()
+
+    def test_rescaling_keeps_the_solution_and_objective(self):
+        timetabling = self.build()
+        timetabling.optimize()
+        solution = timetabling.extract_solution()
+        objective = timetabling.result.objective
+
+        rescaling = rescale_objective(timetabling.model)
+        self.assertGreater(rescaling.factor, 1)
+        rescaling.restore(timetabling.model)
+
+        with patch("settings.RESCALE_OBJECTIVE", True):
+            timetabling.optimize()
+
+        self.assertEqual(timetabling.extract_solution(), solution)
+        self.assertAlmostEqual(timetabling.result.objective, objective)
+        # Os coeficientes originais são restaurados depois da otimização
+        self.assertEqual(timetabling.X["DUMMY", "OBG-BCC1-1"].Obj, 0.00001)
+
+        timetabling.clean_model()
+
+    def test_matrix_model_has_the_same_families(self):
+        term = self.build()
+        matrix = self.build(MatrixCourseTimetabling)
+
+        self.assertEqual(
+            matrix.analyze_conditioning().ranges, term.analyze_conditioning().ranges
+        )
+
+        term.clean_model()
+        matrix.clean_model()
+
+    def test_rescaling_with_telemetry(self):
+        timetabling = self.build()
+        timetabling.optimize()
+        objective = timetabling.result.objective
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "settings.RESCALE_OBJECTIVE", True
+        ), patch("settings.TELEMETRY", True), patch(
+            "settings.TELEMETRY_DIR", directory
+        ):
+            timetabling.optimize()
+
+            (filename,) = os.listdir(directory)
+            timeline = load_timeline(os.path.join(directory, filename))
+
+        final = timeline.iloc[-1]
+        self.assertEqual(final["event"], "final")
+        self.assertAlmostEqual(final["incumbent"], objective)
+        self.assertAlmostEqual(final["bound"], objective)
+        self.assertAlmostEqual(final["gap"], 0)
+
+        timetabling.clean_model()
+
+    def test_rescaling_preserves_the_ordering(self):
+        model = gp.Model()
+        x = model.addVars(4, vtype=GRB.BINARY, obj=[100, 10, 0.00001, 0.00002])
+        y = model.addVar(vtype=GRB.INTEGER, ub=3, obj=-1000)
+        model.update()
+        original = model.getAttr("Obj", model.getVars())
+
+        rescaling = rescale_objective(model)
+        model.update()
+        rescaled = model.getAttr("Obj", model.getVars())
+
+        self.assertAlmostEqual(rescaling.factor, 10 / (2 * 0.00003))
+        self.assertEqual(rescaled[:2], original[:2])
+        self.assertGreater(min(rescaled[2:4]), 0.1)
+
+        solutions = [
+            list(values) + [count]
+            for values in product((0, 1), repeat=4)
+            for count in range(4)
+        ]
+
+        def value(coefficients, solution):
+            return sum(c * v for c, v in zip(coefficients, solution))
+
+        for first, second in combinations(solutions, 2):
+            before = value(original, first) - value(original, second)
+            after = value(rescaled, first) - value(rescaled, second)
+            self.assertEqual((before > 0) - (before < 0), (after > 0) - (after < 0))
+
+        self.assertAlmostEqual(
+            rescaling.get_original_objective(
+                value(rescaled, solutions[-1]), solutions[-1]
+            ),
+            value(original, solutions[-1]),
+        )
+        model.dispose()
+
+    def test_rescaling_needs_tie_breaking_terms(self):
+        model = gp.Model()
+        model.addVars(2, vtype=GRB.BINARY, obj=[100, 10])
+        self.assertIsNone(rescale_objective(model))
+
+        # Termos fracionários que mudam a ordem não são desempates
+        model.addVars(100, vtype=GRB.BINARY, obj=0.5)
+        self.assertIsNone(rescale_objective(model))
+
+        model.dispose()
+
+        model = gp.Model()
+        model.addVars(2, vtype=GRB.BINARY, obj=[100, 0.00001])
+        model.addVar(obj=1)
+        self.assertIsNone(rescale_objective(model))
+
+        model.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
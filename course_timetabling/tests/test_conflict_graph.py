@@ -0,0 +1,93 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from utils.conflict_graph import ConflictGraph
+
+
+class TestConflictGraph(TestCase):
+    def setUp(self) -> None:
+        self.courses = {
+            "OBG-BCC1-1": {"day": "TER,QUI", "time": "08:00-10:00", "credits": 4},
+            "OBG-BCC1-2": {"day": "TER,QUI", "time": "08:00-10:00", "credits": 4},
+            "OBG-BCC1-3": {"day": "TER", "time": "09:00-11:00", "credits": 2},
+            "OBG-BCC1-4": {"day": "TER", "time": "10:00-12:00", "credits": 2},
+            "OBG-BCC1-5": {"day": "SEG,QUA", "time": "08:00-10:00", "credits": 4},
+            "OPT-BCC1-6": {
+                "day": "NÃO DEFINIDO",
+                "time": "NÃO DEFINIDO",
+                "credits": 4,
+            },
+        }
+        self.graph = ConflictGraph.from_courses(self.courses)
+        return super().setUp()
+
+    def test_conflicts(self):
+        self.assertEqual(
+            self.graph.conflicts("OBG-BCC1-1"), {"OBG-BCC1-2", "OBG-BCC1-3"}
+        )
+        self.assertEqual(
+            self.graph.conflicts("OBG-BCC1-3"),
+            {"OBG-BCC1-1", "OBG-BCC1-2", "OBG-BCC1-4"},
+        )
+        self.assertEqual(self.graph.conflicts("OBG-BCC1-5"), set())
+        self.assertEqual(self.graph.conflicts("OPT-BCC1-6"), set())
+
+    def test_are_conflicting_is_symmetric(self):
+        for course, other in self.graph.edges():
+            self.assertTrue(self.graph.are_conflicting(course, other))
+            self.assertTrue(self.graph.are_conflicting(other, course))
+
+        self.assertFalse(self.graph.are_conflicting("OBG-BCC1-1", "OBG-BCC1-4"))
+
+    def test_edges_are_listed_once(self):
+        self.assertEqual(
+            list(self.graph.edges()),
+            [
+                ("OBG-BCC1-1", "OBG-BCC1-2"),
+                ("OBG-BCC1-1", "OBG-BCC1-3"),
+                ("OBG-BCC1-2", "OBG-BCC1-3"),
+                ("OBG-BCC1-3", "OBG-BCC1-4"),
+            ],
+        )
+        self.assertEqual(self.graph.number_of_edges(), 4)
+
+    def test_groups_hold_courses_with_identical_schedule(self):
+        self.assertIn(("OBG-BCC1-1", "OBG-BCC1-2"), self.graph.groups)
+        self.assertEqual(
+            self.graph.cross_group_edges,
+            [
+                ("OBG-BCC1-1", "OBG-BCC1-3"),
+                ("OBG-BCC1-2", "OBG-BCC1-3"),
+                ("OBG-BCC1-3", "OBG-BCC1-4"),
+            ],
+        )
+
+    def test_cliques_cover_every_edge(self):
+        cliques = self.graph.cliques()
+
+        self.assertEqual(
+            cliques,
+            [
+                ("OBG-BCC1-1", "OBG-BCC1-2", "OBG-BCC1-3"),
+                ("OBG-BCC1-3", "OBG-BCC1-4"),
+            ],
+        )
+        for course, other in self.graph.edges():
+            self.assertTrue(
+                any(course in clique and other in clique for clique in cliques)
+            )
+
+    def test_to_csr(self):
+        indptr, indices = self.graph.to_csr()
+
+        self.assertEqual(indptr.tolist(), [0, 2, 4, 7, 8, 8, 8])
+        self.assertEqual(indices[indptr[2] : indptr[3]].tolist(), [0, 1, 3])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gurobipy import GRB
+
+import settings
+from decomposition import get_components, solve_component, solve_decomposed
+from fixtures import build, get_sets
+from settings import ObjectiveMode
+from utils.solver_backend import GurobiBackend
+
+
+class TestDecomposition(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.SETS = get_sets(
+            professors=("Prof1", "Prof2", "Prof4", "Prof3"),
+            courses=(
+                "OBG-BCC1-1",
+                "OBG-BCC1-2",
+                "OBG-BCC1-3",
+                "OBG-BCC1-4",
+                "OPT-BCC1-5",
+            ),
+            manual_allocation={"OPT-BCC1-5": "Prof1"},
+        )
+
+        return super().setUp()
+
+    def test_components(self):
+        components = sorted(
+            get_components(self.SETS), key=lambda c: (sorted(c[0]), sorted(c[1]))
+        )
+
+        self.assertEqual(
+            components,
+            [
+                (set(), {"OBG-BCC1-4"}),
+                (
+                    {"Prof1", "Prof2"},
+                    {"OBG-BCC1-1", "OBG-BCC1-2", "OPT-BCC1-5"},
+                ),
+                ({"Prof3"}, {"OBG-BCC1-3"}),
+                ({"Prof4"}, set()),
+            ],
+        )
+
+    def test_merged_solution_matches_the_monolithic_model(self):
+        timetabling = build(self.SETS, optimize=True, sparse=True)
+        monolithic_solution = timetabling.extract_solution()
+        monolithic_objective = timetabling.result.objective
+        timetabling.clean_model()
+
+        solution, objective, n_components, status = solve_decomposed(
+            self.SETS, workers=2
+        )
+
+        self.assertEqual(n_components, 4)
+        self.assertEqual(status, GRB.OPTIMAL)
+        self.assertAlmostEqual(objective, monolithic_objective)
+        self.assertEqual(
+            solution.permanent_shortfall, monolithic_solution.permanent_shortfall
+        )
+        self.assertEqual(
+            sorted(a.course_class_id for a in solution.allocations),
+            sorted(self.SETS["courses"]),
+        )
+
+    @patch("settings.OBJECTIVE_MODE", ObjectiveMode.HIERARCHICAL.value)
+    def test_hierarchical_objective_is_summed_by_level(self):
+        timetabling = build(self.SETS, optimize=True, sparse=True)
+        monolithic_objective = timetabling.get_objective_value()
+        timetabling.clean_model()
+
+        _, objective, _, _ = solve_decomposed(self.SETS, workers=2)
+
+        self.assertEqual(objective.keys(), monolithic_objective.keys())
+        for level, value in monolithic_objective.items():
+            self.assertAlmostEqual(objective[level], value)
+
+    def test_stopped_component_keeps_its_incumbent(self):
+        solve = GurobiBackend.solve
+
+        def stopped(backend, *args, **kwargs):
+            return solve(backend, *args, **kwargs)._replace(status=GRB.TIME_LIMIT)
+
+        with patch.object(GurobiBackend, "solve", stopped):
+            solution, _, _, status = solve_decomposed(self.SETS, workers=2)
+
+        self.assertEqual(status, GRB.TIME_LIMIT)
+        self.assertEqual(
+            sorted(a.course_class_id for a in solution.allocations),
+            sorted(self.SETS["courses"]),
+        )
+
+    @patch("utils.utils.treat_and_save_results")
+    @patch("settings.STREAM_INCUMBENTS", True)
+    def test_component_does_not_stream(self, mock_treat_and_save_results):
+        solve_component(self.SETS, threads=1)
+
+        mock_treat_and_save_results.assert_not_called()
+        self.assertTrue(settings.STREAM_INCUMBENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
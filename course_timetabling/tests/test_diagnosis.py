@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from fixtures import build, get_sets
+from utils.diagnosis import (
+    DiagnosisReport,
+    check_credit_caps,
+    check_manual_allocation,
+    diagnose,
+)
+from utils.solver_backend import SolverResult
+
+
+class TestDiagnosis(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # OBG-BCC1-1 e OBG-BCC1-3 são no mesmo horário, OBG-BCC1-4 não
+        self.SETS = get_sets(courses=("OBG-BCC1-1", "OBG-BCC1-3", "OBG-BCC1-4"))
+
+        return super().setUp()
+
+    def allocate(self, course, professor, **details):
+        self.SETS["manual_allocation"][course] = {
+            **self.SETS["courses"].get(course, {"day": "SEX", "time": "08:00-10:00"}),
+            "professor": professor,
+            **details,
+        }
+
+    def test_valid_sets_have_no_issues(self):
+        self.allocate("OBG-BCC1-1", "Prof1")
+
+        self.assertEqual(check_manual_allocation(self.SETS), [])
+        self.assertEqual(check_credit_caps(self.SETS), [])
+
+    def test_manual_allocation_references(self):
+        self.allocate("OBG-BCC1-1", "Prof9")
+        self.allocate("OBG-BCC9-1", "Prof1")
+        self.allocate("OBG-BCC1-4", "Prof2", time="15:00-17:00")
+
+        issues = check_manual_allocation(self.SETS)
+
+        self.assertEqual(
+            [(issue.subject, issue.message.split()[0]) for issue in issues],
+            [
+                ("OBG-BCC1-1", "unknown"),
+                ("OBG-BCC9-1", "unknown"),
+                ("OBG-BCC1-4", "slot"),
+            ],
+        )
+
+    def test_conflicting_manual_allocations(self):
+        self.allocate("OBG-BCC1-1", "Prof1")
+        self.allocate("OBG-BCC1-3", "Prof1")
+        self.allocate("OBG-BCC1-4", "Prof1")
+
+        (issue,) = check_manual_allocation(self.SETS)
+
+        self.assertEqual(issue.check, "manual_conflict")
+        self.assertEqual(issue.subject, "Prof1")
+        self.assertIn("OBG-BCC1-1 and OBG-BCC1-3", issue.message)
+
+    @patch("settings.MIN_CREDITS_PERMANENT", 4)
+    def test_manual_credits_above_the_cap(self):
+        self.allocate("OBG-BCC1-1", "Prof2")
+        self.allocate("OBG-BCC1-4", "Prof2")
+
+        (issue,) = check_credit_caps(self.SETS)
+
+        self.assertEqual(issue.check, "credit_cap")
+        self.assertEqual(issue.subject, "Prof2")
+
+    def test_classes_without_professor_nor_dummy(self):
+        del self.SETS["professors"]["DUMMY"]
+
+        issues = check_credit_caps(self.SETS)
+
+        self.assertEqual(
+            [issue.subject for issue in issues], ["OBG-BCC1-3", "OBG-BCC1-4"]
+        )
+
+    def test_cheap_checks_skip_the_relaxation(self):
+        self.allocate("OBG-BCC1-1", "Prof1")
+        self.allocate("OBG-BCC1-3", "Prof1")
+
+        with patch("utils.diagnosis.relax") as mock_relax:
+            report = diagnose(self.SETS, model=object())
+
+        mock_relax.assert_not_called()
+        self.assertEqual(report.tiers, ("checks",))
+        self.assertEqual(len(report.issues), 1)
+
+    def test_infeasible_model_is_relaxed(self):
+        timetabling = build(self.SETS, sparse=True)
+        # Inviável sem passar pelos conjuntos: a turma fica sem professor
+        timetabling.model.addConstr(
+            timetabling.X.sum("*", "OBG-BCC1-4") == 0, name="EXTRA_OBG-BCC1-4"
+        )
+        timetabling.optimize()
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "settings.DIAGNOSIS_REPORT", os.path.join(directory, "diagnosis.json")
+        ):
+            with self.assertRaises(Exception):
+                timetabling.generate_results()
+
+            self.assertTrue(os.path.exists(os.path.join(directory, "diagnosis.json")))
+
+        report = timetabling.diagnose()
+        self.assertEqual(report.status, GRB.INFEASIBLE)
+        self.assertEqual(report.tiers, ("checks", "feasrelax"))
+        self.assertEqual(report.issues, ())
+        self.assertEqual(len(report.violations), 1)
+        self.assertIn(report.violations[0][0], ("RNG3_OBG-BCC1-4", "EXTRA_OBG-BCC1-4"))
+        self.assertEqual(report.violations[0][1], 1.0)
+
+        report = timetabling.diagnose(iis=True)
+        self.assertEqual(report.tiers, ("checks", "feasrelax", "iis"))
+        self.assertEqual(set(report.iis), {"RNG3_OBG-BCC1-4", "EXTRA_OBG-BCC1-4"})
+
+        timetabling.clean_model()
+        os.remove("model.ilp")
+
+    def test_violations_are_summed_by_rule(self):
+        report = DiagnosisReport(
+            GRB.INFEASIBLE,
+            violations=(("RNG3[0]", 1.0), ("RNG3[1]", 2.0), ("RNG4_Prof1_G0", 1.0)),
+        )
+
+        self.assertEqual(report.get_violations_by_rule(), {"RNG3": 3.0, "RNG4": 1.0})
+
+    def test_invalid_sets_stop_before_the_build(self):
+        self.allocate("OBG-BCC1-1", "Prof9")
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "main.get_sets", return_value=self.SETS
+        ), patch("settings.RESULT_CACHE", False), patch(
+            "settings.DIAGNOSIS_REPORT", os.path.join(directory, "diagnosis.json")
+        ), patch.object(
+            main.CourseTimetabling, "add_constraints"
+        ) as mock_add_constraints:
+            with self.assertRaisesRegex(Exception, "Invalid sets"):
+                main.main()
+
+            with open(os.path.join(directory, "diagnosis.json")) as file:
+                diagnosis = json.load(file)
+
+        mock_add_constraints.assert_not_called()
+        self.assertEqual(diagnosis["tiers"], ["checks"])
+        self.assertEqual(diagnosis["issues"][0]["subject"], "OBG-BCC1-1")
+
+    def test_time_limit_is_not_diagnosed(self):
+        timetabling = build(self.SETS, sparse=True)
+        timetabling.result = SolverResult(GRB.TIME_LIMIT, float("nan"))
+
+        with patch.object(timetabling, "diagnose") as mock_diagnose:
+            with self.assertRaises(Exception):
+                timetabling.generate_results()
+
+        mock_diagnose.assert_not_called()
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import settings
+from fixtures import build, get_sets
+from utils import env_pool
+from utils.env_pool import EnvPool, create_environment
+
+
+class TestEnvPool(unittest.TestCase):
+
+    def solve(self):
+        timetabling = build(
+            get_sets(professors=("Prof1",), courses=("OBG-BCC1-1",)), optimize=True
+        )
+        objective = timetabling.model.ObjVal
+        env = timetabling.env
+        timetabling.clean_model()
+
+        return env, objective
+
+    def test_local_license_starts_an_environment(self):
+        with patch("settings.APP_LICENSE_TYPE", settings.LicenseType.LOCAL.value):
+            env = create_environment()
+
+        env.dispose()
+
+    def test_environment_is_reused_after_clean_model(self):
+        pool = EnvPool()
+
+        with patch("settings.ENV_POOL", True), patch(
+            "settings.APP_LICENSE_TYPE", settings.LicenseType.LOCAL.value
+        ), patch("main.get_env_pool", return_value=pool):
+            first_env, first_objective = self.solve()
+            second_env, second_objective = self.solve()
+
+        self.assertIs(second_env, first_env)
+        self.assertEqual(pool.created, 1)
+        self.assertEqual(second_objective, first_objective)
+
+        pool.clear()
+
+    def test_environments_beyond_max_idle_are_disposed(self):
+        pool = EnvPool(factory=MagicMock, max_idle=1)
+        envs = [pool.acquire(), pool.acquire()]
+
+        for env in envs:
+            pool.release(env)
+
+        self.assertEqual(pool.idle, [envs[0]])
+        envs[0].dispose.assert_not_called()
+        envs[1].dispose.assert_called_once()
+
+    def test_forked_process_gets_a_new_pool(self):
+        pool = env_pool.get_env_pool()
+        self.assertIs(env_pool.get_env_pool(), pool)
+
+        with patch("os.getpid", return_value=-1):
+            self.assertIsNot(env_pool.get_env_pool(), pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
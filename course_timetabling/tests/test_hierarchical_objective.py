@@ -0,0 +1,182 @@
+import math
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from fixtures import COURSES, PROFESSORS, build, get_course, get_professor, get_sets
+from settings import ObjectiveMode
+from utils.presolve import presolve
+from utils.telemetry import TelemetryRecorder, load_timeline
+
+
+class TestHierarchicalObjective(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Duas turmas de ICP132 no mesmo horário, que Prof2 e Prof3 podem dar
+        self.SETS = get_sets(
+            professors={
+                "Prof1": PROFESSORS["Prof1"],
+                "Prof2": PROFESSORS["Prof2"],
+                "Prof3": get_professor(["ICP132"], category="PS"),
+            },
+            courses={
+                "OBG-BCC1-1": COURSES["OBG-BCC1-1"],
+                "OBG-BCC1-2": get_course("ICP132", "TER,QUI", "13:00-15:00"),
+                "OBG-BCC2-2": get_course("ICP132", "TER,QUI", "13:00-15:00"),
+            },
+        )
+
+        return super().setUp()
+
+    def solve(self, objective_mode, sets=None):
+        timetabling = build(self.SETS if sets is None else sets, sparse=True)
+
+        with patch("settings.OBJECTIVE_MODE", objective_mode):
+            timetabling.optimize()
+
+        return timetabling
+
+    def test_levels_follow_the_priorities(self):
+        timetabling = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+        self.assertEqual(timetabling.model.NumObj, 4)
+        priorities = []
+        for index in range(timetabling.model.NumObj):
+            timetabling.model.Params.ObjNumber = index
+            priorities.append(
+                (timetabling.model.ObjNName, timetabling.model.ObjNPriority)
+            )
+        self.assertEqual(
+            priorities,
+            [
+                ("dummy", 4),
+                ("substitute_shortfall", 3),
+                ("permanent_shortfall", 2),
+                ("eap", 1),
+            ],
+        )
+        self.assertEqual(timetabling.result.status, GRB.OPTIMAL)
+
+        timetabling.clean_model()
+
+    def test_matches_the_weighted_objective_when_the_weights_agree(self):
+        weighted = self.solve(ObjectiveMode.WEIGHTED.value)
+        hierarchical = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+        self.assertEqual(
+            weighted.get_objective_values(), hierarchical.get_objective_values()
+        )
+        self.assertEqual(hierarchical.get_objective_values()["dummy"], 0)
+        self.assertEqual(hierarchical.get_objective_values()["substitute_shortfall"], 4)
+
+        weighted.clean_model()
+        hierarchical.clean_model()
+
+    @patch("settings.DUMMY_COEFFICIENT", 1000)
+    def test_does_not_depend_on_the_weights(self):
+        weighted = self.solve(ObjectiveMode.WEIGHTED.value)
+        hierarchical = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+        # Com DUMMY mais atrativo que qualquer professor, a soma ponderada usa o DUMMY
+        self.assertEqual(weighted.get_objective_values()["dummy"], 2)
+        self.assertEqual(hierarchical.get_objective_values()["dummy"], 0)
+
+        weighted.clean_model()
+        hierarchical.clean_model()
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_results_report_every_level(self, mock_treat_and_save_results):
+        timetabling = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+        _, model_value = timetabling.generate_results()
+
+        self.assertEqual(model_value, timetabling.get_objective_values())
+        self.assertEqual(model_value["substitute_shortfall"], 4)
+
+        timetabling.clean_model()
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_postsolved_levels_match_the_original_model(
+        self, mock_treat_and_save_results
+    ):
+        sets = get_sets(
+            professors={**self.SETS["professors"], "Prof4": PROFESSORS["Prof4"]},
+            courses={**self.SETS["courses"], "OBG-BCC1-4": COURSES["OBG-BCC1-4"]},
+        )
+        presolved = presolve(sets)
+        self.assertEqual(presolved.removed_professors, ("Prof4",))
+        self.assertEqual(presolved.dummy_classes, ("OBG-BCC1-4",))
+
+        original = self.solve(ObjectiveMode.HIERARCHICAL.value, sets)
+        reduced = self.solve(ObjectiveMode.HIERARCHICAL.value, presolved.sets)
+        _, reduced_value = reduced.generate_results()
+
+        _, model_value = presolved.postsolve(reduced.extract_solution(), reduced_value)
+
+        self.assertEqual(model_value, original.get_objective_values())
+
+        original.clean_model()
+        reduced.clean_model()
+
+    def test_telemetry_records_every_level(self):
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "settings.TELEMETRY", True
+        ), patch("settings.TELEMETRY_DIR", directory):
+            timetabling = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+            (filename,) = os.listdir(directory)
+            timeline = load_timeline(os.path.join(directory, filename))
+
+        final = timeline[timeline["event"].str.startswith("final")]
+        self.assertEqual(
+            dict(zip(final["event"], final["incumbent"])),
+            {
+                f"final_{level}": value
+                for level, value in timetabling.get_objective_values().items()
+            },
+        )
+        self.assertTrue(all(math.isnan(gap) for gap in final["gap"]))
+
+        timetabling.clean_model()
+
+    def test_telemetry_keeps_the_selected_level(self):
+        timetabling = self.solve(ObjectiveMode.HIERARCHICAL.value)
+        timetabling.model.Params.ObjNumber = 2
+
+        TelemetryRecorder().finish(timetabling.model)
+
+        self.assertEqual(timetabling.model.Params.ObjNumber, 2)
+
+        timetabling.clean_model()
+
+    @patch("settings.OBJECTIVE_TIME_LIMITS", [5.0, 0, 2.5])
+    def test_time_limits_per_level(self):
+        timetabling = self.solve(ObjectiveMode.HIERARCHICAL.value)
+
+        self.assertEqual(timetabling.model.getMultiobjEnv(0).getParam("TimeLimit"), 5)
+        self.assertEqual(
+            timetabling.model.getMultiobjEnv(1).getParam("TimeLimit"), float("inf")
+        )
+        self.assertEqual(timetabling.model.getMultiobjEnv(2).getParam("TimeLimit"), 2.5)
+
+        timetabling.clean_model()
+
+    def test_needs_the_gurobi_backend(self):
+        timetabling = CourseTimetabling(**self.SETS, sparse=True, backend="highs")
+
+        with patch("settings.OBJECTIVE_MODE", ObjectiveMode.HIERARCHICAL.value):
+            with self.assertRaises(ValueError):
+                timetabling.optimize()
+
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from matrix_model import MatrixCourseTimetabling
+from fixtures import COURSES, PROFESSORS, build, get_course, get_sets
+from utils.model_cache import ModelCache
+
+
+class TestIncrementalResolve(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.PROFESSORS = {
+            professor: PROFESSORS[professor]
+            for professor in ("Prof1", "Prof2", "Prof3")
+        }
+        self.COURSES = {
+            course: COURSES[course]
+            for course in (
+                "OBG-BCC1-1",
+                "OBG-BCC1-2",
+                "OBG-BCC1-3",
+                "SVC-EM1-4",
+                "OPT-BCC1-5",
+            )
+        }
+        self.NEW_COURSE = get_course("ICP133", "TER,QUI", "08:00-10:00")
+        self.MANUAL_ALLOCATION = {"OPT-BCC1-5": "Prof1"}
+
+        return super().setUp()
+
+    def get_sets(self, professors=None, courses=None, manual=None):
+        return get_sets(
+            self.PROFESSORS if professors is None else professors,
+            self.COURSES if courses is None else courses,
+            self.MANUAL_ALLOCATION if manual is None else manual,
+        )
+
+    def build(self, sets, sparse, timetabling_class=CourseTimetabling):
+        return build(sets, timetabling_class, optimize=True, sparse=sparse)
+
+    def assertDeltaMatchesRebuild(
+        self,
+        operation,
+        sets,
+        compare_variables=True,
+        timetabling_class=CourseTimetabling,
+    ):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                timetabling = self.build(self.get_sets(), sparse, timetabling_class)
+                operation(timetabling)
+                timetabling.reoptimize()
+
+                rebuilt = self.build(sets, sparse)
+
+                self.assertEqual(timetabling.model.Status, rebuilt.model.Status)
+                self.assertAlmostEqual(timetabling.model.ObjVal, rebuilt.model.ObjVal)
+                if sparse and compare_variables:
+                    self.assertEqual(set(timetabling.X.keys()), set(rebuilt.X.keys()))
+
+                timetabling.clean_model()
+                rebuilt.clean_model()
+
+    def test_fix_allocation(self):
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.fix_allocation("Prof3", "OBG-BCC1-1"),
+            self.get_sets(manual={**self.MANUAL_ALLOCATION, "OBG-BCC1-1": "Prof3"}),
+        )
+
+    def test_unfix_allocation(self):
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.unfix_allocation("OPT-BCC1-5"), self.get_sets(manual={})
+        )
+
+    def test_add_and_remove_qualification(self):
+        def operation(timetabling):
+            timetabling.add_qualification("Prof3", "ICP131")
+            timetabling.remove_qualification("Prof2", "ICP131")
+
+        professors = {
+            **self.PROFESSORS,
+            "Prof2": {**self.PROFESSORS["Prof2"], "qualified_courses": ["ICP132"]},
+            "Prof3": {
+                **self.PROFESSORS["Prof3"],
+                "qualified_courses": ["ICP133", "ICP131"],
+            },
+        }
+        self.assertDeltaMatchesRebuild(operation, self.get_sets(professors=professors))
+
+    def test_add_class(self):
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.add_class("OBG-BCC1-6", self.NEW_COURSE),
+            self.get_sets(courses={**self.COURSES, "OBG-BCC1-6": self.NEW_COURSE}),
+        )
+
+    def test_remove_class(self):
+        courses = {c: d for c, d in self.COURSES.items() if c != "OBG-BCC1-2"}
+
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.remove_class("OBG-BCC1-2"), self.get_sets(courses=courses)
+        )
+
+    def test_deactivated_professor_matches_model_without_them(self):
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.set_professor_active("Prof2", False),
+            self.get_sets(
+                professors={p: d for p, d in self.PROFESSORS.items() if p != "Prof2"},
+            ),
+            # Os professores inativos mantêm suas variáveis, com limite superior zero
+            compare_variables=False,
+        )
+
+    def test_reactivated_professor_matches_original_model(self):
+        def operation(timetabling):
+            timetabling.set_professor_active("Prof3", False)
+            timetabling.reoptimize()
+            timetabling.set_professor_active("Prof3", True)
+
+        self.assertDeltaMatchesRebuild(operation, self.get_sets())
+
+    def test_professor_with_manual_allocation_cannot_be_deactivated(self):
+        timetabling = self.build(self.get_sets(), sparse=True)
+
+        with self.assertRaises(ValueError):
+            timetabling.set_professor_active("Prof1", False)
+
+        timetabling.clean_model()
+
+    def test_fix_allocation_rejects_inactive_professor(self):
+        timetabling = self.build(self.get_sets(), sparse=True)
+        timetabling.set_professor_active("Prof3", False)
+
+        with self.assertRaises(ValueError):
+            timetabling.fix_allocation("Prof3", "OBG-BCC1-3")
+
+        timetabling.clean_model()
+
+    def test_model_not_matching_its_sets_is_rejected(self):
+        timetabling = self.build(self.get_sets(), sparse=True)
+        timetabling.model.remove(timetabling.assignment_constraints["OBG-BCC1-1"])
+
+        with self.assertRaises(ValueError):
+            timetabling.index_constraints()
+
+        timetabling.clean_model()
+
+    def test_delta_operations_on_matrix_model(self):
+        courses = {c: d for c, d in self.COURSES.items() if c != "OBG-BCC1-2"}
+
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.remove_class("OBG-BCC1-2"),
+            self.get_sets(courses=courses),
+            timetabling_class=MatrixCourseTimetabling,
+        )
+        self.assertDeltaMatchesRebuild(
+            lambda t: t.add_class("OBG-BCC1-6", self.NEW_COURSE),
+            self.get_sets(courses={**self.COURSES, "OBG-BCC1-6": self.NEW_COURSE}),
+            timetabling_class=MatrixCourseTimetabling,
+        )
+
+    def test_delta_operations_on_cached_model(self):
+        courses = {c: d for c, d in self.COURSES.items() if c != "OBG-BCC1-2"}
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ModelCache(directory, max_bytes=10**9, max_age=3600)
+            built = self.build(self.get_sets(), sparse=True)
+            key = cache.get_key(built)
+            cache.save(built, key)
+            built.clean_model()
+
+            timetabling = CourseTimetabling(**self.get_sets(), sparse=True)
+            self.assertTrue(cache.load(timetabling, key))
+            timetabling.remove_class("OBG-BCC1-2")
+            timetabling.optimize()
+
+        rebuilt = self.build(self.get_sets(courses=courses), sparse=True)
+
+        self.assertEqual(timetabling.model.NumConstrs, rebuilt.model.NumConstrs)
+        self.assertAlmostEqual(timetabling.model.ObjVal, rebuilt.model.ObjVal)
+        self.assertEqual(set(timetabling.X.keys()), set(rebuilt.X.keys()))
+
+        timetabling.clean_model()
+        rebuilt.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
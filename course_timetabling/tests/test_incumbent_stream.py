@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import build, get_sets
+from utils.presolve import presolve
+from utils.solver_backend import SolverResult
+from utils.utils import save_results_to_csv
+
+
+class TestIncumbentStream(unittest.TestCase):
+
+    def test_results_file_is_replaced_atomically(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "timeschedule.csv")
+            save_results_to_csv([["IC", "BCC1", "Prof1"]], filename)
+
+            with self.assertRaises(Exception):
+                save_results_to_csv([["IC", "BCC1", "Prof2"], 5], filename)
+
+            with open(filename) as file:
+                self.assertEqual(file.read().strip(), "IC;BCC1;Prof1")
+            self.assertEqual(os.listdir(directory), ["timeschedule.csv"])
+
+    def test_results_file_is_readable_by_others(self):
+        umask = os.umask(0o022)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                filename = os.path.join(directory, "timeschedule.csv")
+                save_results_to_csv([["IC", "BCC1", "Prof1"]], filename)
+
+                self.assertEqual(os.stat(filename).st_mode & 0o777, 0o644)
+        finally:
+            os.umask(umask)
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_every_incumbent_is_written(self, mock_treat_and_save_results):
+        timetabling = build(get_sets(), sparse=True)
+
+        with patch("settings.STREAM_INCUMBENTS", True):
+            timetabling.optimize()
+
+        self.assertGreaterEqual(mock_treat_and_save_results.call_count, 1)
+        last_solution, courses = mock_treat_and_save_results.call_args.args
+        self.assertEqual(last_solution, timetabling.extract_solution())
+        self.assertIs(courses, timetabling.courses)
+
+        timetabling.clean_model()
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_best_solution_is_kept_when_the_time_limit_is_hit(
+        self, mock_treat_and_save_results
+    ):
+        timetabling = build(get_sets(), sparse=True)
+        timetabling.optimize()
+        timetabling.result = timetabling.result._replace(status=GRB.TIME_LIMIT)
+
+        solution, objective = timetabling.generate_results()
+
+        self.assertEqual(solution, timetabling.extract_solution())
+        self.assertEqual(objective, timetabling.result.objective)
+
+        timetabling.result = SolverResult(GRB.TIME_LIMIT, float("nan"))
+        with self.assertRaises(Exception):
+            timetabling.generate_results()
+
+        timetabling.clean_model()
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_presolved_incumbents_are_mapped_back(self, mock_treat_and_save_results):
+        sets = get_sets(professors=("Prof1", "Prof2", "Prof4"))
+        presolved = presolve(sets)
+        self.assertIn("Prof4", presolved.removed_professors)
+
+        timetabling = build(presolved.sets, sparse=True)
+        timetabling.presolved = presolved
+
+        with patch("settings.STREAM_INCUMBENTS", True):
+            timetabling.optimize()
+
+        last_solution, courses = mock_treat_and_save_results.call_args.args
+        expected, _ = presolved.postsolve(
+            timetabling.extract_solution(), timetabling.result.objective
+        )
+        self.assertEqual(last_solution, expected)
+        self.assertIn("Prof4", [s.professor for s in last_solution.permanent_shortfall])
+        self.assertIs(courses, sets["courses"])
+
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
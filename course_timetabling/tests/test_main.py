@@ -5,14 +5,14 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from settings import DUMMY_COEFFICIENT
+from settings import DUMMY_COEFFICIENT, ConflictMode
 from main import CourseTimetabling
+from utils.solution import Allocation, CreditShortfall
 
 
 class TestInitializeVariablesAndCoefficients(unittest.TestCase):
 
-    @patch("utils.utils.get_course_schedule")
-    def setUp(self, mock_get_schedule) -> None:
+    def setUp(self) -> None:
         patch("utils.utils.save_results_to_csv").start()
 
         professor_permanent = {
@@ -53,10 +53,6 @@ class TestInitializeVariablesAndCoefficients(unittest.TestCase):
                 "course_type": "OBG",
             },
         }
-        mock_get_schedule.side_effect = lambda courses, course: (
-            ("SEG", "13:00-15:00") if course == "OBG-BCC1-1" else ("TER", "15:00-17:00")
-        )
-
         self.timetabling = CourseTimetabling(
             self.PROFESSORS,
             professor_permanent,
@@ -117,6 +113,15 @@ class TestInitializeVariablesAndCoefficients(unittest.TestCase):
         self.assertIn("OBG-BCC1-1", self.timetabling.X_variables["DUMMY"])
         self.assertIn("OBG-BCC1-2", self.timetabling.X_variables["DUMMY"])
 
+    def test_schedule_index_matches_courses(self):
+        self.assertEqual(set(self.timetabling.schedule_index), set(self.COURSES))
+
+        for course, details in self.COURSES.items():
+            schedule = self.timetabling.schedule_index[course]
+            self.assertEqual(schedule.day, details["day"])
+            self.assertEqual(schedule.time, details["time"])
+            self.assertEqual(schedule.credits, details["credits"])
+
 
 class TestAddCreditSlackVariables(unittest.TestCase):
 
@@ -223,12 +228,12 @@ class TestModelCourseTimetabling(unittest.TestCase):
         result, result_value = timetabling.generate_results()
 
         expected_result = [
-            "Adriana Vivacqua_OBG-BCC1-1_SEG,QUA_13:00-15:00,08:00-10:00/1.0",
-            "Daniel Sadoc_OBG-BCC1-2_TER,QUI_15:00-17:00/1.0",
+            Allocation("Adriana Vivacqua", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00,08:00-10:00"),
+            Allocation("Daniel Sadoc", "OBG-BCC1-2", "TER,QUI", "15:00-17:00"),
         ]
 
         for item in expected_result:
-            self.assertIn(item, result)
+            self.assertIn(item, result.allocations)
 
         self.assertLessEqual(result_value, 0)
 
@@ -271,12 +276,12 @@ class TestModelCourseTimetabling(unittest.TestCase):
         result, result_value = timetabling.generate_results()
 
         expected_result = [
-            "DUMMY_OBG-BCC1-1_SEG,QUA_13:00-15:00,08:00-10:00/1.0",
-            "DUMMY_OBG-BCC1-2_TER,QUI_15:00-17:00/1.0",
+            Allocation("DUMMY", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00,08:00-10:00"),
+            Allocation("DUMMY", "OBG-BCC1-2", "TER,QUI", "15:00-17:00"),
         ]
 
         for item in expected_result:
-            self.assertIn(item, result)
+            self.assertIn(item, result.allocations)
 
         self.assertLessEqual(result_value, 0)
 
@@ -298,16 +303,252 @@ class TestModelCourseTimetabling(unittest.TestCase):
         result, result_value = timetabling.generate_results()
 
         expected_result = [
-            "Adriana Vivacqua_OBG-BCC1-1_SEG,QUA_13:00-15:00,08:00-10:00/1.0",
-            "Daniel Sadoc_OBG-BCC1-2_TER,QUI_15:00-17:00/1.0",
-            "DUMMY_OPT-BCC1-3_NÃO DEFINIDO_NÃO DEFINIDO/1.0",  # FIXME não quero ter professor dummy associados a eletivas, adicionar restrição para que as eletivas não sejam obrigatórias
-            "PCB_Adriana Vivacqua/4.0",
-            "PCB_Daniel Sadoc/4.0",
+            Allocation("Adriana Vivacqua", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00,08:00-10:00"),
+            Allocation("Daniel Sadoc", "OBG-BCC1-2", "TER,QUI", "15:00-17:00"),
+            Allocation("DUMMY", "OPT-BCC1-3", "NÃO DEFINIDO", "NÃO DEFINIDO"),  # FIXME não quero ter professor dummy associados a eletivas, adicionar restrição para que as eletivas não sejam obrigatórias
+        ]
+        expected_shortfall = [
+            CreditShortfall("Adriana Vivacqua", 4.0),
+            CreditShortfall("Daniel Sadoc", 4.0),
         ]
 
-        self.assertEqual(result, expected_result)
+        self.assertEqual(list(result.allocations), expected_result)
+        self.assertEqual(list(result.permanent_shortfall), expected_shortfall)
         self.assertLessEqual(result_value, 0)
 
 
+class TestSparseModel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.PERMANENT_PROFESSORS = {
+            "Prof1": {
+                "qualified_courses": ["ICP131"],
+                "expertise": ["ED"],
+                "category": "PP",
+            },
+            "Prof2": {
+                "qualified_courses": ["ICP132"],
+                "expertise": ["CD"],
+                "category": "PP",
+            },
+        }
+        self.SUBSTITUTE_PROFESSORS = {
+            "Prof3": {
+                "qualified_courses": [],
+                "expertise": [],
+                "category": "PS",
+            },
+        }
+        self.PROFESSORS = {
+            **self.PERMANENT_PROFESSORS,
+            **self.SUBSTITUTE_PROFESSORS,
+            "DUMMY": {
+                "qualified_courses": ["*"],
+                "expertise": ["*"],
+                "category": "DUMMY",
+            },
+        }
+        self.COURSES = {
+            "OBG-BCC1-1": {
+                "course_id": "ICP131",
+                "credits": 4,
+                "day": "SEG,QUA",
+                "time": "13:00-15:00",
+                "course_type": "OBG",
+            },
+            "OBG-BCC1-2": {
+                "course_id": "ICP132",
+                "credits": 4,
+                "day": "SEG,QUA",
+                "time": "13:00-15:00",
+                "course_type": "OBG",
+            },
+            "SVC-EM1-3": {
+                "course_id": "ICP114",
+                "credits": 4,
+                "day": "TER,QUI",
+                "time": "08:00-10:00",
+                "course_type": "SVC",
+            },
+            "OPT-BCC1-4": {
+                "course_id": "ICP999",
+                "credits": 4,
+                "day": "SEX",
+                "time": "10:00-12:00",
+                "course_type": "OPT",
+            },
+        }
+        self.MANUAL_ALLOCATION = {
+            "OPT-BCC1-4": {
+                "professor": "Prof2",
+                "day": "SEX",
+                "time": "10:00-12:00",
+                "course_type": "OPT",
+            },
+        }
+
+        return super().setUp()
+
+    def build(self, sparse, conflict_mode=ConflictMode.PAIRWISE.value):
+        timetabling = CourseTimetabling(
+            self.PROFESSORS,
+            self.PERMANENT_PROFESSORS,
+            self.SUBSTITUTE_PROFESSORS,
+            self.COURSES,
+            self.MANUAL_ALLOCATION,
+            sparse=sparse,
+            conflict_mode=conflict_mode,
+        )
+        timetabling.initialize_variables_and_coefficients()
+        timetabling.add_credit_slack_variables()
+        timetabling.add_constraints()
+        timetabling.set_objective()
+        timetabling.optimize()
+
+        return timetabling
+
+    def test_only_creates_variables_for_eligible_courses(self):
+        timetabling = self.build(sparse=True)
+
+        self.assertEqual(
+            set(timetabling.X_variables["Prof1"]), {"OBG-BCC1-1", "SVC-EM1-3"}
+        )
+        self.assertEqual(
+            set(timetabling.X_variables["Prof2"]),
+            {"OBG-BCC1-2", "SVC-EM1-3", "OPT-BCC1-4"},
+        )
+        self.assertEqual(set(timetabling.X_variables["Prof3"]), {"SVC-EM1-3"})
+        self.assertEqual(set(timetabling.X_variables["DUMMY"]), set(self.COURSES))
+
+        timetabling.clean_model()
+
+    def test_variables_are_stored_flat_by_professor_and_course(self):
+        timetabling = self.build(sparse=True)
+
+        self.assertIn(("Prof1", "OBG-BCC1-1"), timetabling.X)
+        self.assertNotIn(("Prof1", "OBG-BCC1-2"), timetabling.X)
+        self.assertEqual(timetabling.X.sum("*", "OBG-BCC1-1").size(), 2)
+        self.assertEqual(
+            timetabling.X["Prof1", "OBG-BCC1-1"].VarName,
+            "Prof1_OBG-BCC1-1_SEG,QUA_13:00-15:00",
+        )
+        self.assertIs(
+            timetabling.X_variables["Prof1"]["OBG-BCC1-1"]["SEG,QUA"]["13:00-15:00"],
+            timetabling.X["Prof1", "OBG-BCC1-1"],
+        )
+
+        timetabling.clean_model()
+
+    def test_partially_overlapping_courses_are_not_allocated_to_same_professor(self):
+        self.COURSES["OBG-BCC1-2"]["course_id"] = "ICP131"
+        self.COURSES["OBG-BCC1-2"]["credits"] = 2
+        self.COURSES["OBG-BCC1-2"]["time"] = "14:00-16:00"
+
+        for conflict_mode in ConflictMode:
+            with self.subTest(conflict_mode=conflict_mode.value):
+                timetabling = self.build(
+                    sparse=True, conflict_mode=conflict_mode.value
+                )
+
+                allocated = [
+                    course
+                    for course in ("OBG-BCC1-1", "OBG-BCC1-2")
+                    if timetabling.get_variable("Prof1", course).X > 0.5
+                ]
+                self.assertEqual(len(allocated), 1)
+
+                timetabling.clean_model()
+
+    def test_objective_coefficients_are_set_on_the_variables(self):
+        timetabling = self.build(sparse=True)
+
+        self.assertEqual(timetabling.X["Prof1", "OBG-BCC1-1"].Obj, 100)
+        self.assertEqual(timetabling.X["DUMMY", "OBG-BCC1-1"].Obj, DUMMY_COEFFICIENT)
+        self.assertLess(timetabling.PP_slack_variables["Prof1"].Obj, 0)
+
+        timetabling.update_objective_coefficients(EAP={("Prof1", "OBG-BCC1-1"): 1})
+        timetabling.model.update()
+
+        self.assertEqual(timetabling.EAP["Prof1", "OBG-BCC1-1"], 1)
+        self.assertEqual(timetabling.X["Prof1", "OBG-BCC1-1"].Obj, 1)
+
+        timetabling.clean_model()
+
+    def test_reweighting_only_updates_coefficients(self):
+        timetabling = self.build(sparse=True)
+        timetabling.update_objective_coefficients(weight_factor_PP=0, weight_factor_PS=0)
+        timetabling.optimize()
+
+        with patch("settings.WEIGHT_FACTOR_PP", 0), patch(
+            "settings.WEIGHT_FACTOR_PS", 0
+        ):
+            rebuilt = self.build(sparse=True)
+
+        self.assertAlmostEqual(timetabling.model.ObjVal, rebuilt.model.ObjVal)
+
+        timetabling.clean_model()
+        rebuilt.clean_model()
+
+    def test_sparse_model_is_equivalent_to_dense_model(self):
+        dense = self.build(sparse=False)
+        sparse = self.build(sparse=True)
+
+        self.assertLess(sparse.model.NumVars, dense.model.NumVars)
+        self.assertAlmostEqual(sparse.model.ObjVal, dense.model.ObjVal)
+
+        dense.clean_model()
+        sparse.clean_model()
+
+    def test_clique_conflicts_are_equivalent_to_pairwise_conflicts(self):
+        self.COURSES["OBG-BCC1-2"]["course_id"] = "ICP131"
+        self.COURSES["OBG-BCC1-2"]["time"] = "14:00-16:00"
+
+        pairwise = self.build(sparse=True)
+        clique = self.build(sparse=True, conflict_mode=ConflictMode.CLIQUE.value)
+
+        self.assertAlmostEqual(clique.model.ObjVal, pairwise.model.ObjVal)
+
+        pairwise.clean_model()
+        clique.clean_model()
+
+    def test_lazy_conflicts_are_equivalent_to_pairwise_conflicts(self):
+        self.COURSES["OBG-BCC1-2"]["course_id"] = "ICP131"
+        self.COURSES["OBG-BCC1-2"]["time"] = "14:00-16:00"
+
+        pairwise = self.build(sparse=True)
+        lazy = self.build(sparse=True, conflict_mode=ConflictMode.LAZY.value)
+
+        self.assertFalse(
+            [c for c in lazy.model.getConstrs() if c.ConstrName.startswith("RNG4")]
+        )
+        self.assertGreaterEqual(lazy.lazy_cuts, 1)
+        self.assertAlmostEqual(lazy.model.ObjVal, pairwise.model.ObjVal)
+        self.assertLessEqual(
+            lazy.get_variable("Prof1", "OBG-BCC1-1").X
+            + lazy.get_variable("Prof1", "OBG-BCC1-2").X,
+            1.5,
+        )
+
+        pairwise.clean_model()
+        lazy.clean_model()
+
+    def test_lazy_conflicts_need_gurobi_callbacks(self):
+        timetabling = CourseTimetabling(
+            self.PROFESSORS,
+            self.PERMANENT_PROFESSORS,
+            self.SUBSTITUTE_PROFESSORS,
+            self.COURSES,
+            self.MANUAL_ALLOCATION,
+            sparse=True,
+            conflict_mode=ConflictMode.LAZY.value,
+            backend="highs",
+        )
+
+        with self.assertRaises(ValueError):
+            timetabling.optimize()
+
+        timetabling.clean_model()
+
+
 if __name__ == "__main__":
     unittest.main()
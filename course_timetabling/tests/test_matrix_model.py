@@ -0,0 +1,99 @@
+import unittest
+from collections import Counter
+from itertools import product
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from matrix_model import MatrixCourseTimetabling
+from utils.profiler import get_constraint_family
+from fixtures import build, get_sets
+
+
+class TestMatrixCourseTimetabling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.SETS = get_sets(
+            professors=("Prof1", "Prof2", "Prof3"),
+            courses=(
+                "OBG-BCC1-1",
+                "OBG-BCC1-2",
+                "OBG-BCC1-3",
+                "SVC-EM1-4",
+                "OPT-BCC1-5",
+            ),
+            manual_allocation={"OPT-BCC1-5": "Prof1"},
+        )
+
+        return super().setUp()
+
+    def build(self, timetabling_class, sparse, conflict_mode="pairwise"):
+        return build(
+            self.SETS,
+            timetabling_class,
+            optimize=True,
+            sparse=sparse,
+            conflict_mode=conflict_mode,
+        )
+
+    def count_constraint_families(self, timetabling) -> Counter:
+        return Counter(
+            get_constraint_family(constraint.ConstrName)
+            for constraint in timetabling.model.getConstrs()
+        )
+
+    def test_matrix_model_is_equivalent_to_term_model(self):
+        for sparse, conflict_mode in product(
+            (False, True), ("pairwise", "clique", "lazy")
+        ):
+            with self.subTest(sparse=sparse, conflict_mode=conflict_mode):
+                term = self.build(CourseTimetabling, sparse, conflict_mode)
+                matrix = self.build(MatrixCourseTimetabling, sparse, conflict_mode)
+
+                self.assertEqual(matrix.model.NumVars, term.model.NumVars)
+                self.assertEqual(matrix.model.NumConstrs, term.model.NumConstrs)
+                self.assertEqual(
+                    self.count_constraint_families(matrix),
+                    self.count_constraint_families(term),
+                )
+                self.assertAlmostEqual(matrix.model.ObjVal, term.model.ObjVal)
+
+                term.clean_model()
+                matrix.clean_model()
+
+    def test_keeps_variables_and_coefficients_by_professor_and_course(self):
+        timetabling = self.build(MatrixCourseTimetabling, sparse=True)
+
+        self.assertEqual(
+            set(timetabling.X_variables["Prof1"]),
+            {"OBG-BCC1-1", "SVC-EM1-4", "OPT-BCC1-5"},
+        )
+        self.assertEqual(
+            timetabling.EAP_coefficient["Prof1"]["OBG-BCC1-1"]["SEG,QUA"][
+                "13:00-15:00"
+            ],
+            100,
+        )
+        self.assertEqual(
+            timetabling.EAP_coefficient["Prof3"]["SVC-EM1-4"]["TER,QUI"]["08:00-10:00"],
+            10,
+        )
+        self.assertEqual(timetabling.credits.tolist(), [4, 4, 2, 4, 4])
+
+        timetabling.clean_model()
+
+    def test_conflict_incidence_is_computed_once_for_all_professors(self):
+        timetabling = self.build(MatrixCourseTimetabling, sparse=False)
+
+        slot_incidence, conflict_incidence = timetabling.get_conflict_incidence()
+
+        self.assertEqual(slot_incidence.shape[1], len(self.SETS["courses"]))
+        self.assertTrue((conflict_incidence.getnnz(axis=1) == 2).all())
+
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
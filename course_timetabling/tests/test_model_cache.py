@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from utils.model_cache import ModelCache, get_input_hash
+from fixtures import COURSES, build, get_course, get_professor, get_sets
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Nomes com espaço e sublinhado, que o MPS não guarda
+        self.SETS = get_sets(
+            professors={
+                "Adriana Vivacqua": get_professor(["ICP131"]),
+                "João_Silva": get_professor(["ICP132"], category="PS"),
+            },
+            courses={
+                "OBG-BCC1-1": COURSES["OBG-BCC1-1"],
+                "OBG-BCC1-2": get_course("ICP132", "SEG,QUA", "14:00-16:00"),
+                "OBG-BCC1-3": get_course("ICP132", "TER,QUI", "08:00-10:00"),
+            },
+        )
+        self.PROFESSORS = self.SETS["professors"]
+        self.COURSES = self.SETS["courses"]
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ModelCache(self.directory.name, max_bytes=10**9, max_age=3600)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def create(self):
+        return CourseTimetabling(**self.SETS, sparse=True)
+
+    def build(self):
+        return build(self.SETS, sparse=True)
+
+    def test_hash_is_canonical(self):
+        sets = {"courses": self.COURSES, "professors": self.PROFESSORS}
+        reordered = {
+            "professors": dict(reversed(list(self.PROFESSORS.items()))),
+            "courses": self.COURSES,
+        }
+
+        self.assertEqual(get_input_hash(sets), get_input_hash(reordered))
+        self.assertNotEqual(
+            get_input_hash(sets), get_input_hash(sets, {"sparse": True})
+        )
+
+        with patch("settings.WEIGHT_FACTOR_PP", 1):
+            reweighted = get_input_hash(sets)
+        self.assertNotEqual(reweighted, get_input_hash(sets))
+
+    def test_cached_model_is_reloaded_on_hit(self):
+        built = self.build()
+        key = self.cache.get_key(built)
+        self.assertFalse(self.cache.load(self.create(), key))
+
+        self.cache.save(built, key)
+        built.optimize()
+
+        loaded = self.create()
+        self.assertTrue(self.cache.load(loaded, key))
+        loaded.optimize()
+
+        self.assertEqual(loaded.model.NumVars, built.model.NumVars)
+        self.assertEqual(loaded.model.NumConstrs, built.model.NumConstrs)
+        self.assertAlmostEqual(loaded.model.ObjVal, built.model.ObjVal)
+        self.assertEqual(loaded.extract_solution(), built.extract_solution())
+        self.assertEqual(
+            loaded.X["João_Silva", "OBG-BCC1-2"].VarName,
+            built.X["João_Silva", "OBG-BCC1-2"].VarName,
+        )
+        self.assertEqual(
+            loaded.model.getConstrs()[0].ConstrName,
+            built.model.getConstrs()[0].ConstrName,
+        )
+
+        built.clean_model()
+        loaded.clean_model()
+
+    def test_old_and_oversized_entries_are_evicted(self):
+        built = self.build()
+        self.cache.save(built, "old")
+        self.cache.save(built, "recent")
+        built.clean_model()
+
+        two_hours_ago = time.time() - 7200
+        for path in self.cache.get_paths("old"):
+            os.utime(path, (two_hours_ago, two_hours_ago))
+
+        self.cache.evict()
+        self.assertNotIn("old", self.cache)
+        self.assertIn("recent", self.cache)
+
+        self.cache.max_bytes = 0
+        self.cache.evict()
+        self.assertNotIn("recent", self.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import unittest
+from itertools import product
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from matrix_model import MatrixCourseTimetabling
+from utils.presolve import presolve
+from utils.solution import Allocation, CreditShortfall, Solution
+from fixtures import build, get_sets
+
+
+class TestPresolve(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.SETS = get_sets(
+            professors=("Prof1", "Prof2", "Prof4", "Prof3"),
+            courses=(
+                "OBG-BCC1-1",
+                "OBG-BCC1-2",
+                "OBG-BCC1-3",
+                "OBG-BCC1-4",
+                "OPT-BCC1-5",
+            ),
+            manual_allocation={"OPT-BCC1-5": "Prof1"},
+        )
+
+        return super().setUp()
+
+    def solve(self, sets, timetabling_class=CourseTimetabling, sparse=True):
+        timetabling = build(sets, timetabling_class, optimize=True, sparse=sparse)
+
+        solution = timetabling.extract_solution()
+        objective = timetabling.result.objective
+        timetabling.clean_model()
+
+        return solution, objective
+
+    def test_reductions(self):
+        result = presolve(self.SETS)
+
+        self.assertEqual(result.removed_professors, ("Prof4",))
+        self.assertEqual(result.dummy_classes, ("OBG-BCC1-4",))
+        # Prof2 também pode dar a OBG-BCC1-2, mas ela conflita com a OBG-BCC1-1
+        self.assertEqual(result.fixed_allocations, (("OBG-BCC1-3", "Prof3"),))
+        self.assertEqual(result.pruned_dummy_classes, ("OBG-BCC1-1",))
+
+        self.assertNotIn("Prof4", result.sets["professors"])
+        self.assertNotIn("OBG-BCC1-4", result.sets["courses"])
+        self.assertEqual(
+            result.sets["manual_allocation"]["OBG-BCC1-3"]["professor"], "Prof3"
+        )
+        self.assertIn("OBG-BCC1-3 -> Prof3", result.report())
+
+    def test_reduced_model_has_the_same_optimal_value(self):
+        result = presolve(self.SETS)
+
+        for timetabling_class, sparse in product(
+            (CourseTimetabling, MatrixCourseTimetabling), (False, True)
+        ):
+            with self.subTest(builder=timetabling_class.__name__, sparse=sparse):
+                _, objective = self.solve(self.SETS, timetabling_class, sparse)
+                reduced_solution, reduced_objective = self.solve(
+                    result.sets, timetabling_class, sparse
+                )
+
+                solution, postsolved_objective = result.postsolve(
+                    reduced_solution, reduced_objective
+                )
+
+                self.assertAlmostEqual(postsolved_objective, objective)
+                self.assertEqual(
+                    sorted(a.course_class_id for a in solution.allocations),
+                    sorted(self.SETS["courses"]),
+                )
+                self.assertIn(
+                    CreditShortfall("Prof4", 8.0), solution.permanent_shortfall
+                )
+
+    def test_pruned_dummy_variable_is_not_created(self):
+        result = presolve(self.SETS)
+        timetabling = CourseTimetabling(**result.sets, sparse=True)
+        timetabling.initialize_variables_and_coefficients()
+
+        self.assertNotIn(("DUMMY", "OBG-BCC1-1"), timetabling.X)
+        self.assertIn(("DUMMY", "OBG-BCC1-2"), timetabling.X)
+
+        timetabling.clean_model()
+
+    def test_start_is_mapped_to_the_reduced_sets(self):
+        result = presolve(self.SETS)
+        previous_solution = Solution(
+            (
+                Allocation("Prof1", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00"),
+                Allocation("DUMMY", "OBG-BCC1-4", "TER,QUI", "08:00-10:00"),
+                Allocation("Prof4", "OBG-BCC1-2", "SEG,QUA", "13:00-15:00"),
+                Allocation("Prof2", "OBG-BCC1-3", "SEG", "13:00-15:00"),
+            )
+        )
+
+        start, unmapped = result.map_start(previous_solution)
+
+        self.assertEqual(start.allocations, previous_solution.allocations[:1])
+        self.assertEqual(
+            [reason for _, reason in unmapped],
+            [
+                "class removed by presolve",
+                "professor removed by presolve",
+                "class fixed by presolve to another professor",
+            ],
+        )
+
+        timetabling = build(result.sets, sparse=True)
+        timetabling.model.update()
+        self.assertEqual(timetabling.set_start(start), [])
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from utils.profiler import Profiler, get_constraint_family, get_model_statistics
+from fixtures import get_sets
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timetabling = CourseTimetabling(
+            **get_sets(
+                professors=("Prof1", "Prof3"),
+                courses=("OBG-BCC1-1", "OBG-BCC1-3"),
+                manual_allocation={"OBG-BCC1-1": "Prof1"},
+            )
+        )
+        self.timetabling.initialize_variables_and_coefficients()
+        self.timetabling.add_credit_slack_variables()
+        self.timetabling.add_constraints()
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.timetabling.clean_model()
+        return super().tearDown()
+
+    def test_constraint_family_is_read_from_name(self):
+        self.assertEqual(get_constraint_family("RNG4_Prof1_G0"), "RNG4")
+        self.assertEqual(get_constraint_family("RNP1[3]"), "RNP1")
+        self.assertEqual(get_constraint_family("R12"), "other")
+
+    def test_model_statistics_by_family(self):
+        statistics = get_model_statistics(self.timetabling)
+
+        self.assertEqual(statistics["variables"], 8)
+        self.assertEqual(
+            statistics["variables_by_family"], {"X": 6, "PCB": 1, "PSB": 1}
+        )
+
+        families = statistics["constraints_by_family"]
+        self.assertEqual(
+            set(families),
+            {"RNP1", "RNG1", "RNG2", "RNP2", "RNP3", "RNG3", "RNG4", "RNG5"},
+        )
+        self.assertEqual(families["RNP1"], {"constraints": 1, "nonzeros": 1})
+        self.assertEqual(families["RNG3"], {"constraints": 2, "nonzeros": 6})
+        self.assertEqual(
+            sum(family["constraints"] for family in families.values()),
+            statistics["constraints"],
+        )
+        self.assertEqual(
+            sum(family["nonzeros"] for family in families.values()),
+            statistics["nonzeros"],
+        )
+
+    def test_report_has_one_span_per_phase(self):
+        profiler = Profiler()
+
+        with profiler.phase("set_objective"):
+            self.timetabling.set_objective()
+        with profiler.phase("optimize"):
+            self.timetabling.optimize()
+        profiler.record_model_statistics(self.timetabling)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "profile.json")
+            profiler.save(filename)
+
+            with open(filename) as file:
+                report = json.load(file)
+
+        self.assertEqual(
+            [phase["phase"] for phase in report["phases"]],
+            ["set_objective", "optimize"],
+        )
+        self.assertGreater(report["peak_rss_bytes"], 0)
+        self.assertIn("RNG4", report["model"]["constraints_by_family"])
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler(enabled=False)
+
+        with profiler.phase("set_objective"):
+            self.timetabling.set_objective()
+        profiler.record_model_statistics(self.timetabling)
+
+        self.assertEqual(profiler.phases, [])
+        self.assertEqual(profiler.statistics, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gurobipy import GRB
+
+import main
+from utils.result_cache import ResultCache
+from utils.solver_backend import GurobiBackend
+from utils.solution import Allocation, CreditShortfall, Solution
+from fixtures import get_course, get_sets
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # main.main escreve os resultados, que precisam de todos os campos da turma
+        self.SETS = get_sets(
+            professors=("Prof1",),
+            courses={
+                "OBG-BCC1-1": get_course(
+                    "ICP131",
+                    "SEG,QUA",
+                    "13:00-15:00",
+                    course_name="Programação de Computadores I",
+                    class_type="Graduação",
+                    capacity=40,
+                    responsable_institute="IC",
+                    graduation_course="BCC",
+                    classroom_type="Sala",
+                    term=1,
+                ),
+            },
+        )
+        self.SOLUTION = Solution(
+            allocations=(Allocation("Prof1", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00"),),
+            permanent_shortfall=(CreditShortfall("Prof1", 4.0),),
+        )
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name, max_entries=2)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def get_key(self):
+        return self.cache.get_key(self.SETS, main.CourseTimetabling, False, "pairwise")
+
+    def test_stored_result_is_returned(self):
+        key = self.get_key()
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.put(key, self.SOLUTION, 376.0)
+
+        self.assertEqual(self.cache.get(key), (self.SOLUTION, 376.0))
+
+    def test_solver_parameters_change_the_key(self):
+        key = self.get_key()
+
+        with patch("settings.SOLVER_PARAMETERS", {"MIPGap": 0.1}):
+            self.assertNotEqual(self.get_key(), key)
+
+    def test_warm_start_changes_the_key(self):
+        key = self.get_key()
+        path = os.path.join(self.directory.name, "timeschedule.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("a")
+
+        warm_start_key = self.cache.get_key(
+            self.SETS, main.CourseTimetabling, False, "pairwise", path
+        )
+        self.assertNotEqual(warm_start_key, key)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("b")
+
+        self.assertNotEqual(
+            self.cache.get_key(
+                self.SETS, main.CourseTimetabling, False, "pairwise", path
+            ),
+            warm_start_key,
+        )
+
+    def test_entry_is_written_atomically(self):
+        with patch("json.dump", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.cache.put("a", self.SOLUTION, 0.0)
+
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+        self.cache.put("a", self.SOLUTION, 0.0)
+        self.assertEqual(os.listdir(self.directory.name), ["a.json"])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for i, key in enumerate(("a", "b")):
+            self.cache.put(key, self.SOLUTION, 0.0)
+            os.utime(self.cache.get_path(key), (time.time() - 10 + i,) * 2)
+
+        self.cache.get("a")
+        self.cache.put("c", self.SOLUTION, 0.0)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    @patch("utils.utils.save_results_to_csv")
+    def test_repeated_run_does_not_start_gurobi(self, mock_save_results_to_csv):
+        with patch("main.get_sets", return_value=self.SETS), patch(
+            "main.ResultCache", return_value=self.cache
+        ), patch("settings.RESULT_CACHE", True):
+            solution, objective = main.main()
+
+            with patch.object(
+                main.CourseTimetabling, "init_environment"
+            ) as mock_init_environment:
+                cached_solution, cached_objective = main.main()
+                mock_init_environment.assert_not_called()
+
+            with patch.object(
+                main.CourseTimetabling,
+                "init_environment",
+                side_effect=RuntimeError("solved"),
+            ):
+                with self.assertRaises(RuntimeError):
+                    main.main(force=True)
+
+        self.assertEqual(cached_solution, solution)
+        self.assertEqual(cached_objective, objective)
+
+    @patch("utils.utils.save_results_to_csv")
+    def test_stopped_solve_is_not_stored(self, mock_save_results_to_csv):
+        solve = GurobiBackend.solve
+
+        def stopped(backend, *args, **kwargs):
+            return solve(backend, *args, **kwargs)._replace(status=GRB.TIME_LIMIT)
+
+        with patch("main.get_sets", return_value=self.SETS), patch(
+            "main.ResultCache", return_value=self.cache
+        ), patch("settings.RESULT_CACHE", True), patch.object(
+            GurobiBackend, "solve", stopped
+        ):
+            main.main()
+
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
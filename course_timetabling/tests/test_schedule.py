@@ -0,0 +1,121 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from utils.schedule import (
+    CourseSchedule,
+    build_schedule_index,
+    parse_schedule_slots,
+)
+from utils.timeslot import schedule_mask
+
+
+class TestParseScheduleSlots(TestCase):
+    def test_same_time_for_every_day(self):
+        self.assertEqual(
+            parse_schedule_slots("TER,QUI", "08:00-10:00"),
+            (("TER", "08:00-10:00"), ("QUI", "08:00-10:00")),
+        )
+
+    def test_every_time_on_a_single_day(self):
+        self.assertEqual(
+            parse_schedule_slots("SEG", "10:00-12:00,13:00-15:00"),
+            (("SEG", "10:00-12:00"), ("SEG", "13:00-15:00")),
+        )
+
+    def test_days_and_times_paired_by_position(self):
+        self.assertEqual(
+            parse_schedule_slots("SEG,QUA,SEX", "13:00-15:00,13:00-15:00,08:00-10:00"),
+            (
+                ("SEG", "13:00-15:00"),
+                ("QUA", "13:00-15:00"),
+                ("SEX", "08:00-10:00"),
+            ),
+        )
+
+    def test_mismatched_days_and_times_use_cross_product(self):
+        self.assertEqual(
+            parse_schedule_slots("SEG,QUA,SEX", "08:00-10:00,10:00-12:00"),
+            (
+                ("SEG", "08:00-10:00"),
+                ("SEG", "10:00-12:00"),
+                ("QUA", "08:00-10:00"),
+                ("QUA", "10:00-12:00"),
+                ("SEX", "08:00-10:00"),
+                ("SEX", "10:00-12:00"),
+            ),
+        )
+
+    def test_undefined_schedule_has_no_slots(self):
+        self.assertEqual(parse_schedule_slots(None, None), ())
+        self.assertEqual(parse_schedule_slots("", "08:00-10:00"), ())
+
+
+class TestBuildScheduleIndex(TestCase):
+    def setUp(self) -> None:
+        self.courses = {
+            "OBG-BCC1-1": {
+                "course_id": "ICP131",
+                "credits": 4,
+                "day": "SEG,QUA",
+                "time": "13:00-15:00,08:00-10:00",
+                "course_type": "OBG",
+            },
+            "OBG-BCC1-2": {
+                "course_id": "ICP123",
+                "credits": 2,
+                "day": "TER",
+                "time": "15:00-17:00",
+                "course_type": "OBG",
+            },
+            "OPT-BCC1-3": {
+                "course_id": "IPCXXX",
+                "credits": 4,
+                "day": "NÃO DEFINIDO",
+                "time": "NÃO DEFINIDO",
+                "course_type": "OPT",
+            },
+        }
+        return super().setUp()
+
+    def test_index_matches_courses(self):
+        index = build_schedule_index(self.courses)
+
+        self.assertEqual(set(index), set(self.courses))
+        for course_class_id, details in self.courses.items():
+            schedule = index[course_class_id]
+            self.assertEqual(schedule.day, details["day"])
+            self.assertEqual(schedule.time, details["time"])
+            self.assertEqual(schedule.credits, details["credits"])
+            self.assertEqual(
+                schedule.slots, parse_schedule_slots(details["day"], details["time"])
+            )
+            self.assertEqual(schedule.mask, schedule_mask(schedule.slots))
+
+        self.assertEqual(
+            index["OBG-BCC1-1"],
+            CourseSchedule(
+                day="SEG,QUA",
+                time="13:00-15:00,08:00-10:00",
+                credits=4,
+                slots=(("SEG", "13:00-15:00"), ("QUA", "08:00-10:00")),
+                mask=schedule_mask((("SEG", "13:00-15:00"), ("QUA", "08:00-10:00"))),
+            ),
+        )
+
+    def test_index_is_immutable(self):
+        index = build_schedule_index(self.courses)
+
+        with self.assertRaises(TypeError):
+            index["OBG-BCC1-1"] = None
+
+        with self.assertRaises(AttributeError):
+            index["OBG-BCC1-1"].day = "SEX"
+
+
+if __name__ == "__main__":
+    main()
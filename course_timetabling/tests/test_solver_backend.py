@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+from itertools import product
+from unittest.mock import patch
+
+import gurobipy as gp
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import CourseTimetabling
+from matrix_model import MatrixCourseTimetabling
+from fixtures import build, get_sets
+from utils.solver_backend import HighsBackend
+
+
+class TestSolverBackend(unittest.TestCase):
+
+    def solve(self, timetabling_class, backend, sparse, conflict_mode="pairwise"):
+        return build(
+            get_sets(
+                professors=("Prof1", "Prof2", "Prof3"),
+                courses=(
+                    "OBG-BCC1-1",
+                    "OBG-BCC1-2",
+                    "OBG-BCC1-3",
+                    "SVC-EM1-4",
+                    "OPT-BCC1-5",
+                ),
+                manual_allocation={"OPT-BCC1-5": "Prof1"},
+            ),
+            timetabling_class,
+            optimize=True,
+            sparse=sparse,
+            conflict_mode=conflict_mode,
+            backend=backend,
+        )
+
+    def test_backends_agree_on_the_objective(self):
+        for timetabling_class, sparse, conflict_mode in product(
+            (CourseTimetabling, MatrixCourseTimetabling),
+            (False, True),
+            ("pairwise", "clique"),
+        ):
+            with self.subTest(
+                builder=timetabling_class.__name__,
+                sparse=sparse,
+                conflict_mode=conflict_mode,
+            ):
+                gurobi = self.solve(timetabling_class, "gurobi", sparse, conflict_mode)
+                highs = self.solve(timetabling_class, "highs", sparse, conflict_mode)
+
+                self.assertEqual(highs.result.status, GRB.OPTIMAL)
+                self.assertAlmostEqual(highs.result.objective, gurobi.result.objective)
+                self.assertAlmostEqual(gurobi.result.objective, gurobi.model.ObjVal)
+
+                gurobi.clean_model()
+                highs.clean_model()
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_results_are_read_from_the_backend(self, mock_treat_and_save_results):
+        gurobi = self.solve(CourseTimetabling, "gurobi", sparse=True)
+        highs = self.solve(CourseTimetabling, "highs", sparse=True)
+
+        gurobi_solution, _ = gurobi.generate_results()
+        highs_solution, highs_value = highs.generate_results()
+
+        self.assertEqual(highs_value, highs.result.objective)
+        self.assertEqual(
+            highs_solution.permanent_shortfall, gurobi_solution.permanent_shortfall
+        )
+        self.assertIn(
+            ("Prof1", "OPT-BCC1-5"),
+            [(a.professor, a.course_class_id) for a in highs_solution.allocations],
+        )
+
+        gurobi.clean_model()
+        highs.clean_model()
+
+    def test_infeasible_model_status(self):
+        model = gp.Model()
+        x = model.addVar(vtype=GRB.BINARY)
+        model.addConstr(x >= 2)
+
+        result = HighsBackend().solve(model, {})
+
+        self.assertEqual(result.status, GRB.INFEASIBLE)
+        self.assertEqual(result.values, ())
+
+        model.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import math
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+from gurobipy import GRB
+
+import settings
+from utils.solver_backend import GurobiBackend
+from fixtures import COURSES, get_course, get_sets
+from sweep import get_thread_budget, parse_grid, run_sweep, solve_scenario
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Duas turmas de ICP131 no mesmo horário, Prof1 só pode dar uma
+        self.SETS = get_sets(
+            professors=("Prof1",),
+            courses={
+                "OBG-BCC1-1": COURSES["OBG-BCC1-1"],
+                "OBG-BCC1-2": get_course("ICP131", "SEG,QUA", "13:00-15:00"),
+            },
+        )
+
+        return super().setUp()
+
+    def test_grid_is_expanded_with_the_setting_types(self):
+        scenarios = parse_grid(["WEIGHT_FACTOR_PP=10,100", "MIN_CREDITS_PERMANENT=4,8"])
+
+        self.assertEqual(len(scenarios), 4)
+        self.assertEqual(
+            scenarios[0], {"WEIGHT_FACTOR_PP": 10, "MIN_CREDITS_PERMANENT": 4}
+        )
+
+    def test_only_model_settings_can_be_swept(self):
+        with self.assertRaises(ValueError):
+            parse_grid(["APP_LICENSE_ID=1"])
+
+    def test_thread_budget_fits_in_the_cores(self):
+        self.assertEqual(get_thread_budget(4, cores=16), 4)
+        self.assertEqual(get_thread_budget(3, cores=16), 5)
+        self.assertEqual(get_thread_budget(8, cores=4), 1)
+
+    def test_scenario_settings_are_restored(self):
+        weight_factor = settings.WEIGHT_FACTOR_PP
+        solver_parameters = settings.SOLVER_PARAMETERS
+
+        result = solve_scenario(self.SETS, {"WEIGHT_FACTOR_PP": 1}, threads=1)
+
+        self.assertEqual(result["WEIGHT_FACTOR_PP"], 1)
+        self.assertEqual(settings.WEIGHT_FACTOR_PP, weight_factor)
+        self.assertIs(settings.SOLVER_PARAMETERS, solver_parameters)
+
+    def test_scenarios_are_compared(self):
+        results = run_sweep(
+            self.SETS,
+            [{"MIN_CREDITS_PERMANENT": 4}, {"MIN_CREDITS_PERMANENT": 8}],
+            workers=2,
+        )
+
+        # Prof1 só pode dar uma das turmas no mesmo horário, a outra fica com o DUMMY
+        self.assertEqual(results["dummy_allocations"].tolist(), [1, 1])
+        self.assertEqual(results["pcb_total"].tolist(), [0, 4])
+        self.assertAlmostEqual(
+            results["objective"][0] - results["objective"][1],
+            4 * settings.WEIGHT_FACTOR_PP,
+        )
+
+    def test_failed_scenario_keeps_the_others(self):
+        results = run_sweep(
+            self.SETS,
+            [{"MIN_CREDITS_PERMANENT": 4}, {"MIN_CREDITS_PERMANENT": "x"}],
+            workers=2,
+        )
+
+        self.assertEqual(results["status"][0], GRB.OPTIMAL)
+        self.assertTrue(pd.isna(results["error"][0]))
+        self.assertTrue(math.isnan(results["status"][1]))
+        self.assertIn("ValueError", results["error"][1])
+
+    @patch("utils.utils.treat_and_save_results")
+    def test_scenario_does_not_stream_nor_share_telemetry(
+        self, mock_treat_and_save_results
+    ):
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "settings.STREAM_INCUMBENTS", True
+        ), patch("settings.TELEMETRY", True), patch(
+            "settings.TELEMETRY_DIR", directory
+        ):
+            solve_scenario(self.SETS, {"WEIGHT_FACTOR_PP": 10}, threads=1)
+
+            self.assertEqual(
+                os.listdir(os.path.join(directory, "sweep")), ["WEIGHT_FACTOR_PP=10"]
+            )
+            self.assertTrue(settings.STREAM_INCUMBENTS)
+            self.assertEqual(settings.TELEMETRY_DIR, directory)
+
+        mock_treat_and_save_results.assert_not_called()
+
+    def test_stopped_scenario_keeps_its_incumbent(self):
+        solve = GurobiBackend.solve
+
+        def stopped(backend, *args, **kwargs):
+            return solve(backend, *args, **kwargs)._replace(status=GRB.TIME_LIMIT)
+
+        with patch.object(GurobiBackend, "solve", stopped):
+            result = solve_scenario(self.SETS, {}, threads=1)
+
+        self.assertEqual(result["status"], GRB.TIME_LIMIT)
+        self.assertFalse(math.isnan(result["objective"]))
+        self.assertFalse(math.isnan(result["gap"]))
+        self.assertEqual(result["dummy_allocations"], 1)
+
+    def test_model_is_cleaned_when_the_solve_fails(self):
+        with patch("main.CourseTimetabling.optimize", side_effect=RuntimeError), patch(
+            "main.CourseTimetabling.clean_model"
+        ) as clean_model:
+            with self.assertRaises(RuntimeError):
+                solve_scenario(self.SETS, {}, threads=1)
+
+        clean_model.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gurobipy import GRB
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import build, get_sets
+from utils.telemetry import (
+    TelemetryRecorder,
+    get_gap,
+    load_timeline,
+    overlay_timelines,
+)
+
+
+class FakeCallbackModel:
+    """
+    Modelo com os valores de cbGet fixados, para chamar o callback fora do Gurobi.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def cbGet(self, what):
+        return self.values[what]
+
+
+def get_progress(runtime, incumbent, bound, nodes=0, work=0.0):
+    return FakeCallbackModel(
+        {
+            GRB.Callback.RUNTIME: runtime,
+            GRB.Callback.MIP_OBJBST: incumbent,
+            GRB.Callback.MIP_OBJBND: bound,
+            GRB.Callback.MIP_NODCNT: nodes,
+            GRB.Callback.WORK: work,
+        }
+    )
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_gap(self):
+        self.assertEqual(get_gap(100, 110), 0.1)
+        self.assertEqual(get_gap(GRB.INFINITY, 110), float("inf"))
+        self.assertEqual(get_gap(float("nan"), 110), float("inf"))
+        self.assertEqual(get_gap(0, 0), 0.0)
+
+    def test_progress_is_sampled(self):
+        recorder = TelemetryRecorder(min_interval=1.0)
+
+        recorder.callback(get_progress(0.0, -GRB.INFINITY, 200), GRB.Callback.MIP)
+        # Antes do intervalo mínimo
+        recorder.callback(get_progress(0.5, 100, 150), GRB.Callback.MIP)
+        recorder.callback(get_progress(1.5, 100, 150, 10, 0.2), GRB.Callback.MIP)
+        # Sem mudança no incumbente nem no limitante
+        recorder.callback(get_progress(3.0, 100, 150, 20, 0.4), GRB.Callback.MIP)
+        # Outros callbacks são ignorados
+        recorder.callback(get_progress(4.0, 120, 130), GRB.Callback.PRESOLVE)
+
+        self.assertEqual([row["time"] for row in recorder.rows], [0.0, 1.5])
+        self.assertEqual(recorder.rows[0]["gap"], float("inf"))
+        self.assertEqual(recorder.rows[1]["gap"], 0.5)
+        self.assertEqual(recorder.rows[1]["nodes"], 10)
+        self.assertEqual(recorder.rows[1]["work"], 0.2)
+
+    def test_timeline_round_trip(self):
+        recorder = TelemetryRecorder(min_interval=0)
+        recorder.callback(get_progress(0.0, 100, 200), GRB.Callback.MIP)
+        recorder.callback(get_progress(1.0, 150, 160, 5, 0.1), GRB.Callback.MIP)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ("csv", "json"):
+                path = os.path.join(directory, f"run.{extension}")
+                recorder.save(path)
+                timeline = load_timeline(path)
+
+                self.assertEqual(list(timeline["incumbent"]), [100, 150])
+                self.assertEqual(list(timeline["event"]), ["progress", "progress"])
+
+    def test_timelines_are_overlaid(self):
+        first = TelemetryRecorder(min_interval=0)
+        first.callback(get_progress(0.0, 100, 200), GRB.Callback.MIP)
+        first.callback(get_progress(2.0, 200, 200), GRB.Callback.MIP)
+        second = TelemetryRecorder(min_interval=0)
+        second.callback(get_progress(1.0, 150, 200), GRB.Callback.MIP)
+
+        with tempfile.TemporaryDirectory() as directory:
+            first.save(os.path.join(directory, "first.csv"))
+            second.save(os.path.join(directory, "second.json"))
+            overlay = overlay_timelines(
+                [
+                    os.path.join(directory, "first.csv"),
+                    os.path.join(directory, "second.json"),
+                ],
+                "incumbent",
+            )
+
+        self.assertEqual(list(overlay.index), [0.0, 1.0, 2.0])
+        self.assertEqual(list(overlay["first"]), [100, 100, 200])
+        self.assertEqual(list(overlay["second"].iloc[1:]), [150, 150])
+
+    def test_optimize_writes_the_timeline(self):
+        timetabling = build(get_sets(), sparse=True)
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "settings.TELEMETRY", True
+        ), patch("settings.TELEMETRY_DIR", directory):
+            timetabling.optimize()
+
+            (filename,) = os.listdir(directory)
+            timeline = load_timeline(os.path.join(directory, filename))
+
+        final = timeline.iloc[-1]
+        self.assertEqual(final["event"], "final")
+        self.assertAlmostEqual(final["incumbent"], timetabling.result.objective)
+        self.assertAlmostEqual(final["gap"], 0, places=4)
+        self.assertEqual(len(timetabling.telemetry.rows), len(timeline))
+
+        timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from utils.schedule import build_schedule_index, parse_schedule_slots
+from utils.timeslot import (
+    group_courses_by_mask,
+    masks_conflict,
+    parse_time_range,
+    schedule_mask,
+    slot_mask,
+)
+
+
+class TestParseTimeRange(TestCase):
+    def test_parse_time_range(self):
+        self.assertEqual(parse_time_range("13:00-15:00"), (780, 900))
+        self.assertEqual(parse_time_range("18:30 - 20:10"), (1110, 1210))
+
+    def test_invalid_time_range(self):
+        self.assertEqual(parse_time_range("NÃO DEFINIDO"), (0, 0))
+        self.assertEqual(parse_time_range("15:00-13:00"), (0, 0))
+        self.assertEqual(parse_time_range(None), (0, 0))
+
+
+class TestSlotMask(TestCase):
+    def test_same_slot_conflicts(self):
+        self.assertTrue(
+            masks_conflict(
+                slot_mask("SEG", "13:00-15:00"), slot_mask("SEG", "13:00-15:00")
+            )
+        )
+
+    def test_partial_overlap_conflicts(self):
+        self.assertTrue(
+            masks_conflict(
+                slot_mask("SEG", "13:00-15:00"), slot_mask("SEG", "14:00-16:00")
+            )
+        )
+        self.assertTrue(
+            masks_conflict(
+                slot_mask("QUI", "18:30-20:10"), slot_mask("QUI", "20:00-21:50")
+            )
+        )
+
+    def test_adjacent_slots_do_not_conflict(self):
+        self.assertFalse(
+            masks_conflict(
+                slot_mask("SEG", "13:00-15:00"), slot_mask("SEG", "15:00-17:00")
+            )
+        )
+
+    def test_different_days_do_not_conflict(self):
+        self.assertFalse(
+            masks_conflict(
+                slot_mask("SEG", "13:00-15:00"), slot_mask("TER", "13:00-15:00")
+            )
+        )
+
+    def test_unknown_day_or_time_has_empty_mask(self):
+        self.assertEqual(slot_mask("NÃO DEFINIDO", "NÃO DEFINIDO"), 0)
+        self.assertEqual(slot_mask("SEG", "NÃO DEFINIDO"), 0)
+
+
+class TestScheduleMask(TestCase):
+    def test_days_and_times_are_paired_by_position(self):
+        mask = schedule_mask(parse_schedule_slots("SEG,QUA", "13:00-15:00,08:00-10:00"))
+
+        self.assertTrue(masks_conflict(mask, slot_mask("SEG", "14:00-15:00")))
+        self.assertTrue(masks_conflict(mask, slot_mask("QUA", "08:00-09:00")))
+        self.assertFalse(masks_conflict(mask, slot_mask("SEG", "08:00-10:00")))
+        self.assertFalse(masks_conflict(mask, slot_mask("QUA", "13:00-15:00")))
+
+    def test_group_courses_by_mask(self):
+        courses = {
+            "OBG-BCC1-1": {"day": "TER,QUI", "time": "08:00-10:00", "credits": 4},
+            "OBG-BCC1-2": {"day": "TER,QUI", "time": "08:00-10:00", "credits": 4},
+            "OBG-BCC1-3": {"day": "TER", "time": "09:00-11:00", "credits": 2},
+            "OPT-BCC1-4": {
+                "day": "NÃO DEFINIDO",
+                "time": "NÃO DEFINIDO",
+                "credits": 4,
+            },
+        }
+        index = build_schedule_index(courses)
+
+        result = group_courses_by_mask(index)
+
+        self.assertEqual(
+            sorted(result.values(), key=len),
+            [{"OBG-BCC1-3"}, {"OBG-BCC1-1", "OBG-BCC1-2"}],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,229 +11,11 @@ sys.path.insert(
 from utils.utils import (
     get_all_available_courses_for_allocation,
     get_all_elective_courses_with_professor_qualified,
-    get_course_schedule,
-    get_courses_by_time,
-    get_courses_by_day,
-    get_possible_schedules,
     get_qualified_courses_for_professor,
     remove_courses,
     treat_and_save_results,
 )
-
-
-class TestUtils(TestCase):
-    def test_get_schedule_from_course(self):
-        mock_get_courses_set = {
-            "OBG-BCC1-1": {
-                "course_id": "ICP131,ICP222",
-                "credits": 4,
-                "day": "SEG,QUA",
-                "time": "13:00-15:00,08:00-10:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-2": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "TER,QUI",
-                "time": "15:00-17:00",
-                "course_type": "SVC",
-            },
-        }
-
-        result = get_course_schedule(mock_get_courses_set, "OBG-BCC1-2")
-        expected_result = ("TER,QUI", "15:00-17:00")
-
-        self.assertEqual(result, expected_result)
-
-    def test_get_courses_by_time(self):
-        mock_courses = {
-            "OBG-BCC1-1": {
-                "course_id": "ICP131,ICP222",
-                "credits": 4,
-                "day": "SEG,QUA",
-                "time": "13:00-15:00,08:00-10:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-2": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "TER,QUI",
-                "time": "15:00-17:00",
-                "course_type": "SVC",
-            },
-        }
-
-        result = get_courses_by_time(mock_courses, "08:00-10:00")
-        expected_result = {"OBG-BCC1-1"}
-
-        self.assertEqual(result, expected_result)
-
-        result = get_courses_by_time(mock_courses, "15:00-17:00")
-        expected_result = {"OBG-BCC1-2"}
-
-        self.assertEqual(result, expected_result)
-
-        result = get_courses_by_time(mock_courses, "13:00-15:00")
-        expected_result = {"OBG-BCC1-1"}
-
-        self.assertEqual(result, expected_result)
-
-    def test_get_courses_by_day(self):
-        mock_courses = {
-            "OBG-BCC1-1": {
-                "course_id": "ICP131,ICP222",
-                "credits": 4,
-                "day": "SEG,QUA",
-                "time": "13:00-15:00,08:00-10:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-2": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "TER,QUI",
-                "time": "15:00-17:00",
-                "course_type": "SVC",
-            },
-        }
-
-        result = get_courses_by_day(mock_courses, "SEG")
-        expected_result = set(["OBG-BCC1-1"])
-
-        self.assertEqual(result, expected_result)
-
-        result = get_courses_by_day(mock_courses, "QUA")
-        expected_result = set(["OBG-BCC1-1"])
-
-        self.assertEqual(result, expected_result)
-
-        result = get_courses_by_day(mock_courses, "TER")
-        expected_result = set(["OBG-BCC1-2"])
-
-        self.assertEqual(result, expected_result)
-
-        result = get_courses_by_day(mock_courses, "QUI")
-        expected_result = set(["OBG-BCC1-2"])
-
-        self.assertEqual(result, expected_result)
-
-    def test_get_temp_gabriel(self):
-        mock_courses = {
-            "OBG-BCC2-CMT1-16": {
-                "course_id": "ICP143",
-                "credits": 2,
-                "day": "QUI",
-                "time": "13:00-15:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-15": {
-                "course_id": "ICP143",
-                "credits": 2,
-                "day": "TER",
-                "time": "13:00-15:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-27": {
-                "course_id": "ICP246",
-                "credits": 4,
-                "day": "TER,QUI",
-                "time": "10:00-12:00",
-                "course_type": "OBG",
-            },
-            "SVC-CMT1-65": {
-                "course_id": "ICP121",
-                "credits": 4,
-                "day": "QUI",
-                "time": "10:00-12:00,13:00-15:00",
-                "course_type": "OBG",
-            }
-        }
-
-        course_days, course_times = get_possible_schedules(mock_courses)
-
-        for i in range(len(course_days)):
-            day = course_days[i]
-            time = course_times[i]
-            day_courses = get_courses_by_day(mock_courses, day)
-            time_courses = get_courses_by_time(mock_courses, time)
-            common_courses = day_courses.intersection(time_courses)
-            print(common_courses)
-
-
-class TestGetPossibleSchedules(TestCase):
-    def compare_schedules(self, result, expected_days, expected_times):
-        result_days, result_times = result
-        expected_pairs = list(zip(expected_days, expected_times))
-        result_pairs = list(zip(result_days, result_times))
-
-        for pair in expected_pairs:
-            self.assertIn(pair, result_pairs)
-
-    def test_get_possible_schedules(self):
-        mock_courses = {
-            "OBG-BCC1-1": {
-                "course_id": "ICP131,ICP222",
-                "credits": 4,
-                "day": "SEG,QUA",
-                "time": "13:00-15:00,08:00-10:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-2": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "TER,QUI",
-                "time": "15:00-17:00",
-                "course_type": "SVC",
-            },
-        }
-
-        result = get_possible_schedules(mock_courses)
-
-        expected_days = ["SEG,QUA", "TER,QUI"]
-        expected_times = ["13:00-15:00,08:00-10:00", "15:00-17:00"]
-
-        self.compare_schedules(result, expected_days, expected_times)
-
-    def test_get_schedule_without_schedules(self):
-
-        mock_courses = {}
-        result = get_possible_schedules(mock_courses)
-        expected_days = []
-        expected_times = []
-
-        self.assertEqual(result[0], expected_days)
-        self.assertEqual(result[1], expected_times)
-
-    def test_get_all_unique_possible_schedules_from_courses(self):
-
-        mock_courses = {
-            "OBG-BCC1-1": {
-                "course_id": "ICP131",
-                "credits": 4,
-                "day": "SEG,QUA",
-                "time": "13:00-15:00",
-                "course_type": "OBG",
-            },
-            "OBG-BCC1-2": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "SEG,QUI",
-                "time": "13:00-15:00",
-                "course_type": "SVC",
-            },
-            "SVG-EQUAL": {
-                "course_id": "ICP123",
-                "credits": 4,
-                "day": "SEG,QUI",
-                "time": "13:00-15:00",
-                "course_type": "SVC",
-            },
-        }
-
-        expected_days = ["SEG,QUA", "SEG,QUI"]
-        expected_times = ["13:00-15:00", "13:00-15:00"]
-
-        result = get_possible_schedules(mock_courses)
-        self.compare_schedules(result, expected_days, expected_times)
+from utils.solution import Allocation, CreditShortfall, Solution
 
 
 class TestGetQualifiedCoursesForProfessor(TestCase):
@@ -618,12 +400,21 @@ class TestTreatAndSaveResults(TestCase):
 
     @patch("utils.utils.save_results_to_csv")
     def test_treat_and_save_results(self, mock_save_results_to_csv):
-        timeschedule_mock = [
-            "Adriana Vivacqua_OBG-BCC1-1_SEG,QUA_13:00-15:00,08:00-10:00/1.0",
-            "Daniel Sadoc_OBG-BCC1-2_TER,QUI_15:00-17:00/1.0",
-            "PCB_Adriana Vivacqua/4.0",
-            "PCB_Daniel Sadoc/4.0",
-        ]
+        timeschedule_mock = Solution(
+            allocations=(
+                Allocation(
+                    "Adriana Vivacqua",
+                    "OBG-BCC1-1",
+                    "SEG,QUA",
+                    "13:00-15:00,08:00-10:00",
+                ),
+                Allocation("Daniel_Sadoc", "OBG-BCC1-2", "TER,QUI", "15:00-17:00"),
+            ),
+            permanent_shortfall=(
+                CreditShortfall("Adriana Vivacqua", 4.0),
+                CreditShortfall("Daniel_Sadoc", 4.0),
+            ),
+        )
 
         courses_mock = {
             "OBG-BCC1-1": {
@@ -672,7 +463,7 @@ class TestTreatAndSaveResults(TestCase):
             [
                 "IC",
                 "BCC",
-                "Daniel Sadoc",
+                "Daniel_Sadoc",
                 "ICP132",
                 "Processo de Software",
                 "TER,QUI",
@@ -685,7 +476,7 @@ class TestTreatAndSaveResults(TestCase):
             ],
         ]
 
-        PNC = [["Adriana Vivacqua", 4.0], ["Daniel Sadoc", 4.0]]
+        PNC = [["Adriana Vivacqua", 4.0], ["Daniel_Sadoc", 4.0]]
 
         expected_result = timeschedule, PNC
 
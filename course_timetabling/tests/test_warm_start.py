@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import build, get_sets
+from utils.solution import Allocation, Solution
+from utils.utils import save_results_to_csv
+from utils.warm_start import load_previous_solution, map_timeschedule
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.SETS = get_sets(
+            professors=("Prof1", "Prof2", "Prof3"),
+            courses=("OBG-BCC1-1", "OBG-BCC1-2", "OBG-BCC1-3", "SVC-EM1-4"),
+        )
+        self.COURSES = self.SETS["courses"]
+        # O timeschedule identifica a turma pelo curso de graduação
+        for course_class_id, course in self.COURSES.items():
+            course["graduation_course"] = course_class_id.split("-")[1]
+
+        return super().setUp()
+
+    def build(self, sparse=True):
+        timetabling = build(self.SETS, sparse=sparse)
+        timetabling.model.update()
+
+        return timetabling
+
+    def get_row(self, professor, course_id, graduation_course, day, time):
+        return (
+            "IC",
+            graduation_course,
+            professor,
+            course_id,
+            "Nome",
+            day,
+            time,
+            "60",
+            "T",
+            "OBG",
+            "1",
+            "Regular",
+        )
+
+    def test_timeschedule_rows_are_mapped_to_classes(self):
+        rows = [
+            self.get_row("Prof1", "ICP131", "BCC1", "SEG,QUA", "13:00-15:00"),
+            self.get_row("Prof1", "ICP999", "BCC1", "SEG,QUA", "13:00-15:00"),
+            self.get_row("Prof2", "ICP131", "BCC1", "SEG,QUA", "13:00-15:00"),
+            ("IC", "BCC1"),
+        ]
+
+        solution, unmapped = map_timeschedule(rows, self.COURSES)
+
+        self.assertEqual(
+            solution.allocations,
+            (Allocation("Prof1", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00"),),
+        )
+        self.assertEqual(
+            [(row, reason) for row, reason in unmapped],
+            [
+                (rows[1], "class not found"),
+                (rows[2], "class already allocated"),
+                (rows[3], "malformed row"),
+            ],
+        )
+
+    def test_timeschedule_csv_is_read_back(self):
+        rows = [self.get_row("Prof3", "ICP133", "BCC1", "SEG", "13:00-15:00")]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "timeschedule.csv")
+            save_results_to_csv(rows, path)
+
+            solution, unmapped = load_previous_solution(path, self.COURSES)
+
+        self.assertEqual(solution.allocations[0].course_class_id, "OBG-BCC1-3")
+        self.assertEqual(unmapped, [])
+
+    def test_start_is_complete_and_consistent(self):
+        timetabling = self.build()
+        previous_solution = Solution(
+            (
+                Allocation("Prof2", "OBG-BCC1-1", "SEG,QUA", "13:00-15:00"),
+                Allocation("Prof1", "OBG-BCC1-2", "SEG,QUA", "13:00-15:00"),
+                Allocation("Prof4", "OBG-BCC1-3", "SEG", "13:00-15:00"),
+            )
+        )
+
+        unmapped = timetabling.set_start(previous_solution)
+        timetabling.model.update()
+
+        self.assertEqual(
+            [(row.professor, reason) for row, reason in unmapped],
+            [("Prof1", "professor not eligible"), ("Prof4", "professor not found")],
+        )
+        self.assertEqual(timetabling.get_variable("Prof2", "OBG-BCC1-1").Start, 1)
+        self.assertEqual(timetabling.get_variable("DUMMY", "OBG-BCC1-2").Start, 1)
+        self.assertEqual(timetabling.get_variable("Prof1", "OBG-BCC1-1").Start, 0)
+        self.assertEqual(timetabling.PP_slack_variables["Prof1"].Start, 8)
+        self.assertEqual(timetabling.PP_slack_variables["Prof2"].Start, 4)
+
+        timetabling.clean_model()
+
+    def test_warm_start_keeps_the_optimal_value(self):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                cold = self.build(sparse)
+                cold.optimize()
+
+                warm = self.build(sparse)
+                warm.set_start(cold.extract_solution())
+                warm.optimize()
+
+                self.assertAlmostEqual(warm.model.ObjVal, cold.model.ObjVal)
+
+                cold.clean_model()
+                warm.clean_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import math
+from collections import defaultdict
+from typing import NamedTuple, Tuple
+
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from utils.profiler import get_constraint_family
+
+# Faixas recomendadas pelas orientações numéricas do Gurobi
+COEFFICIENT_BOUNDS = (1e-3, 1e6)
+RHS_BOUNDS = (1e-3, 1e4)
+MAX_RANGE = 1e6
+
+
+class FamilyRange(NamedTuple):
+    """
+    Range of the non-zero absolute coefficients of a family.
+
+    Attributes:
+        kind (str): "matrix", "rhs" or "objective".
+        family (str): The constraint rule (RNG1, RNP2, ...) or variable family (X, PCB, ...).
+        count (int): Number of non-zero coefficients.
+        min (float): Smallest absolute coefficient.
+        max (float): Largest absolute coefficient.
+    """
+
+    kind: str
+    family: str
+    count: int
+    min: float
+    max: float
+
+
+class ConditioningReport(NamedTuple):
+    """
+    Coefficient ranges of a model by family and the ones outside the recommended ranges.
+    """
+
+    ranges: Tuple[FamilyRange, ...] = ()
+    warnings: Tuple[str, ...] = ()
+
+    def report(self) -> str:
+        lines = [
+            f"{'kind':<10} {'family':<14} {'count':>8} {'min':>10} {'max':>10}",
+        ]
+        for r in self.ranges:
+            lines.append(
+                f"{r.kind:<10} {r.family:<14} {r.count:>8} {r.min:>10.3g} {r.max:>10.3g}"
+            )
+        lines += [f"Warning: {warning}" for warning in self.warnings]
+
+        return "\n".join(lines)
+
+
+def get_range(kind: str, family: str, coefficients) -> FamilyRange:
+    coefficients = np.abs(np.asarray(coefficients, dtype=float))
+    coefficients = coefficients[coefficients > 0]
+    if not len(coefficients):
+        return None
+
+    return FamilyRange(
+        kind, family, len(coefficients), coefficients.min(), coefficients.max()
+    )
+
+
+def get_warnings(ranges: list) -> list:
+    """
+    Flags the families outside COEFFICIENT_BOUNDS (RHS_BOUNDS for the right-hand sides)
+    and the kinds whose overall range is above MAX_RANGE, naming the families at both
+    ends.
+    """
+    warnings = []
+    by_kind = defaultdict(list)
+    for r in ranges:
+        by_kind[r.kind].append(r)
+
+        low, high = RHS_BOUNDS if r.kind == "rhs" else COEFFICIENT_BOUNDS
+        if r.min < low:
+            warnings.append(f"small {r.kind} coefficient {r.min:g} in {r.family}")
+        if r.max > high:
+            warnings.append(f"large {r.kind} coefficient {r.max:g} in {r.family}")
+
+    for kind, kind_ranges in by_kind.items():
+        smallest = min(kind_ranges, key=lambda r: r.min)
+        largest = max(kind_ranges, key=lambda r: r.max)
+        if largest.max / smallest.min > MAX_RANGE:
+            warnings.append(
+                f"{kind} range {largest.max / smallest.min:.0e}: "
+                f"{smallest.family} ({smallest.min:g}) vs {largest.family} ({largest.max:g})"
+            )
+
+    return warnings
+
+
+def analyze(model: gp.Model, variable_families: dict) -> ConditioningReport:
+    """
+    Reports the matrix and RHS coefficient ranges of each constraint family (the rule in
+    the constraint names, e.g. RNG4, see get_constraint_family) and the objective range
+    of each variable family.
+
+    Args:
+        model (gp.Model): The built model.
+        variable_families (dict): Variables of each family, e.g. {"PCB": [...]}.
+
+    Returns:
+        ConditioningReport: The ranges and the warnings.
+    """
+    model.update()
+    constraints = model.getConstrs()
+    ranges = []
+
+    if constraints:
+        families = np.array(
+            [
+                get_constraint_family(name)
+                for name in model.getAttr("ConstrName", constraints)
+            ]
+        )
+        rhs = np.array(model.getAttr("RHS", constraints))
+        matrix = model.getA().tocsr()
+        row_of_entry = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+
+        for family in dict.fromkeys(families):
+            rows = families == family
+            ranges.append(get_range("matrix", family, matrix.data[rows[row_of_entry]]))
+            ranges.append(get_range("rhs", family, rhs[rows]))
+
+    for family, variables in variable_families.items():
+        if variables:
+            ranges.append(
+                get_range("objective", family, model.getAttr("Obj", list(variables)))
+            )
+
+    ranges = [r for r in ranges if r is not None]
+
+    return ConditioningReport(tuple(ranges), tuple(get_warnings(ranges)))
+
+
+class ObjectiveRescaling(NamedTuple):
+    """
+    Tie-breaking objective terms lifted by factor (see rescale_objective).
+
+    Attributes:
+        variables (tuple): The variables of the lifted terms.
+        coefficients (tuple): Their original objective coefficients.
+        factor (float): The factor applied to them.
+    """
+
+    variables: tuple
+    coefficients: Tuple[float, ...]
+    factor: float
+
+    def apply(self, model: gp.Model):
+        model.setAttr(
+            "Obj",
+            list(self.variables),
+            [coefficient * self.factor for coefficient in self.coefficients],
+        )
+
+    def restore(self, model: gp.Model):
+        model.setAttr("Obj", list(self.variables), list(self.coefficients))
+        model.update()
+
+    def get_original_objective(self, objective: float, values) -> float:
+        """
+        Maps the objective value of the rescaled model back to the original one.
+
+        Args:
+            objective (float): Objective value of the rescaled model.
+            values: Values of every variable of the model, in model.getVars() order.
+        """
+        lifted = sum(
+            coefficient * values[variable.index]
+            for variable, coefficient in zip(self.variables, self.coefficients)
+        )
+
+        return objective - (self.factor - 1) * lifted
+
+
+def rescale_objective(model: gp.Model) -> ObjectiveRescaling:
+    """
+    Lifts the tie-breaking terms of the objective (e.g. DUMMY_COEFFICIENT) to the largest
+    values that keep the ordering of the solutions, which narrows the objective range.
+
+    The terms with integer coefficients on integer variables take values on a lattice of
+    step g (the gcd of their coefficients): two solutions either tie on them or differ by
+    at least g. The other terms only break those ties if, together, they can never move
+    the objective by g or more; scaling them so that they move it by at most g / 2 keeps
+    the order between any two solutions.
+
+    Returns:
+        ObjectiveRescaling: The applied rescaling, None if the objective has no such terms
+            or the conditions above do not hold.
+    """
+    model.update()
+    variables = model.getVars()
+    objective = np.array(model.getAttr("Obj", variables))
+    integer = np.array(
+        [vtype != GRB.CONTINUOUS for vtype in model.getAttr("VType", variables)]
+    )
+    lower = np.array(model.getAttr("LB", variables))
+    upper = np.array(model.getAttr("UB", variables))
+
+    nonzero = objective != 0
+    lattice = nonzero & np.isclose(objective, np.round(objective))
+    tie_breaking = nonzero & ~lattice
+
+    if not tie_breaking.any() or not lattice.any():
+        return None
+    if not integer[nonzero].all():
+        return None
+    if (np.abs(lower[tie_breaking]) >= GRB.INFINITY).any() or (
+        np.abs(upper[tie_breaking]) >= GRB.INFINITY
+    ).any():
+        return None
+
+    step = 0
+    for coefficient in np.round(np.abs(objective[lattice])).astype(int):
+        step = math.gcd(step, int(coefficient))
+
+    spread = (np.abs(objective[tie_breaking]) * (upper - lower)[tie_breaking]).sum()
+    if spread >= step:
+        # Não são só desempates: mudar a escala mudaria a ordem das soluções
+        return None
+
+    factor = step / (2 * spread)
+    if factor <= 1:
+        return None
+
+    indices = np.flatnonzero(tie_breaking)
+    rescaling = ObjectiveRescaling(
+        tuple(variables[i] for i in indices),
+        tuple(objective[indices].tolist()),
+        factor,
+    )
+    rescaling.apply(model)
+
+    return rescaling
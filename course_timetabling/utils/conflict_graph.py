@@ -0,0 +1,164 @@
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from utils.schedule import build_schedule_index
+from utils.timeslot import group_courses_by_mask, masks_conflict
+
+
+class ConflictGraph:
+    """
+    Class-conflict graph of a courses set: two course classes are adjacent when their
+    schedule masks overlap (see utils.timeslot).
+
+    The graph only depends on the schedules, never on the professors, so it is built once
+    and shared by every professor's RNG4 constraints. It can also be used on its own
+    (e.g. by the dashboard or by validators) to query conflicts without a solver.
+
+    Attributes:
+        groups (list): Sets of course class ids sharing exactly the same mask. Every group is a clique.
+        group_of (dict): Course class id to its group position.
+        cross_group_edges (list): Conflicting (course, course) pairs from different groups, each pair once.
+        clique_cover (list): Cached result of cliques().
+    """
+
+    def __init__(self, schedule_index: Mapping):
+        self.courses = list(schedule_index.keys())
+        self.position = {course: i for i, course in enumerate(self.courses)}
+
+        courses_by_mask = group_courses_by_mask(schedule_index)
+        self.masks = list(courses_by_mask.keys())
+        self.groups: List[Tuple[str, ...]] = [
+            tuple(sorted(courses, key=self.position.get))
+            for courses in courses_by_mask.values()
+        ]
+        self.group_of: Dict[str, int] = {
+            course: g for g, group in enumerate(self.groups) for course in group
+        }
+
+        adjacency = {course: set() for course in self.courses}
+        self.cross_group_edges: List[Tuple[str, str]] = []
+
+        for g, group in enumerate(self.groups):
+            for course in group:
+                adjacency[course].update(group)
+                adjacency[course].discard(course)
+
+            for h in range(g + 1, len(self.groups)):
+                if not masks_conflict(self.masks[g], self.masks[h]):
+                    continue
+                for course in group:
+                    adjacency[course].update(self.groups[h])
+                    for other in self.groups[h]:
+                        adjacency[other].add(course)
+                        self.cross_group_edges.append(self.ordered(course, other))
+
+        self.cross_group_edges.sort(
+            key=lambda edge: (self.position[edge[0]], self.position[edge[1]])
+        )
+        self.adjacency: Dict[str, FrozenSet[str]] = {
+            course: frozenset(neighbors) for course, neighbors in adjacency.items()
+        }
+        self.clique_cover = None
+
+    @classmethod
+    def from_courses(cls, courses: dict) -> "ConflictGraph":
+        """
+        Builds the conflict graph straight from a courses set.
+        """
+        return cls(build_schedule_index(courses))
+
+    def ordered(self, course: str, other: str) -> Tuple[str, str]:
+        if self.position[course] <= self.position[other]:
+            return course, other
+        return other, course
+
+    def __contains__(self, course) -> bool:
+        return course in self.adjacency
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def conflicts(self, course: str) -> FrozenSet[str]:
+        """
+        Returns the course classes that conflict with the given one.
+        """
+        return self.adjacency[course]
+
+    def are_conflicting(self, course: str, other: str) -> bool:
+        return other in self.adjacency[course]
+
+    def edges(self) -> Iterable[Tuple[str, str]]:
+        """
+        Yields every conflicting pair of course classes once.
+        """
+        for course in self.courses:
+            for other in sorted(self.adjacency[course], key=self.position.get):
+                if self.position[course] < self.position[other]:
+                    yield course, other
+
+    def number_of_edges(self) -> int:
+        return sum(len(neighbors) for neighbors in self.adjacency.values()) // 2
+
+    def cliques(self) -> List[Tuple[str, ...]]:
+        """
+        Returns a clique cover of the graph made of maximal "cell cliques".
+
+        For every cell of the weekly grid, the courses whose mask uses that cell pairwise
+        conflict, so they form a clique; and since two courses only conflict when they
+        share a cell, these cliques cover every edge. Duplicated cliques and cliques
+        contained in another one are dropped.
+
+        Returns:
+            list: Cliques of at least two course class ids, largest first.
+        """
+        if self.clique_cover is not None:
+            return self.clique_cover
+
+        groups_by_cell = {}
+        for g, mask in enumerate(self.masks):
+            while mask:
+                lowest_bit = mask & -mask
+                groups_by_cell.setdefault(lowest_bit.bit_length() - 1, []).append(g)
+                mask ^= lowest_bit
+
+        candidates = {frozenset(groups) for groups in groups_by_cell.values()}
+        candidates = sorted(
+            (
+                frozenset(course for g in groups for course in self.groups[g])
+                for groups in candidates
+            ),
+            key=len,
+            reverse=True,
+        )
+
+        cliques = []
+        for candidate in candidates:
+            if len(candidate) < 2:
+                break
+            if any(candidate <= clique for clique in cliques):
+                continue
+            cliques.append(candidate)
+
+        self.clique_cover = [
+            tuple(sorted(clique, key=self.position.get)) for clique in cliques
+        ]
+
+        return self.clique_cover
+
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the adjacency in CSR form over the course positions (see the courses attribute).
+
+        Returns:
+            tuple: The (indptr, indices) arrays; the neighbors of courses[i] are
+                courses[indices[indptr[i]:indptr[i + 1]]].
+        """
+        indptr = np.zeros(len(self.courses) + 1, dtype=np.int64)
+        indices = []
+        for i, course in enumerate(self.courses):
+            neighbors = sorted(self.position[other] for other in self.adjacency[course])
+            indices.extend(neighbors)
+            indptr[i + 1] = indptr[i] + len(neighbors)
+
+        return indptr, np.array(indices, dtype=np.int64)
@@ -0,0 +1,277 @@
+import json
+from collections import defaultdict
+from typing import NamedTuple, Tuple
+
+import gurobipy as gp
+from gurobipy import GRB
+
+import settings
+
+from utils.conflict_graph import ConflictGraph
+from utils.presolve import get_credit_cap, get_eligibility
+from utils.profiler import get_constraint_family
+
+
+class Issue(NamedTuple):
+    """
+    A problem in the sets that makes the model infeasible.
+
+    Attributes:
+        check (str): The check that found it, e.g. "manual_allocation".
+        subject (str): The professor or class it refers to.
+        message (str): What is wrong.
+    """
+
+    check: str
+    subject: str
+    message: str
+
+
+class DiagnosisReport(NamedTuple):
+    """
+    Outcome of diagnose, tier by tier.
+
+    Attributes:
+        status (int): Status of the solve being diagnosed.
+        tiers (tuple): The tiers that ran ("checks", "feasrelax", "iis").
+        issues (tuple): Issues found by the cheap checks on the sets.
+        violations (tuple): (constraint, violation) pairs of the smallest relaxation that
+            makes the model feasible.
+        iis (tuple): Constraints of an irreducible infeasible subsystem.
+    """
+
+    status: int
+    tiers: Tuple[str, ...] = ()
+    issues: Tuple[Issue, ...] = ()
+    violations: Tuple[Tuple[str, float], ...] = ()
+    iis: Tuple[str, ...] = ()
+
+    def get_violations_by_rule(self) -> dict:
+        """
+        Sums the violations of each rule (RNP1, RNG3, ...).
+        """
+        rules = defaultdict(float)
+        for name, violation in self.violations:
+            rules[get_constraint_family(name)] += violation
+
+        return dict(rules)
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "tiers": list(self.tiers),
+            "issues": [issue._asdict() for issue in self.issues],
+            "violations": [
+                {"constraint": name, "violation": violation}
+                for name, violation in self.violations
+            ],
+            "violations_by_rule": self.get_violations_by_rule(),
+            "iis": list(self.iis),
+        }
+
+    def report(self) -> str:
+        if self.status == GRB.LOADED:
+            lines = ["Sets checked before building the model"]
+        else:
+            lines = [f"Model return status={self.status}"]
+        if not (self.issues or self.violations or self.iis):
+            lines.append("No cause found (tiers: " + ", ".join(self.tiers) + ")")
+
+        for issue in self.issues:
+            lines.append(f"  [{issue.check}] {issue.subject}: {issue.message}")
+        if self.violations:
+            lines.append("Constraints violated by the smallest relaxation:")
+            for rule, violation in self.get_violations_by_rule().items():
+                lines.append(f"  {rule}: {violation:g}")
+            for name, violation in self.violations:
+                lines.append(f"    {name}: {violation:g}")
+        if self.iis:
+            lines.append(f"IIS ({len(self.iis)} constraints, see model.ilp):")
+            lines.extend(f"  {name}" for name in self.iis)
+
+        return "\n".join(lines)
+
+    def save(self, filename: str):
+        with open(filename, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def check_manual_allocation(sets: dict) -> list:
+    """
+    Checks that every manual allocation (RNP1) references a known professor and class, in
+    the slot of the class, and that the manual allocations of a professor do not conflict
+    with each other (RNG4).
+    """
+    issues = []
+    courses = sets["courses"]
+    by_professor = defaultdict(dict)
+
+    for course, allocation in sets["manual_allocation"].items():
+        professor = allocation["professor"]
+
+        if professor not in sets["professors"]:
+            issues.append(
+                Issue("manual_allocation", course, f"unknown professor {professor}")
+            )
+        if course not in courses:
+            issues.append(Issue("manual_allocation", course, "unknown class"))
+            continue
+
+        slot = (allocation.get("day"), allocation.get("time"))
+        if slot != (courses[course]["day"], courses[course]["time"]):
+            issues.append(
+                Issue(
+                    "manual_allocation",
+                    course,
+                    f"slot {slot[0]} {slot[1]} differs from the class slot "
+                    f"{courses[course]['day']} {courses[course]['time']}",
+                )
+            )
+
+        if professor != settings.DUMMY_PROFESSOR_NAME:
+            by_professor[professor][course] = courses[course]
+
+    for professor, professor_courses in by_professor.items():
+        graph = ConflictGraph.from_courses(professor_courses)
+        for course, other in graph.edges():
+            issues.append(
+                Issue(
+                    "manual_conflict",
+                    professor,
+                    f"manually allocated to {course} and {other} at the same time",
+                )
+            )
+
+    return issues
+
+
+def check_credit_caps(sets: dict) -> list:
+    """
+    Checks that the manual allocations of each professor fit in their credit cap (RNG1
+    with PCB >= 0, RNG2/RNP2/RNP3) and, without DUMMY, that every class has an eligible
+    professor (RNG3).
+    """
+    issues = []
+    courses = sets["courses"]
+
+    credits = defaultdict(int)
+    for course, allocation in sets["manual_allocation"].items():
+        if course in courses:
+            credits[allocation["professor"]] += int(courses[course]["credits"])
+
+    for professor, manual_credits in credits.items():
+        cap = get_credit_cap(professor, sets)
+        if manual_credits > cap:
+            issues.append(
+                Issue(
+                    "credit_cap",
+                    professor,
+                    f"{manual_credits} manually allocated credits above the cap of {cap}",
+                )
+            )
+
+    if settings.DUMMY_PROFESSOR_NAME not in sets["professors"]:
+        _, candidates = get_eligibility(sets)
+        for course, course_candidates in candidates.items():
+            if not course_candidates:
+                issues.append(
+                    Issue("credit_cap", course, "no eligible professor and no DUMMY")
+                )
+
+    return issues
+
+
+def check_sets(sets: dict) -> DiagnosisReport:
+    """
+    Runs only the checks on the sets (tier 1 of diagnose), before the model is built:
+    some of the issues they find, e.g. an unknown professor, would break the build.
+
+    Returns:
+        DiagnosisReport: The issues found, with status GRB.LOADED.
+    """
+    issues = tuple(check_manual_allocation(sets) + check_credit_caps(sets))
+
+    return DiagnosisReport(GRB.LOADED, ("checks",), issues)
+
+
+def relax(model: gp.Model) -> tuple:
+    """
+    Solves the feasibility relaxation (feasRelax) of a copy of the model, with every
+    constraint relaxable at unit penalty, and returns the constraints it had to violate.
+
+    Returns:
+        tuple: (constraint, violation) pairs, None if the relaxation was not solved.
+    """
+    relaxed = model.copy()
+    try:
+        relaxed.Params.OutputFlag = 0
+        relaxed.feasRelax(
+            0, False, None, None, None, relaxed.getConstrs(), [1.0] * relaxed.NumConstrs
+        )
+        relaxed.optimize()
+        if relaxed.SolCount == 0:
+            return None
+
+        violations = defaultdict(float)
+        for variable in relaxed.getVars():
+            name = variable.VarName
+            if name.startswith(("ArtP_", "ArtN_")) and variable.X > 1e-6:
+                violations[name[5:]] += variable.X
+
+        return tuple(violations.items())
+    finally:
+        relaxed.dispose()
+
+
+def get_iis(model: gp.Model, filename: str = "model.ilp") -> tuple:
+    """
+    Computes an IIS of the model and writes it to filename.
+
+    Returns:
+        tuple: The names of the constraints in the IIS.
+    """
+    model.computeIIS()
+    model.write(filename)
+
+    return tuple(
+        constraint.ConstrName
+        for constraint in model.getConstrs()
+        if constraint.IISConstr
+    )
+
+
+def diagnose(
+    sets: dict, model: gp.Model = None, status: int = GRB.INFEASIBLE, iis: bool = False
+) -> DiagnosisReport:
+    """
+    Looks for the cause of an infeasible model, cheapest tier first:
+
+    1. checks on the sets, linear in their size (see check_manual_allocation and
+       check_credit_caps);
+    2. if they find nothing, the feasibility relaxation of the model (see relax);
+    3. only if iis is set, an IIS of the model (see get_iis), which can take longer than
+       the solve itself.
+
+    Args:
+        sets (dict): The sets keyed by the CourseTimetabling argument names.
+        model (gp.Model): The built Gurobi model, tiers 2 and 3 are skipped without it.
+        status (int): Status of the solve being diagnosed.
+        iis (bool): Whether to compute an IIS.
+
+    Returns:
+        DiagnosisReport: The tiers that ran and what they found.
+    """
+    tiers = ["checks"]
+    issues = check_sets(sets).issues
+
+    violations = ()
+    if model is not None and not issues:
+        tiers.append("feasrelax")
+        violations = relax(model) or ()
+
+    iis_constraints = ()
+    if model is not None and iis:
+        tiers.append("iis")
+        iis_constraints = get_iis(model)
+
+    return DiagnosisReport(status, tuple(tiers), issues, violations, iis_constraints)
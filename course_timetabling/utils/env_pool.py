@@ -0,0 +1,98 @@
+import os
+import threading
+
+import gurobipy as gp
+
+import settings
+
+
+def create_environment() -> gp.Env:
+    """
+    Creates and starts a Gurobi environment for the license type in settings.
+
+    With the local license type the environment is started without any license
+    parameter, so it uses the license found on the machine (e.g. the size-limited one of
+    the pip package) and works offline.
+    """
+    if settings.APP_LICENSE_TYPE == settings.LicenseType.NAMED_USER_ACADEMIC.value:
+        env = gp.Env(empty=False)
+
+    elif settings.APP_LICENSE_TYPE == settings.LicenseType.WSL_ACADEMIC.value:
+        env = gp.Env(empty=True)
+        env.setParam("LicenseID", settings.APP_LICENSE_ID)
+        env.setParam("WLSAccessID", settings.APP_WLS_ACCESS_ID)
+        env.setParam("WLSSecret", settings.APP_WS_SECRET)
+
+    elif settings.APP_LICENSE_TYPE == settings.LicenseType.LOCAL.value:
+        env = gp.Env(empty=True)
+
+    env.start()
+
+    return env
+
+
+class EnvPool:
+    """
+    Hands out started Gurobi environments and takes them back when their model is
+    disposed, so that a process building many models (tests, sweeps, a service) starts
+    one environment per concurrent model instead of one per model. With WLS licensing
+    each start is a round-trip to the license server.
+
+    At most max_idle released environments are kept; the others are disposed.
+    """
+
+    def __init__(
+        self, factory=create_environment, max_idle: int = settings.ENV_POOL_MAX_IDLE
+    ):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.idle = []
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> gp.Env:
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+            self.created += 1
+
+        return self.factory()
+
+    def release(self, env: gp.Env):
+        """
+        Returns an environment to the pool. Its models must be disposed already.
+        """
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(env)
+                return
+
+        env.dispose()
+
+    def clear(self):
+        """
+        Disposes the idle environments.
+        """
+        with self.lock:
+            idle, self.idle = self.idle, []
+
+        for env in idle:
+            env.dispose()
+
+
+_env_pool = None
+_env_pool_pid = None
+
+
+def get_env_pool() -> EnvPool:
+    """
+    Returns the process-wide environment pool. A forked process (e.g. a sweep worker)
+    gets a new pool, since the environments of the parent cannot be shared.
+    """
+    global _env_pool, _env_pool_pid
+
+    if _env_pool is None or _env_pool_pid != os.getpid():
+        _env_pool = EnvPool()
+        _env_pool_pid = os.getpid()
+
+    return _env_pool
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import time
+
+import gurobipy as gp
+
+import settings
+
+# Valores de settings.py que mudam o modelo construído
+MODEL_SETTINGS = (
+    "DUMMY_PROFESSOR_NAME",
+    "DUMMY_COEFFICIENT",
+    "DEFAULT_COEFFICIENT",
+    "SERVICE_COURSE_COEFFICIENT_SP",
+    "SERVICE_COURSE_COEFFICIENT_PP",
+    "ZERO_COEFFICIENT",
+    "WEIGHT_FACTOR_PP",
+    "MIN_CREDITS_PERMANENT",
+    "MAX_CREDITS_PERMANENT",
+    "WEIGHT_FACTOR_PS",
+    "MIN_CREDITS_SUBSTITUTE",
+    "MAX_CREDITS_SUBSTITUTE",
+    "SVC_MATH_COURSES",
+    "SVC_BASIC_COURSES",
+)
+
+MODEL_EXTENSION = ".mps.bz2"
+INDEX_EXTENSION = ".json"
+
+
+def get_model_settings() -> dict:
+    return {name: getattr(settings, name) for name in MODEL_SETTINGS}
+
+
+def get_input_hash(sets: dict, options: dict = None) -> str:
+    """
+    Computes a canonical hash of the model inputs: the sets, every model-relevant value of
+    settings.py and the build options. Dict ordering does not change the hash.
+
+    Args:
+        sets (dict): The sets keyed by the CourseTimetabling argument names.
+        options (dict): Build options, e.g. the builder class, sparse and conflict mode.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    payload = {
+        "sets": sets,
+        "settings": get_model_settings(),
+        "options": options or {},
+    }
+    canonical = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_timetabling_sets(timetabling) -> dict:
+    return {
+        "professors": timetabling.professors,
+        "permanent_professors": timetabling.permanent_professors,
+        "substitute_professors": timetabling.substitute_professors,
+        "courses": timetabling.courses,
+        "manual_allocation": timetabling.manual_allocation,
+    }
+
+
+def get_build_options(builder, sparse: bool, conflict_mode: str) -> dict:
+    """
+    Returns the build options that change the model layout, to be hashed with the sets.
+    """
+    return {
+        "builder": builder.__name__,
+        "sparse": sparse,
+        "conflict_mode": conflict_mode,
+    }
+
+
+class ModelCache:
+    """
+    Persists built models under a cache directory, keyed by the input hash.
+
+    Each entry is the model in MPS format (<key>.mps.bz2) plus an index (<key>.json) with
+    the (professor, course) key of every X variable, the professors of the PCB/PSB
+    slacks and the constraint names, since MPS does not keep names with spaces. On a hit
+    the model is read back and the variable maps are rebuilt from the index, skipping the
+    Python-side construction.
+
+    Entries older than max_age seconds are evicted, then the oldest ones until the cache
+    fits in max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.MODEL_CACHE_DIR,
+        max_bytes: int = settings.MODEL_CACHE_MAX_MB * 1024 * 1024,
+        max_age: int = settings.MODEL_CACHE_MAX_AGE,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def get_key(self, timetabling) -> str:
+        return get_input_hash(
+            get_timetabling_sets(timetabling),
+            get_build_options(
+                type(timetabling), timetabling.sparse, timetabling.conflict_mode
+            ),
+        )
+
+    def get_paths(self, key: str) -> tuple:
+        base = os.path.join(self.directory, key)
+        return base + MODEL_EXTENSION, base + INDEX_EXTENSION
+
+    def __contains__(self, key: str) -> bool:
+        return all(os.path.exists(path) for path in self.get_paths(key))
+
+    def save(self, timetabling, key: str):
+        """
+        Writes the built model of a timetabling and its index, then evicts old entries.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        model_path, index_path = self.get_paths(key)
+
+        model = timetabling.model
+        model.update()
+        model.write(model_path)
+
+        index = {
+            "X": [list(key) for key in timetabling.X.keys()],
+            "PCB": list(timetabling.PP_slack_variables.keys()),
+            "PSB": list(timetabling.PS_slack_variables.keys()),
+            "constraints": model.getAttr("ConstrName", model.getConstrs()),
+        }
+        with open(index_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, ensure_ascii=False)
+
+        self.evict()
+
+    def load(self, timetabling, key: str) -> bool:
+        """
+        Replaces the (empty) model of a timetabling with the cached one.
+
+        Returns:
+            bool: False on a cache miss, the timetabling is left untouched.
+        """
+        if key not in self:
+            return False
+
+        model_path, index_path = self.get_paths(key)
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+
+        model = gp.read(model_path, env=timetabling.env)
+        model.ModelName = timetabling.model.ModelName
+        timetabling.model.dispose()
+        timetabling.model = model
+
+        variables = model.getVars()
+        keys = [tuple(key) for key in index["X"]]
+        n_x, n_pcb = len(keys), len(index["PCB"])
+        x_variables = variables[:n_x]
+        pcb_variables = variables[n_x : n_x + n_pcb]
+        psb_variables = variables[n_x + n_pcb :]
+
+        model.setAttr(
+            "VarName",
+            variables,
+            [timetabling.get_variable_name(*key) for key in keys]
+            + [f"PCB_{p}" for p in index["PCB"]]
+            + [f"PSB_{p}" for p in index["PSB"]],
+        )
+        model.setAttr("ConstrName", model.getConstrs(), index["constraints"])
+        model.update()
+
+        timetabling.variable_keys = gp.tuplelist(keys)
+        timetabling.X = gp.tupledict(zip(keys, x_variables))
+        timetabling.EAP = gp.tupledict(zip(keys, model.getAttr("Obj", x_variables)))
+        timetabling.credit_coefficient = gp.tupledict(
+            (key, timetabling.schedule_index[key[1]].credits) for key in keys
+        )
+        timetabling.PP_slack_variables = gp.tupledict(zip(index["PCB"], pcb_variables))
+        timetabling.PS_slack_variables = gp.tupledict(zip(index["PSB"], psb_variables))
+
+        now = time.time()
+        for path in self.get_paths(key):
+            os.utime(path, (now, now))
+
+        return True
+
+    def evict(self):
+        """
+        Removes entries older than max_age, then the least recently used ones until the
+        cache fits in max_bytes.
+        """
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = {}
+        for filename in os.listdir(self.directory):
+            for extension in (MODEL_EXTENSION, INDEX_EXTENSION):
+                if filename.endswith(extension):
+                    key = filename[: -len(extension)]
+                    path = os.path.join(self.directory, filename)
+                    entries.setdefault(key, []).append(path)
+
+        def last_used(key):
+            return max(os.path.getmtime(path) for path in entries[key])
+
+        def size(key):
+            return sum(os.path.getsize(path) for path in entries[key])
+
+        now = time.time()
+        keys = sorted(entries, key=last_used)
+        total = sum(size(key) for key in keys)
+
+        for key in keys:
+            if now - last_used(key) <= self.max_age and total <= self.max_bytes:
+                continue
+            total -= size(key)
+            for path in entries[key]:
+                os.remove(path)
@@ -0,0 +1,337 @@
+from typing import NamedTuple, Tuple
+
+import settings
+
+from utils import utils
+from utils.conflict_graph import ConflictGraph
+from utils.solution import Allocation, CreditShortfall, Solution
+from utils.warm_start import UnmappedRow
+
+# Campo do professor DUMMY com as turmas em que ele não precisa de variável
+EXCLUDED_CLASSES = "excluded_classes"
+
+
+class PresolveResult(NamedTuple):
+    """
+    Reduced sets and the reductions applied to them (see presolve).
+
+    Attributes:
+        sets (dict): The reduced sets, keyed by the CourseTimetabling argument names.
+        original_sets (dict): The sets given to presolve.
+        removed_professors (tuple): Professors without any eligible class.
+        dummy_classes (tuple): Classes no professor but DUMMY can teach, removed and
+            allocated to DUMMY.
+        fixed_allocations (tuple): (class, professor) pairs fixed as manual allocations.
+        pruned_dummy_classes (tuple): Classes whose DUMMY variable is not created.
+        objective_offset (float): Objective of the removed entities, constant in the
+            original model.
+    """
+
+    sets: dict
+    original_sets: dict
+    removed_professors: Tuple[str, ...] = ()
+    dummy_classes: Tuple[str, ...] = ()
+    fixed_allocations: Tuple[Tuple[str, str], ...] = ()
+    pruned_dummy_classes: Tuple[str, ...] = ()
+    objective_offset: float = 0.0
+
+    def report(self) -> str:
+        lines = [
+            f"Professors removed (no eligible class): {len(self.removed_professors)}",
+            f"Classes allocated to DUMMY (no eligible professor): {len(self.dummy_classes)}",
+            f"Classes fixed to their only professor: {len(self.fixed_allocations)}",
+            f"DUMMY variables pruned: {len(self.pruned_dummy_classes)}",
+            f"Objective offset: {self.objective_offset}",
+        ]
+        for professor in self.removed_professors:
+            lines.append(f"  removed professor {professor}")
+        for course in self.dummy_classes:
+            lines.append(f"  {course} -> {settings.DUMMY_PROFESSOR_NAME}")
+        for course, professor in self.fixed_allocations:
+            lines.append(f"  {course} -> {professor}")
+
+        return "\n".join(lines)
+
+    def map_start(self, solution: Solution) -> tuple:
+        """
+        Maps a previous solution of the original sets to the reduced ones, so the
+        allocations presolve made unnecessary are not reported as invalid by
+        CourseTimetabling.set_start.
+
+        Args:
+            solution (Solution): Solution of the original sets.
+
+        Returns:
+            tuple: The Solution of the reduced sets and the list of UnmappedRow of the
+                allocations removed by presolve.
+        """
+        fixed_allocations = dict(self.fixed_allocations)
+        allocations = []
+        unmapped = []
+
+        for allocation in solution.allocations:
+            professor, course = allocation.professor, allocation.course_class_id
+
+            if course in self.dummy_classes:
+                reason = "class removed by presolve"
+            elif professor in self.removed_professors:
+                reason = "professor removed by presolve"
+            elif fixed_allocations.get(course, professor) != professor:
+                reason = "class fixed by presolve to another professor"
+            else:
+                allocations.append(allocation)
+                continue
+
+            unmapped.append(UnmappedRow(allocation, reason))
+
+        return solution._replace(allocations=tuple(allocations)), unmapped
+
+    def postsolve(self, solution: Solution, objective: float) -> tuple:
+        """
+        Maps a solution of the reduced sets back to the original instance: the removed
+        classes go to DUMMY and the removed professors get their whole minimum credits
+        as PCB/PSB.
+
+        Args:
+            solution (Solution): Solution of the reduced sets.
+            objective: Its objective value, or the value of each level of the hierarchical
+                objective (see CourseTimetabling.get_objective_values).
+
+        Returns:
+            tuple: The Solution and objective value (or level values) of the original
+                model.
+        """
+        courses = self.original_sets["courses"]
+        allocations = solution.allocations + tuple(
+            Allocation(
+                settings.DUMMY_PROFESSOR_NAME,
+                course,
+                courses[course]["day"],
+                courses[course]["time"],
+            )
+            for course in self.dummy_classes
+        )
+
+        levels = dict(objective) if isinstance(objective, dict) else None
+        shortfalls = []
+        for field, professors, min_credits in (
+            (
+                "permanent_shortfall",
+                "permanent_professors",
+                settings.MIN_CREDITS_PERMANENT,
+            ),
+            (
+                "substitute_shortfall",
+                "substitute_professors",
+                settings.MIN_CREDITS_SUBSTITUTE,
+            ),
+        ):
+            removed = tuple(
+                CreditShortfall(professor, float(min_credits))
+                for professor in self.removed_professors
+                if professor in self.original_sets[professors] and min_credits > 0
+            )
+            shortfalls.append(getattr(solution, field) + removed)
+            if levels is not None:
+                levels[field] += sum(shortfall.credits for shortfall in removed)
+
+        if levels is None:
+            return Solution(allocations, *shortfalls), objective + self.objective_offset
+
+        # objective_offset é ponderado: no objetivo hierárquico, as entidades removidas
+        # entram em cada nível
+        levels["dummy"] += len(self.dummy_classes)
+
+        return Solution(allocations, *shortfalls), levels
+
+
+def get_eligibility(sets: dict) -> tuple:
+    """
+    Computes the professor-class eligibility graph of the sets, DUMMY left out (see
+    CourseTimetabling.get_eligible_courses).
+
+    Returns:
+        tuple: The eligible classes of each professor and the eligible professors of each
+            class.
+    """
+    eligible = {
+        professor: utils.add_manual_allocation_courses(
+            professor,
+            utils.get_qualified_courses_for_professor(
+                sets["courses"], sets["professors"], professor
+            ),
+            sets["manual_allocation"],
+        )
+        for professor in sets["professors"]
+        if professor != settings.DUMMY_PROFESSOR_NAME
+    }
+
+    candidates = {course: set() for course in sets["courses"]}
+    for professor, professor_courses in eligible.items():
+        for course in professor_courses.intersection(candidates):
+            candidates[course].add(professor)
+
+    return eligible, candidates
+
+
+def get_credit_cap(professor: str, sets: dict) -> float:
+    """
+    Returns the most credits a professor can get without a PCB/PSB below zero, i.e. above
+    which RNG1/RNG2 (or RNP2/RNP3) are binding.
+    """
+    if professor in sets["permanent_professors"]:
+        return settings.MIN_CREDITS_PERMANENT
+    if professor in sets["substitute_professors"]:
+        return min(
+            settings.MIN_CREDITS_SUBSTITUTE,
+            settings.MAX_CREDITS_PERMANENT,
+            settings.MAX_CREDITS_SUBSTITUTE,
+        )
+
+    return float("inf")
+
+
+def get_dominant_professors(
+    course: str, candidates: set, eligible: dict, sets: dict, graph: ConflictGraph
+) -> list:
+    """
+    Returns the candidates of a class who are always better than DUMMY for it: the class
+    does not conflict with their other eligible classes and all of these fit in their
+    credits. Moving the class from DUMMY to such a professor keeps every constraint and
+    increases the objective, so no optimal solution leaves it to DUMMY.
+    """
+    courses = sets["courses"]
+    dominant = []
+
+    for professor in sorted(candidates):
+        if graph.conflicts(course) & eligible[professor]:
+            continue
+
+        credits = sum(int(courses[c]["credits"]) for c in eligible[professor])
+        if credits <= get_credit_cap(professor, sets):
+            dominant.append(professor)
+
+    return dominant
+
+
+def presolve(sets: dict) -> PresolveResult:
+    """
+    Reduces the sets before the model is built. Every reduction keeps the optimal value
+    (up to objective_offset) and PresolveResult.postsolve maps the solution back:
+
+    - professors without eligible classes are removed (their PCB/PSB is their minimum);
+    - classes only DUMMY can teach are removed and allocated to DUMMY;
+    - classes with a single eligible professor who is always better than DUMMY (see
+      get_dominant_professors) are fixed to them as manual allocations;
+    - classes with several eligible professors, one of them always better than DUMMY, get
+      no DUMMY variable.
+
+    The last two reductions need every EAP coefficient of an eligible pair to be above
+    DUMMY_COEFFICIENT and the weight factors to be non-negative, and are skipped otherwise.
+
+    Args:
+        sets (dict): The sets keyed by the CourseTimetabling argument names.
+
+    Returns:
+        PresolveResult: The reduced sets and the reductions.
+    """
+    professors = sets["professors"]
+    courses = sets["courses"]
+    manual_allocation = sets["manual_allocation"]
+    dummy = settings.DUMMY_PROFESSOR_NAME
+
+    eligible, candidates = get_eligibility(sets)
+
+    removed_professors = tuple(
+        professor
+        for professor, professor_courses in eligible.items()
+        if not professor_courses
+    )
+    dummy_classes = tuple(
+        course
+        for course, course_candidates in candidates.items()
+        if not course_candidates
+    )
+
+    fixed_allocations = []
+    pruned_dummy_classes = []
+    dominance = (
+        min(
+            settings.DEFAULT_COEFFICIENT,
+            settings.SERVICE_COURSE_COEFFICIENT_SP,
+            settings.SERVICE_COURSE_COEFFICIENT_PP,
+        )
+        > settings.DUMMY_COEFFICIENT
+        and settings.WEIGHT_FACTOR_PP >= 0
+        and settings.WEIGHT_FACTOR_PS >= 0
+    )
+    if dominance:
+        graph = ConflictGraph.from_courses(courses)
+
+        for course, course_candidates in candidates.items():
+            if not course_candidates or course in manual_allocation:
+                continue
+
+            dominant = get_dominant_professors(
+                course, course_candidates, eligible, sets, graph
+            )
+            if not dominant:
+                continue
+
+            if len(course_candidates) == 1:
+                fixed_allocations.append((course, dominant[0]))
+            else:
+                pruned_dummy_classes.append(course)
+
+    reduced_professors = {
+        professor: details
+        for professor, details in professors.items()
+        if professor not in removed_professors
+    }
+    if dummy in reduced_professors and pruned_dummy_classes:
+        reduced_professors[dummy] = {
+            **reduced_professors[dummy],
+            EXCLUDED_CLASSES: pruned_dummy_classes,
+        }
+
+    reduced_sets = {
+        "professors": reduced_professors,
+        "permanent_professors": {
+            p: d
+            for p, d in sets["permanent_professors"].items()
+            if p not in removed_professors
+        },
+        "substitute_professors": {
+            p: d
+            for p, d in sets["substitute_professors"].items()
+            if p not in removed_professors
+        },
+        "courses": {c: d for c, d in courses.items() if c not in dummy_classes},
+        "manual_allocation": {
+            **{c: a for c, a in manual_allocation.items() if c not in dummy_classes},
+            **{
+                course: {**courses[course], "professor": professor}
+                for course, professor in fixed_allocations
+            },
+        },
+    }
+
+    objective_offset = (
+        len(dummy_classes) * settings.DUMMY_COEFFICIENT
+        - settings.WEIGHT_FACTOR_PP
+        * settings.MIN_CREDITS_PERMANENT
+        * sum(p in sets["permanent_professors"] for p in removed_professors)
+        - settings.WEIGHT_FACTOR_PS
+        * settings.MIN_CREDITS_SUBSTITUTE
+        * sum(p in sets["substitute_professors"] for p in removed_professors)
+    )
+
+    return PresolveResult(
+        reduced_sets,
+        sets,
+        removed_professors,
+        dummy_classes,
+        tuple(fixed_allocations),
+        tuple(pruned_dummy_classes),
+        objective_offset,
+    )
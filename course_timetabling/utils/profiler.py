@@ -0,0 +1,144 @@
+import json
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CONSTRAINT_FAMILY_PATTERN = re.compile(r"^(RN[GP]\d+)")
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes (0 if not available).
+    """
+    if resource is None:
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é dado em kilobytes no Linux e em bytes no macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_constraint_family(name: str) -> str:
+    """
+    Returns the family of a constraint from its name, e.g. "RNG4_Prof1_0" -> "RNG4".
+    """
+    match = CONSTRAINT_FAMILY_PATTERN.match(name)
+    return match.group(1) if match else "other"
+
+
+def get_model_statistics(timetabling) -> dict:
+    """
+    Counts the variables, constraints and nonzeros of a built model per family.
+
+    Variables are split into X, PCB and PSB; constraints are attributed to their
+    family (RNP1, RNG1, ...) by name.
+
+    Args:
+        timetabling (CourseTimetabling): A timetabling with a built model.
+
+    Returns:
+        dict: The totals and the per family counts.
+    """
+    model = timetabling.model
+    model.update()
+
+    constraints = {}
+    if model.NumConstrs:
+        names = model.getAttr("ConstrName", model.getConstrs())
+        nonzeros = np.diff(model.getA().tocsr().indptr)
+        for name, row_nonzeros in zip(names, nonzeros):
+            family = constraints.setdefault(
+                get_constraint_family(name), {"constraints": 0, "nonzeros": 0}
+            )
+            family["constraints"] += 1
+            family["nonzeros"] += int(row_nonzeros)
+
+    return {
+        "variables": model.NumVars,
+        "constraints": model.NumConstrs,
+        "nonzeros": model.NumNZs,
+        "variables_by_family": {
+            "X": len(timetabling.X),
+            "PCB": len(timetabling.PP_slack_variables),
+            "PSB": len(timetabling.PS_slack_variables),
+        },
+        "constraints_by_family": dict(sorted(constraints.items())),
+    }
+
+
+class Profiler:
+    """
+    Records a timing span per phase of the pipeline, with the tracemalloc delta and peak
+    of the phase and the peak RSS of the process at its end.
+
+    tracemalloc only sees the Python allocations; the memory used by Gurobi itself shows
+    up in the RSS. A disabled profiler records nothing and adds no overhead.
+
+    Attributes:
+        phases (list): One dict per finished phase, in order.
+        statistics (dict): Model statistics (see get_model_statistics).
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases = []
+        self.statistics = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        memory_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            self.phases.append(
+                {
+                    "phase": name,
+                    "seconds": seconds,
+                    "tracemalloc_delta_bytes": memory_after - memory_before,
+                    "tracemalloc_peak_bytes": memory_peak - memory_before,
+                    "peak_rss_bytes": get_peak_rss(),
+                }
+            )
+
+    def record_model_statistics(self, timetabling):
+        if self.enabled:
+            self.statistics = get_model_statistics(timetabling)
+
+    def report(self) -> dict:
+        return {
+            "total_seconds": sum(phase["seconds"] for phase in self.phases),
+            "peak_rss_bytes": get_peak_rss(),
+            "phases": self.phases,
+            "model": self.statistics,
+        }
+
+    def save(self, filename: str):
+        if not self.enabled:
+            return
+
+        with open(filename, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import gurobipy as gp
+
+import settings
+from utils.model_cache import get_build_options, get_input_hash
+from utils.solution import Solution
+
+
+def get_file_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class ResultCache:
+    """
+    Memoizes solve results by input hash and solver parameters, so that a run with the
+    same sets, settings, build options and solver parameters returns the stored solution
+    and objective without starting a Gurobi environment.
+
+    Each entry is a JSON file under the cache directory. Only optimal results are stored
+    (see main), since an interrupted solve depends on the run. The store keeps at most
+    max_entries results, dropping the least recently used ones.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.RESULT_CACHE_DIR,
+        max_entries: int = settings.RESULT_CACHE_MAX_ENTRIES,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def get_key(
+        self,
+        sets: dict,
+        builder,
+        sparse: bool,
+        conflict_mode: str,
+        warm_start: str = None,
+    ) -> str:
+        """
+        Returns the key of a run. The warm start enters by its contents: the start can change
+        which of several optimal solutions is found.
+        """
+        options = get_build_options(builder, sparse, conflict_mode)
+        options["solver_parameters"] = settings.SOLVER_PARAMETERS
+        options["solver_backend"] = settings.SOLVER_BACKEND
+        options["presolve"] = settings.PRESOLVE
+        options["objective_mode"] = settings.OBJECTIVE_MODE
+        options["objective_time_limits"] = settings.OBJECTIVE_TIME_LIMITS
+        options["rescale_objective"] = settings.RESCALE_OBJECTIVE
+        options["gurobi_version"] = gp.gurobi.version()
+        options["warm_start"] = get_file_hash(warm_start) if warm_start else None
+
+        return get_input_hash(sets, options)
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self.get_path(key))
+
+    def get(self, key: str):
+        """
+        Returns the stored (solution, objective) of a key, None on a miss.
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="utf-8") as file:
+            entry = json.load(file)
+
+        now = time.time()
+        os.utime(path, (now, now))
+
+        return Solution.from_dict(entry["solution"]), entry["objective"]
+
+    def put(self, key: str, solution: Solution, objective: float):
+        """
+        Stores the result of a key. The entry is written to a temporary file and renamed
+        (as in utils.save_results_to_csv), so a concurrent get never reads half an entry.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, prefix=".", suffix=".tmp", delete=False
+        ) as file:
+            try:
+                json.dump(
+                    {"solution": solution.to_dict(), "objective": objective},
+                    file,
+                    ensure_ascii=False,
+                )
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+
+        os.replace(file.name, self.get_path(key))
+
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries beyond max_entries.
+        """
+        paths = [
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.endswith(".json")
+        ]
+        paths.sort(key=os.path.getmtime, reverse=True)
+
+        for path in paths[self.max_entries :]:
+            os.remove(path)
@@ -0,0 +1,97 @@
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+from utils.timeslot import schedule_mask
+
+
+class CourseSchedule(NamedTuple):
+    """
+    Schedule of a course class, parsed once from the courses set.
+
+    Attributes:
+        day (str): The raw day field, e.g. "SEG,QUA".
+        time (str): The raw time field, e.g. "13:00-15:00,08:00-10:00".
+        credits (int): Number of credits of the class.
+        slots (tuple): The (day, time) pairs the class is taught in, e.g.
+            (("SEG", "13:00-15:00"), ("QUA", "08:00-10:00")).
+        mask (int): The slots encoded as a bitmask over the weekly grid (see utils.timeslot).
+    """
+
+    day: str
+    time: str
+    credits: int
+    slots: Tuple[Tuple[str, str], ...]
+    mask: int
+
+
+def split_schedule_field(value) -> list:
+    """
+    Splits a comma separated day or time field, ignoring empty values.
+    """
+    if not value or not isinstance(value, str):
+        return []
+
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_schedule_slots(day: str, time: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Pairs the days and times of a class into (day, time) slots.
+
+    The spreadsheet uses three layouts:
+        - one time for several days ("TER,QUI" / "08:00-10:00"): same time every day;
+        - one day with several times ("SEG" / "10:00-12:00,13:00-15:00"): every time on that day;
+        - as many days as times ("SEG,QUA" / "13:00-15:00,08:00-10:00"): paired by position.
+
+    Any other combination is paired as a cross product, which never misses a slot.
+
+    Args:
+        day (str): The day field of the class.
+        time (str): The time field of the class.
+
+    Returns:
+        tuple: The (day, time) slots of the class, empty if the schedule is not defined.
+    """
+    days = split_schedule_field(day)
+    times = split_schedule_field(time)
+
+    if not days or not times:
+        return ()
+
+    if len(days) == len(times):
+        slots = zip(days, times)
+    elif len(times) == 1:
+        slots = ((d, times[0]) for d in days)
+    elif len(days) == 1:
+        slots = ((days[0], t) for t in times)
+    else:
+        slots = ((d, t) for d in days for t in times)
+
+    return tuple(dict.fromkeys(slots))
+
+
+def build_schedule_index(courses: dict) -> Mapping[str, CourseSchedule]:
+    """
+    Builds an immutable index from course class id to its parsed schedule.
+
+    Args:
+        courses (dict): Dictionary containing course details.
+
+    Returns:
+        Mapping: A read-only mapping of course class id to CourseSchedule.
+    """
+    index = {}
+
+    for course_class_id, details in courses.items():
+        day = details["day"]
+        time = details["time"]
+        slots = parse_schedule_slots(day, time)
+        index[course_class_id] = CourseSchedule(
+            day=day,
+            time=time,
+            credits=details["credits"],
+            slots=slots,
+            mask=schedule_mask(slots),
+        )
+
+    return MappingProxyType(index)
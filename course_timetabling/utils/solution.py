@@ -0,0 +1,63 @@
+from typing import NamedTuple, Tuple
+
+
+class Allocation(NamedTuple):
+    """
+    A professor allocated to a course class in a solution.
+
+    Attributes:
+        professor (str): The professor name.
+        course_class_id (str): The course class id, e.g. "OBG-BCC1-1".
+        day (str): The raw day field of the class.
+        time (str): The raw time field of the class.
+    """
+
+    professor: str
+    course_class_id: str
+    day: str
+    time: str
+
+
+class CreditShortfall(NamedTuple):
+    """
+    Credits a professor is below the number suggested by the coordination (PCB/PSB slack).
+    """
+
+    professor: str
+    credits: float
+
+
+class Solution(NamedTuple):
+    """
+    Structured solution of the model, read straight from the variable maps.
+
+    Attributes:
+        allocations (tuple): Allocation records, in variable order.
+        permanent_shortfall (tuple): Nonzero PCB values of the permanent professors.
+        substitute_shortfall (tuple): Nonzero PSB values of the substitute professors.
+    """
+
+    allocations: Tuple[Allocation, ...]
+    permanent_shortfall: Tuple[CreditShortfall, ...] = ()
+    substitute_shortfall: Tuple[CreditShortfall, ...] = ()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the solution as plain lists, e.g. to be stored as JSON.
+        """
+        return {
+            field: [list(record) for record in getattr(self, field)]
+            for field in self._fields
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Solution":
+        return cls(
+            allocations=tuple(Allocation(*record) for record in data["allocations"]),
+            permanent_shortfall=tuple(
+                CreditShortfall(*record) for record in data["permanent_shortfall"]
+            ),
+            substitute_shortfall=tuple(
+                CreditShortfall(*record) for record in data["substitute_shortfall"]
+            ),
+        )
@@ -0,0 +1,158 @@
+from typing import NamedTuple, Tuple
+
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+import settings
+
+
+class SolverResult(NamedTuple):
+    """
+    Outcome of solving a model with a backend.
+
+    Attributes:
+        status (int): Gurobi status code (GRB.OPTIMAL, GRB.INFEASIBLE, GRB.TIME_LIMIT, ...),
+            also used by the other backends.
+        objective (float): Objective value of the best solution, NaN if there is none.
+        values (tuple): Values of the variables in model.getVars() order, empty if there
+            is no solution.
+    """
+
+    status: int
+    objective: float
+    values: Tuple[float, ...] = ()
+
+
+class Backend:
+    """
+    Solves a model built with gurobipy.
+
+    The builders (CourseTimetabling, MatrixCourseTimetabling) describe the model with the
+    gurobipy API, which does not need a license beyond its size limit to build a model;
+    a backend only takes its variables, linear constraints and objective, solves them and
+    returns the values.
+    """
+
+    name = ""
+
+    def solve(self, model: gp.Model, parameters: dict, callback=None) -> SolverResult:
+        """
+        Args:
+            model (gp.Model): The built model.
+            parameters (dict): Gurobi parameters, see settings.SOLVER_PARAMETERS.
+            callback: Gurobi callback function, for the backends that support it.
+        """
+        raise NotImplementedError
+
+
+class GurobiBackend(Backend):
+    name = settings.SolverBackend.GUROBI.value
+
+    def solve(self, model: gp.Model, parameters: dict, callback=None) -> SolverResult:
+        for name, value in parameters.items():
+            model.setParam(name, value)
+
+        model.update()
+        model.optimize(callback)
+
+        if model.SolCount == 0:
+            return SolverResult(model.Status, float("nan"))
+
+        return SolverResult(
+            model.Status, model.ObjVal, tuple(model.getAttr("X", model.getVars()))
+        )
+
+
+class HighsBackend(Backend):
+    """
+    Solves the model with HiGHS through scipy.optimize.milp, from the matrix form of the
+    gurobipy model (A, rhs, senses, bounds, objective and integrality).
+
+    Only the TimeLimit, MIPGap, Threads and OutputFlag parameters are translated; MIP
+    starts and callbacks are not supported.
+    """
+
+    name = settings.SolverBackend.HIGHS.value
+
+    # Status de scipy.optimize.milp para os códigos do Gurobi
+    STATUS = {
+        0: GRB.OPTIMAL,
+        1: GRB.TIME_LIMIT,
+        2: GRB.INFEASIBLE,
+        3: GRB.UNBOUNDED,
+    }
+
+    def get_options(self, parameters: dict) -> dict:
+        options = {"disp": bool(parameters.get("OutputFlag", 0))}
+
+        if "TimeLimit" in parameters:
+            options["time_limit"] = float(parameters["TimeLimit"])
+        if "MIPGap" in parameters:
+            options["mip_rel_gap"] = float(parameters["MIPGap"])
+
+        ignored = set(parameters) - {"TimeLimit", "MIPGap", "Threads", "OutputFlag"}
+        if ignored:
+            print(f"Parameters not supported by HiGHS: {', '.join(sorted(ignored))}")
+
+        return options
+
+    def solve(self, model: gp.Model, parameters: dict, callback=None) -> SolverResult:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        if callback:
+            print("Callbacks are not supported by HiGHS, solving without it")
+
+        model.update()
+        variables = model.getVars()
+        constraints = model.getConstrs()
+
+        # O milp minimiza: o objetivo é negado para maximizar
+        sign = -1 if model.ModelSense == GRB.MAXIMIZE else 1
+        objective = sign * np.array(model.getAttr("Obj", variables))
+
+        integrality = np.array(
+            [vtype != GRB.CONTINUOUS for vtype in model.getAttr("VType", variables)]
+        )
+        lower = np.array(model.getAttr("LB", variables))
+        upper = np.array(model.getAttr("UB", variables))
+        lower[lower <= -GRB.INFINITY] = -np.inf
+        upper[upper >= GRB.INFINITY] = np.inf
+
+        linear_constraints = []
+        if constraints:
+            rhs = np.array(model.getAttr("RHS", constraints))
+            senses = np.array(model.getAttr("Sense", constraints))
+            linear_constraints.append(
+                LinearConstraint(
+                    model.getA().tocsr(),
+                    np.where(senses == GRB.LESS_EQUAL, -np.inf, rhs),
+                    np.where(senses == GRB.GREATER_EQUAL, np.inf, rhs),
+                )
+            )
+
+        result = milp(
+            objective,
+            constraints=linear_constraints,
+            integrality=integrality,
+            bounds=Bounds(lower, upper),
+            options=self.get_options(parameters),
+        )
+
+        status = self.STATUS.get(result.status, GRB.NUMERIC)
+        if result.x is None:
+            return SolverResult(status, float("nan"))
+
+        return SolverResult(
+            status, sign * result.fun + model.ObjCon, tuple(result.x.tolist())
+        )
+
+
+BACKENDS = {backend.name: backend for backend in (GurobiBackend, HighsBackend)}
+
+
+def get_backend(name: str = None) -> Backend:
+    """
+    Returns the backend of a settings.SolverBackend value, settings.SOLVER_BACKEND by default.
+    """
+    return BACKENDS[name or settings.SOLVER_BACKEND]()
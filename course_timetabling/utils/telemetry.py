@@ -0,0 +1,199 @@
+import csv
+import json
+import math
+import os
+import time
+
+from gurobipy import GRB
+
+FIELDS = ("time", "event", "incumbent", "bound", "gap", "nodes", "work")
+
+
+def get_gap(incumbent: float, bound: float) -> float:
+    """
+    Relative MIP gap, as Gurobi computes it (|bound - incumbent| / |incumbent|).
+    """
+    if math.isnan(bound):
+        return float("nan")
+    if math.isnan(incumbent) or abs(incumbent) >= GRB.INFINITY:
+        return float("inf")
+    if incumbent == 0:
+        return 0.0 if bound == 0 else float("inf")
+
+    return abs(bound - incumbent) / abs(incumbent)
+
+
+class TelemetryRecorder:
+    """
+    Records the progress of a solve (incumbent, best bound, gap, explored nodes and work
+    units over time) from a Gurobi callback.
+
+    Every new incumbent (MIPSOL) is recorded; the MIP progress callbacks are sampled every
+    min_interval seconds, and only when the incumbent or the bound changed, to keep the
+    timeline compact.
+    """
+
+    def __init__(self, min_interval: float = 0.1):
+        self.min_interval = min_interval
+        self.rows = []
+        self.last_sample = -math.inf
+
+    def record(self, event, runtime, incumbent, bound, nodes, work):
+        if abs(incumbent) >= GRB.INFINITY:
+            incumbent = float("nan")
+
+        self.rows.append(
+            {
+                "time": round(runtime, 4),
+                "event": event,
+                "incumbent": incumbent,
+                "bound": bound,
+                "gap": get_gap(incumbent, bound),
+                "nodes": int(nodes),
+                "work": round(work, 4),
+            }
+        )
+
+    def callback(self, model, where):
+        if where == GRB.Callback.MIPSOL:
+            self.record(
+                "incumbent",
+                model.cbGet(GRB.Callback.RUNTIME),
+                model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                model.cbGet(GRB.Callback.MIPSOL_NODCNT),
+                model.cbGet(GRB.Callback.WORK),
+            )
+
+        elif where == GRB.Callback.MIP:
+            runtime = model.cbGet(GRB.Callback.RUNTIME)
+            if runtime - self.last_sample < self.min_interval:
+                return
+
+            incumbent = model.cbGet(GRB.Callback.MIP_OBJBST)
+            bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+            if self.rows and (incumbent, bound) == (
+                self.rows[-1]["incumbent"],
+                self.rows[-1]["bound"],
+            ):
+                return
+
+            self.last_sample = runtime
+            self.record(
+                "progress",
+                runtime,
+                incumbent,
+                bound,
+                model.cbGet(GRB.Callback.MIP_NODCNT),
+                model.cbGet(GRB.Callback.WORK),
+            )
+
+    def finish(self, model):
+        """
+        Records the final state of the solve. A multi-objective model has no single
+        incumbent nor bound: one row per level (event final_<level>) is recorded, with its
+        value and no bound nor gap.
+        """
+        has_solution = model.SolCount > 0
+        if model.IsMultiObj:
+            objective_number = model.Params.ObjNumber
+            try:
+                for index in range(model.NumObj):
+                    model.Params.ObjNumber = index
+                    self.record(
+                        f"final_{model.ObjNName}",
+                        model.Runtime,
+                        model.ObjNVal if has_solution else float("nan"),
+                        float("nan"),
+                        model.NodeCount,
+                        model.Work,
+                    )
+            finally:
+                model.Params.ObjNumber = objective_number
+            return
+
+        self.record(
+            "final",
+            model.Runtime,
+            model.ObjVal if has_solution else float("nan"),
+            model.ObjBound if model.IsMIP else model.ObjVal,
+            model.NodeCount if model.IsMIP else 0,
+            model.Work,
+        )
+
+    def map_final(self, get_objective):
+        """
+        Maps the incumbent and bound of the final record, e.g. back to the original scale
+        of a rescaled objective, and recomputes its gap.
+        """
+        final = self.rows[-1]
+        final["incumbent"] = get_objective(final["incumbent"])
+        final["bound"] = get_objective(final["bound"])
+        final["gap"] = get_gap(final["incumbent"], final["bound"])
+
+    def save(self, path: str, run: str = None):
+        """
+        Writes the timeline as CSV, or as JSON ({"run", "timeline"}) if path ends with
+        .json. The run name defaults to the file name.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "run": run or os.path.splitext(os.path.basename(path))[0],
+                        "created": time.time(),
+                        "timeline": self.rows,
+                    },
+                    file,
+                    indent=2,
+                )
+            return
+
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+def load_timeline(path: str):
+    """
+    Reads a timeline written by TelemetryRecorder.save.
+
+    Returns:
+        pd.DataFrame: One row per record, with the FIELDS columns.
+    """
+    import pandas as pd
+
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as file:
+            return pd.DataFrame(json.load(file)["timeline"], columns=list(FIELDS))
+
+    return pd.read_csv(path)
+
+
+def overlay_timelines(paths: list, metric: str = "gap", axis: str = "time"):
+    """
+    Aligns the timelines of several runs on a common time (or work) axis, carrying each
+    run's last value forward, so their convergence can be plotted together.
+
+    Args:
+        paths (list): Timeline files, the file name is used as run name.
+        metric (str): The column to compare, e.g. "gap", "incumbent" or "bound".
+        axis (str): "time" or "work".
+
+    Returns:
+        pd.DataFrame: Indexed by the axis, one column per run.
+    """
+    import pandas as pd
+
+    series = {}
+    for path in paths:
+        timeline = load_timeline(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        series[name] = timeline.groupby(axis)[metric].last()
+
+    return pd.DataFrame(series).sort_index().ffill()
@@ -0,0 +1,99 @@
+import re
+from typing import Dict, Iterable, Mapping, Set, Tuple
+
+WEEK_DAYS = ("SEG", "TER", "QUA", "QUI", "SEX", "SAB", "DOM")
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+TIME_RANGE_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})$")
+
+
+def parse_time_range(time: str) -> Tuple[int, int]:
+    """
+    Parses a time range like "13:00-15:00" into minutes since midnight.
+
+    Args:
+        time (str): The time range.
+
+    Returns:
+        tuple: The (start, end) minutes, or (0, 0) if the time range is not valid.
+    """
+    match = TIME_RANGE_PATTERN.match(time.strip()) if time else None
+    if not match:
+        return 0, 0
+
+    start_hour, start_minute, end_hour, end_minute = map(int, match.groups())
+    start = start_hour * 60 + start_minute
+    end = end_hour * 60 + end_minute
+
+    if end <= start:
+        return 0, 0
+
+    return start, end
+
+
+def slot_mask(day: str, time: str) -> int:
+    """
+    Encodes a single (day, time) slot as a bitmask over the weekly grid.
+
+    The week is split in SLOT_MINUTES cells; bit (day * SLOTS_PER_DAY + cell) is set
+    for every cell the slot touches. Ranges are half-open, so 13:00-15:00 and
+    15:00-17:00 do not overlap while 13:00-15:00 and 14:00-16:00 do.
+
+    Args:
+        day (str): The day, e.g. "SEG".
+        time (str): The time range, e.g. "13:00-15:00".
+
+    Returns:
+        int: The bitmask of the slot, 0 if the day or the time is not recognized.
+    """
+    day = day.strip().upper() if day else ""
+    if day not in WEEK_DAYS:
+        return 0
+
+    start, end = parse_time_range(time)
+    if start == end:
+        return 0
+
+    first_cell = start // SLOT_MINUTES
+    last_cell = -(-end // SLOT_MINUTES)
+    offset = WEEK_DAYS.index(day) * SLOTS_PER_DAY
+
+    return ((1 << (last_cell - first_cell)) - 1) << (offset + first_cell)
+
+
+def schedule_mask(slots: Iterable[Tuple[str, str]]) -> int:
+    """
+    Encodes every (day, time) slot of a class into a single bitmask.
+    """
+    mask = 0
+    for day, time in slots:
+        mask |= slot_mask(day, time)
+
+    return mask
+
+
+def masks_conflict(mask: int, other_mask: int) -> bool:
+    """
+    Two classes conflict exactly when their masks share at least one cell.
+    """
+    return bool(mask & other_mask)
+
+
+def group_courses_by_mask(schedule_index: Mapping) -> Dict[int, Set[str]]:
+    """
+    Groups the course class ids by their schedule mask, leaving out classes
+    without a known schedule (mask 0), which never conflict.
+
+    Args:
+        schedule_index (Mapping): Course class id to CourseSchedule.
+
+    Returns:
+        dict: Mask to the set of course class ids with exactly that mask.
+    """
+    courses_by_mask = {}
+    for course_class_id, schedule in schedule_index.items():
+        if schedule.mask:
+            courses_by_mask.setdefault(schedule.mask, set()).add(course_class_id)
+
+    return courses_by_mask
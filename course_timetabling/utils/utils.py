@@ -1,6 +1,9 @@
 import settings
-from typing import Tuple
 import csv
+import os
+import tempfile
+
+from utils.solution import Solution
 
 
 def get_qualified_courses_for_professor(
@@ -22,7 +25,11 @@ def get_qualified_courses_for_professor(
 
     if professor == "DUMMY":
         # In the case of a DUMMY professor, they can teach any discipline from all areas
-        qualified_course_class_id = list(courses_set.keys())
+        # except the classes the presolve excluded (see utils.presolve)
+        excluded_classes = professors_set.get(professor, {}).get("excluded_classes", [])
+        qualified_course_class_id = [
+            course for course in courses_set.keys() if course not in excluded_classes
+        ]
     else:
         try:
             qualified_courses = professors_set[professor]["qualified_courses"]
@@ -41,51 +48,6 @@ def get_qualified_courses_for_professor(
     return set(qualified_course_class_id)
 
 
-def get_possible_schedules(courses: dict) -> Tuple[list, list]:
-    """
-    Extracts and returns the unique days and times from a dictionary of courses.
-    Args:
-        courses (dict): A dictionary where the keys are course identifiers and the values are dictionaries
-                        containing course details, specifically 'day' and 'time'.
-    Returns:
-        tuple: A tuple containing two lists:
-            - days (list): A list of unique days on which the courses are scheduled.
-            - time (list): A list of unique times at which the courses are scheduled.
-    """
-    unique_schedules = set()
-
-    for _, course_details in courses.items():
-        day = course_details["day"]
-        time = course_details["time"]
-        unique_schedules.add((day, time))
-
-    days = []
-    times = []
-    for day, time in unique_schedules:
-        days.append(day)
-        times.append(time)
-
-    return days, times
-
-
-def get_course_schedule(courses_set: dict, course_class_id: str) -> Tuple[str, str]:
-    """
-    Retrieve the schedule for a specific course class.
-
-    Args:
-        courses_set (dict): A dictionary containing course information.
-        course_class_id (str): The ID of the course class to retrieve the schedule for.
-
-    Returns:
-        tuple: A tuple containing the day and time of the course class.
-    """
-
-    day = courses_set[course_class_id]["day"]
-    time = courses_set[course_class_id]["time"]
-
-    return (day, time)
-
-
 def get_all_course_class_id(courses: dict) -> set:
     result = set([d for d in courses.keys()])
     return result
@@ -167,119 +129,89 @@ def add_manual_allocation_courses(
     return courses_available
 
 
-def get_courses_by_exact_day_and_time(courses: dict, day: str, time: str) -> set:
-
-    result = []
-
-    for course_id, details in courses.items():
-        if details["day"] and details["day"] == day:
-            if details["time"] and details["time"] == time:
-                result.append(course_id)
-
-    return set(result)
-
-
-def get_courses_by_time(courses: dict, time: str) -> set:
+def save_results_to_csv(data: list, filename: str) -> None:
     """
-    Returns a set of courses that have classes at the specified time.
-
-    Args:
-        courses (dict): Dictionary containing course details.
-        time (str): The time to filter courses by.
-
-    Returns:
-        set: A set of courses that have classes at the specified time.
+    Writes the rows to a temporary file next to filename and renames it over filename, so
+    a reader (or a killed process) never sees a partially written file. Only each file is
+    replaced atomically: the files of one solution are written one after the other.
     """
+    directory = os.path.dirname(filename) or "."
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".", suffix=".tmp", delete=False
+    ) as file:
+        try:
+            spamwriter = csv.writer(
+                file, delimiter=";", quotechar="|", quoting=csv.QUOTE_MINIMAL
+            )
+            for line in data:
+                spamwriter.writerow(line)
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
 
-    result = []
-
-    for course_id, details in courses.items():
-        if time and details["time"]:
-            for course_time in details["time"].split(","):
-                if course_time and course_time in time:
-                    result.append(course_id)
+    # O arquivo temporário é criado com modo 0600, os resultados devem ser legíveis por todos
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(file.name, 0o644 & ~umask)
 
-    return set(result)
+    os.replace(file.name, filename)
 
 
-def get_courses_by_day(courses: dict, day: str) -> set:
+def treat_and_save_results(solution: Solution, courses: dict):
     """
-    Returns a set of courses that have classes on the specified day.
+    Writes the solution records (see utils.solution) to the results CSV files.
 
     Args:
+        solution (Solution): The allocations and PCB/PSB values of the solution.
         courses (dict): Dictionary containing course details.
-        day (str): The day to filter courses by.
 
     Returns:
-        set: A set of courses that have classes on the specified day.
+        tuple: The timeschedule rows and the PCB rows.
     """
-    result = []
-
-    for course_id, details in courses.items():
-        if day and details["day"]:
-            for course_day in details["day"].split(","):
-                if course_day and course_day in day:
-                    result.append(course_id)
-
-    r = set(result)
-    return r
-
-
-def save_results_to_csv(data: list, filename: str) -> None:
-    with open(filename, "w") as file:
-        spamwriter = csv.writer(
-            file, delimiter=";", quotechar="|", quoting=csv.QUOTE_MINIMAL
-        )
-        for line in data:
-            spamwriter.writerow(line)
-
-
-def treat_and_save_results(timeschedule: list, courses: dict):
     timeschedule_treated = []
-    pcb_professors = []
-    psb_professors = []
-
-    for schedule in timeschedule:
-        schedule, value = schedule.split("/")
-        allocation = schedule.split("_")
-
-        if "PCB" in allocation:
-            pcb_professors.append(allocation[1:] + [float(value)])
-        elif "PSB" in allocation:
-            psb_professors.append(allocation[1:] + [float(value)])
-        else:
-            professor = allocation[0]
-
-            course_class_id = allocation[1]
-            course_id = courses[course_class_id]["course_id"]
-            course_name = courses[course_class_id]["course_name"]
-            capacity = courses[course_class_id]["capacity"]
-            classroom_type = courses[course_class_id]["classroom_type"]
-            responsable_institute = courses[course_class_id]["responsable_institute"]
-            course_type = courses[course_class_id]["course_type"]
-            term = courses[course_class_id]["term"]
-            class_type = courses[course_class_id]["class_type"]
-            graduation_course = courses[course_class_id]["graduation_course"]
-
-            day = allocation[2]
-            time = allocation[3]
-
-            result = [
-                responsable_institute,
-                graduation_course,
-                professor,
-                course_id,
-                course_name,
-                day,
-                time,
-                capacity,
-                classroom_type,
-                course_type,
-                term,
-                class_type,
-            ]
-
-            timeschedule_treated.append(result)
+    pcb_professors = [
+        [shortfall.professor, shortfall.credits]
+        for shortfall in solution.permanent_shortfall
+    ]
+    psb_professors = [
+        [shortfall.professor, shortfall.credits]
+        for shortfall in solution.substitute_shortfall
+    ]
+
+    for allocation in solution.allocations:
+        professor = allocation.professor
+
+        course_class_id = allocation.course_class_id
+        course_id = courses[course_class_id]["course_id"]
+        course_name = courses[course_class_id]["course_name"]
+        capacity = courses[course_class_id]["capacity"]
+        classroom_type = courses[course_class_id]["classroom_type"]
+        responsable_institute = courses[course_class_id]["responsable_institute"]
+        course_type = courses[course_class_id]["course_type"]
+        term = courses[course_class_id]["term"]
+        class_type = courses[course_class_id]["class_type"]
+        graduation_course = courses[course_class_id]["graduation_course"]
+
+        day = allocation.day
+        time = allocation.time
+
+        result = [
+            responsable_institute,
+            graduation_course,
+            professor,
+            course_id,
+            course_name,
+            day,
+            time,
+            capacity,
+            classroom_type,
+            course_type,
+            term,
+            class_type,
+        ]
+
+        timeschedule_treated.append(result)
 
     save_results_to_csv(
         timeschedule_treated, "course_timetabling/results/timeschedule.csv"
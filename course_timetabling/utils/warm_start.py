@@ -0,0 +1,107 @@
+import csv
+import json
+from typing import NamedTuple, Tuple
+
+from utils.solution import Allocation, Solution
+
+# Colunas de results/timeschedule.csv (ver utils.treat_and_save_results)
+TIMESCHEDULE_COLUMNS = (
+    "responsable_institute",
+    "graduation_course",
+    "professor",
+    "course_id",
+    "course_name",
+    "day",
+    "time",
+    "capacity",
+    "classroom_type",
+    "course_type",
+    "term",
+    "class_type",
+)
+
+# Campos que identificam uma turma em uma linha do timeschedule.csv
+CLASS_FIELDS = ("course_id", "graduation_course", "day", "time")
+
+
+class UnmappedRow(NamedTuple):
+    """
+    A row of a previous solution that could not be used as MIP start.
+
+    Attributes:
+        row (tuple): The timeschedule.csv row or the Allocation record.
+        reason (str): Why it was not mapped.
+    """
+
+    row: Tuple
+    reason: str
+
+
+def get_class_key(details: dict) -> tuple:
+    return tuple(str(details[field]) for field in CLASS_FIELDS)
+
+
+def read_timeschedule(path: str) -> list:
+    with open(path, encoding="utf-8", newline="") as file:
+        return [
+            tuple(row) for row in csv.reader(file, delimiter=";", quotechar="|") if row
+        ]
+
+
+def map_timeschedule(rows: list, courses: dict) -> tuple:
+    """
+    Maps timeschedule.csv rows back to course classes. A row is matched to a class with the
+    same course id, graduation course, day and time; rows matching several classes take
+    them in order.
+
+    Args:
+        rows (list): The timeschedule.csv rows.
+        courses (dict): The current courses set.
+
+    Returns:
+        tuple: The Solution of the matched rows and the list of UnmappedRow.
+    """
+    classes = {}
+    for course, details in courses.items():
+        classes.setdefault(get_class_key(details), []).append(course)
+
+    allocations = []
+    unmapped = []
+    for row in rows:
+        if len(row) != len(TIMESCHEDULE_COLUMNS):
+            unmapped.append(UnmappedRow(row, "malformed row"))
+            continue
+
+        fields = dict(zip(TIMESCHEDULE_COLUMNS, row))
+        candidates = classes.get(get_class_key(fields))
+
+        if candidates is None:
+            unmapped.append(UnmappedRow(row, "class not found"))
+        elif not candidates:
+            unmapped.append(UnmappedRow(row, "class already allocated"))
+        else:
+            allocations.append(
+                Allocation(
+                    fields["professor"],
+                    candidates.pop(0),
+                    fields["day"],
+                    fields["time"],
+                )
+            )
+
+    return Solution(tuple(allocations)), unmapped
+
+
+def load_previous_solution(path: str, courses: dict) -> tuple:
+    """
+    Loads a previous solution, either a timeschedule.csv or a JSON Solution (see
+    Solution.to_dict).
+
+    Returns:
+        tuple: The Solution and the list of UnmappedRow.
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as file:
+            return Solution.from_dict(json.load(file)), []
+
+    return map_timeschedule(read_timeschedule(path), courses)